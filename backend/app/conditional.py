@@ -0,0 +1,61 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+@dataclass
+class ResourceVersion:
+    """
+    Validators for a response, computed by a cheap probe before the body is
+    loaded. `etag` is quoted as sent on the wire.
+    """
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def of(cls, *parts, last_modified: Optional[datetime] = None) -> "ResourceVersion":
+        # Every value the response depends on goes into the tag.
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return cls(f'"{digest}"', last_modified)
+
+    def headers(self) -> Dict[str, str]:
+        # Clients may store the response but must revalidate before reuse.
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires.
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def is_not_modified(request: Request, version: ResourceVersion) -> bool:
+    # If-Modified-Since only counts when the client sent no ETag (RFC 9110).
+    if "if-none-match" in request.headers:
+        return etag_matches(request, version.etag)
+
+    header = request.headers.get("if-modified-since")
+    if header is None or version.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return version.last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(version: ResourceVersion) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers())
@@ -1,11 +1,22 @@
 import asyncio
+import hashlib
+import logging
 import os
+from contextvars import ContextVar
+from functools import cache
+from typing import Callable, Dict, List, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import inspect
+from sqlalchemy import Column, create_mock_engine, event, func, inspect, literal, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateColumn, CreateIndex
 
 from .models.base import Base
+from .models.schema_version import SchemaVersion
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 db_url = os.environ.get("DB_URL")
@@ -15,26 +26,45 @@ if db_url is None:
 engine = create_async_engine(
     db_url,
     echo=os.environ.get("DEV", "False").lower() in ("true", "1", "yes"),
-    plugins=["geoalchemy2"],
     connect_args={"timeout": 10},
 )
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+# Per-request SQL statement counting, used by the load-test harness to report
+# how many statements each route issues. Disabled unless DB_STATEMENT_STATS is set.
+DB_STATEMENT_STATS = os.environ.get("DB_STATEMENT_STATS", "False").lower() in ("true", "1", "yes")
+statement_counter: ContextVar[Optional[List[int]]] = ContextVar("statement_counter", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = statement_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
 
-async def create_db_and_tables(max_retries=5, retry_delay=5):
+@cache
+def schema_fingerprint() -> str:
+    # Hash of every DDL statement create_all would emit, including the
+    # functions and triggers attached with add_table_ddl.
+    statements = []
+    mock_engine = create_mock_engine(
+        "postgresql://",
+        lambda sql, *args, **kwargs: statements.append(
+            str(sql.compile(dialect=mock_engine.dialect))
+        ),
+    )
+    Base.metadata.create_all(mock_engine, checkfirst=False)
+    # Sorted: a table's indexes come out of a set, in an order that varies
+    # between processes.
+    return hashlib.sha256("\n".join(sorted(statements)).encode()).hexdigest()
+
+
+async def _with_retries(operation, max_retries: int, retry_delay: float):
     attempt = 0
-    while attempt < max_retries:
+    while True:
         try:
-            async with engine.begin() as conn:
-                our_table_names = set(Base.metadata.tables.keys())
-                existing_tables = await conn.run_sync(
-                    lambda sync_conn: [
-                        t for t in inspect(sync_conn).get_table_names()
-                        if t in our_table_names
-                    ]
-                )
-                await conn.run_sync(Base.metadata.create_all)
-                return len(existing_tables) != 0
+            return await operation()
         except ConnectionRefusedError:
             attempt += 1
             if attempt >= max_retries:
@@ -42,6 +72,168 @@ async def create_db_and_tables(max_retries=5, retry_delay=5):
             await asyncio.sleep(retry_delay)
 
 
+def _missing_columns(sync_conn, table_names) -> Dict[str, List[Column]]:
+    inspector = inspect(sync_conn)
+    missing = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing[table.name] = [
+            column for column in table.columns
+            if not column.primary_key and column.name not in existing
+        ]
+    return missing
+
+
+def _apply_additive_ddl(sync_conn, table_names):
+    # create_all skips tables that already exist, so columns, indexes and
+    # trigger DDL added to a model later are applied here idempotently.
+    dialect = sync_conn.dialect
+    missing = _missing_columns(sync_conn, table_names)
+
+    # Postgres can only add a NOT NULL column to a table with rows when a
+    # server default fills it in; refuse before altering anything.
+    unfillable = [
+        f"{table.name}.{column.name}"
+        for table in Base.metadata.sorted_tables
+        for column in missing.get(table.name, [])
+        if not column.nullable and column.server_default is None
+        and sync_conn.execute(select(literal(1)).select_from(table).limit(1)).first()
+    ]
+    if unfillable:
+        raise RuntimeError(
+            f"Cannot add NOT NULL column(s) {', '.join(unfillable)} to tables with rows: "
+            "give them a server_default, or add them as nullable and backfill first"
+        )
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        for column in missing[table.name]:
+            sync_conn.exec_driver_sql(
+                f"ALTER TABLE {dialect.identifier_preparer.format_table(table)} "
+                f"ADD COLUMN IF NOT EXISTS {CreateColumn(column).compile(dialect=dialect)}"
+            )
+        for index in table.indexes:
+            sync_conn.execute(CreateIndex(index, if_not_exists=True))
+        for statement in table.info.get("ddl", []):
+            sync_conn.execute(statement)
+
+
+async def migrate(max_retries=5, retry_delay=5) -> bool:
+    """
+    Creates or updates the schema and records its fingerprint. Returns whether
+    any of the tables already existed.
+    """
+    async def run():
+        async with engine.begin() as conn:
+            our_table_names = set(Base.metadata.tables.keys())
+            existing_tables = await conn.run_sync(
+                lambda sync_conn: [
+                    t for t in inspect(sync_conn).get_table_names()
+                    if t in our_table_names
+                ]
+            )
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_apply_additive_ddl, set(existing_tables))
+            await conn.execute(
+                postgresql.insert(SchemaVersion)
+                .values(id=1, fingerprint=schema_fingerprint())
+                .on_conflict_do_update(
+                    index_elements=[SchemaVersion.id],
+                    set_={"fingerprint": schema_fingerprint(), "migrated_at": func.now()},
+                )
+            )
+            return len(existing_tables) != 0
+
+    return await _with_retries(run, max_retries, retry_delay)
+
+
+async def check_schema(max_retries=5, retry_delay=5) -> bool:
+    """
+    Startup check: one primary-key lookup instead of catalog introspection.
+    Returns whether the database was migrated with the current models.
+    """
+    async def run():
+        async with engine.connect() as conn:
+            try:
+                stored = (
+                    await conn.execute(
+                        select(SchemaVersion.fingerprint).where(SchemaVersion.id == 1)
+                    )
+                ).scalar_one_or_none()
+            except ProgrammingError:
+                return False
+            return stored == schema_fingerprint()
+
+    return await _with_retries(run, max_retries, retry_delay)
+
+
 async def get_session():
     async with async_session() as session:
         yield session
+
+
+class PgListener:
+    """
+    LISTENs on Postgres notification channels over one dedicated asyncpg
+    connection (outside the pool) and calls `callback(payload)` for each
+    notification. The connection is re-established when it drops; callbacks
+    are then called with None, since notifications may have been missed.
+    """
+
+    def __init__(self, retry_delay: float = 5):
+        self.retry_delay = retry_delay
+        self._callbacks: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, channel: str, callback: Callable[[Optional[str]], None]) -> None:
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, channel: str, payload: Optional[str]) -> None:
+        for callback in self._callbacks.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Notification callback for %s failed", channel)
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._callbacks:
+                    await connection.add_listener(
+                        channel, lambda _conn, _pid, channel, payload: self._dispatch(channel, payload)
+                    )
+                    self._dispatch(channel, None)
+                await closed.wait()
+                logger.warning("Notification listener connection closed, reconnecting")
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Notification listener failed to connect: %s", exc)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.retry_delay)
+
+
+pg_listener = PgListener()
@@ -1,11 +1,12 @@
-from typing import Annotated, Generic, TypeVar
+import os
+from typing import Annotated, Any, Dict, Generic, Optional, TypeVar
 
-from fastapi import Depends
+from dotenv import load_dotenv
+from fastapi import Depends, Response
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .db import get_session
 from .interfaces.auth_service import UserTokenData
 from .interfaces import (
     AuthServiceInterface,
@@ -14,6 +15,9 @@ from .interfaces import (
     CommonServiceInterface,
     RequestServiceInterface,
 )
+from .serialization import json_response
+from .services.ai_batcher import get_category_batcher
+from .services.category_cache import get_category_cache
 from .services import (
     AuthService,
     ApplicationService,
@@ -36,11 +40,42 @@ class SuccessResponse(BaseModel, Generic[T]):
     message: str = ""
 
 
-SessionDep = Annotated[AsyncSession, Depends(get_session)]
+def success_response(
+    data_type: Any, data: Any, message: str = "", headers: Optional[Dict[str, str]] = None
+) -> Response:
+    # The envelope is built without validating `data`, see json_response.
+    response_type = SuccessResponse[data_type]
+    return json_response(
+        response_type, response_type.model_construct(data=data, message=message), headers=headers
+    )
 
 
-def get_auth_service(session: SessionDep):
-    return AuthService(session)
+load_dotenv()
+# "sql" serves requests from Postgres, "memory" from a process-local store
+# (no database needed), which isolates FastAPI/validation/serialization cost.
+SERVICE_BACKEND = os.environ.get("SERVICE_BACKEND", "sql").lower()
+
+if SERVICE_BACKEND == "memory":
+    from .services.in_memory import (
+        InMemoryAIService,
+        InMemoryApplicationService,
+        InMemoryAuthService,
+        InMemoryCommonService,
+        InMemoryRequestService,
+        InMemoryStore,
+    )
+
+    memory_store = InMemoryStore.with_default_request_types()
+
+    def get_auth_service():
+        return InMemoryAuthService(memory_store)
+else:
+    from .db import get_session
+
+    SessionDep = Annotated[AsyncSession, Depends(get_session)]
+
+    def get_auth_service(session: SessionDep):
+        return AuthService(session)
 
 
 AuthServiceDep = Annotated[AuthServiceInterface, Depends(get_auth_service)]
@@ -55,40 +90,44 @@ def get_user_token_data(
 UserDataDep = Annotated[UserTokenData, Depends(get_user_token_data)]
 
 
-def get_application_service(
-    session: SessionDep,
-    auth_service: AuthServiceDep,
-):
-    return ApplicationService(session, auth_service)
-
-
-ApplicationServiceDep = Annotated[
-    ApplicationServiceInterface, Depends(get_application_service)
-]
+if SERVICE_BACKEND == "memory":
+    def get_application_service(auth_service: AuthServiceDep):
+        return InMemoryApplicationService(memory_store, auth_service)
 
+    def get_ai_service(auth_service: AuthServiceDep):
+        return InMemoryAIService(memory_store, auth_service)
 
-def get_ai_service(
-    session: SessionDep,
-    auth_service: AuthServiceDep,
-) -> AIService:
-    return AIService(session, auth_service)
+    def get_common_service():
+        return InMemoryCommonService(memory_store)
 
+    def get_request_service(auth_service: AuthServiceDep):
+        return InMemoryRequestService(memory_store, auth_service)
+else:
+    def get_application_service(
+        session: SessionDep,
+        auth_service: AuthServiceDep,
+    ):
+        return ApplicationService(session, auth_service)
 
-AIServiceDep = Annotated[AIServiceInterface, Depends(get_ai_service)]
+    def get_ai_service(
+        session: SessionDep,
+        auth_service: AuthServiceDep,
+    ) -> AIService:
+        return AIService(session, auth_service, get_category_batcher(), get_category_cache())
 
+    def get_common_service(session: SessionDep):
+        return CommonService(session)
 
-def get_common_service(session: SessionDep):
-    return CommonService(session)
+    def get_request_service(
+        session: SessionDep,
+        auth_service: AuthServiceDep,
+    ) -> RequestService:
+        return RequestService(session, auth_service)
 
 
+ApplicationServiceDep = Annotated[
+    ApplicationServiceInterface, Depends(get_application_service)
+]
+AIServiceDep = Annotated[AIServiceInterface, Depends(get_ai_service)]
 CommonServiceDep = Annotated[CommonServiceInterface, Depends(get_common_service)]
-
-
-def get_request_service(
-    session: SessionDep,
-    auth_service: AuthServiceDep,
-) -> RequestService:
-    return RequestService(session, auth_service)
-
-
 RequestServiceDep = Annotated[RequestServiceInterface, Depends(get_request_service)]
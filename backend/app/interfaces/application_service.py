@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 from .auth_service import UserTokenData
 
 
-@dataclass
+@dataclass(slots=True)
 class ApplicationInfo:
     id: int
     request_id: int
@@ -32,7 +32,7 @@ class LoginData(BaseModel):
     password: str = Field(min_length=1)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserInfo:
     id: int
     first_name: str
@@ -47,12 +47,12 @@ class UserInfo:
     experience_to_next_level: int
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthTokens:
     access_token: str
     refresh_token: str
 
-@dataclass
+@dataclass(slots=True)
 class AuthResult:
     user: UserInfo
     tokens: AuthTokens
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
-from datetime import date
-from typing import List
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Literal, Optional
 from typing_extensions import TypedDict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from .auth_service import UserInfo, UserTokenData
+from ..conditional import ResourceVersion
 
 
 class UpdateProfileData(BaseModel):
@@ -15,6 +17,70 @@ class UpdateProfileData(BaseModel):
     about_me: str = Field(min_length=0, max_length=512)
 
 
+@dataclass(slots=True)
+class UserStatsInfo:
+    requests_posted: int
+    # A help-seeker's completed requests, or those a volunteer completed.
+    requests_completed: int
+    applications_made: int
+    applications_accepted: int
+    ratings_received: int
+    # applications_accepted / applications_made; None before any application.
+    acceptance_rate: Optional[float]
+
+
+@dataclass(slots=True)
+class UserProfile(UserInfo):
+    stats: UserStatsInfo
+
+
+class AvailabilityData(BaseModel):
+    start: datetime
+    end: datetime
+
+    @model_validator(mode="after")
+    def check_order(self) -> "AvailabilityData":
+        if self.end <= self.start:
+            raise ValueError("The window must end after it starts")
+        return self
+
+
+class AvailabilityInfo(TypedDict):
+    id: int
+    start: datetime
+    end: datetime
+
+
+# Most users a leaderboard lists.
+LEADERBOARD_SIZE = 100
+
+
+class LeaderboardFilter(BaseModel):
+    # "area": users with requests (created, or accepted to help with) in the
+    # map area of the caller's latest one.
+    scope: Literal["global", "area"] = Field(default="global")
+    limit: int = Field(default=10, ge=1, le=LEADERBOARD_SIZE)
+
+
+@dataclass(slots=True)
+class LeaderboardEntry:
+    # Users with the same level and experience share a rank.
+    rank: int
+    id: int
+    first_name: str
+    last_name: str
+    level: int
+    experience: int
+
+
+@dataclass(slots=True)
+class Leaderboard:
+    entries: List[LeaderboardEntry]
+    # The caller's own entry; None in an area leaderboard when they have no
+    # requests to place them in an area.
+    me: Optional[LeaderboardEntry]
+
+
 class RequestTypeInfo(TypedDict):
     id: int
     name: str
@@ -22,7 +88,10 @@ class RequestTypeInfo(TypedDict):
 
 class CommonServiceInterface(ABC):
     @abstractmethod
-    async def get_user(self, user_id: int) -> UserInfo: ...
+    async def get_user(self, user_id: int) -> UserProfile: ...
+
+    @abstractmethod
+    async def get_user_version(self, user_id: int) -> ResourceVersion: ...
 
     @abstractmethod
     async def update_profile(
@@ -31,3 +100,20 @@ class CommonServiceInterface(ABC):
 
     @abstractmethod
     async def list_request_types(self) -> List[RequestTypeInfo]: ...
+
+    # A volunteer's availability windows, by start. Windows may not overlap.
+    @abstractmethod
+    async def list_availability(self, user: UserTokenData) -> List[AvailabilityInfo]: ...
+
+    @abstractmethod
+    async def add_availability(
+        self, user: UserTokenData, availability_data: AvailabilityData
+    ) -> AvailabilityInfo: ...
+
+    @abstractmethod
+    async def delete_availability(self, user: UserTokenData, availability_id: int) -> None: ...
+
+    @abstractmethod
+    async def get_leaderboard(
+        self, user: UserTokenData, filters: LeaderboardFilter
+    ) -> Leaderboard: ...
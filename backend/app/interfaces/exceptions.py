@@ -81,3 +81,18 @@ class RequestNotFoundError(ServiceException):
 class RequestCannotBeUpdatedError(ServiceException):
     def __init__(self, message: str = "Request cannot be updated"):
         super().__init__(message, status_code=status.HTTP_400_BAD_REQUEST)
+
+
+class TileNotFoundError(ServiceException):
+    def __init__(self, message: str = "Tile not found"):
+        super().__init__(message, status_code=status.HTTP_404_NOT_FOUND)
+
+
+class AvailabilityNotFoundError(ServiceException):
+    def __init__(self, message: str = "Availability window not found"):
+        super().__init__(message, status_code=status.HTTP_404_NOT_FOUND)
+
+
+class AvailabilityOverlapError(ServiceException):
+    def __init__(self, message: str = "Availability window overlaps an existing one"):
+        super().__init__(message, status_code=status.HTTP_409_CONFLICT)
@@ -1,12 +1,13 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields as dataclass_fields
 from datetime import datetime
-from typing import List, Optional, Literal
+from typing import Annotated, Any, Dict, List, Optional, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from .auth_service import UserTokenData
 from .common_service import RequestTypeInfo
+from ..conditional import ResourceVersion
 from ..pagination import Pagination, PaginationParams
 
 
@@ -22,13 +23,82 @@ class CreateOrUpdateRequestData(BaseModel):
     request_type_ids: List[int] = Field(default_factory=list)
 
 
-class MyRequestsFilter(PaginationParams):
+# Characters of `description` kept in `description_preview`.
+DESCRIPTION_PREVIEW_LENGTH = 160
+
+# Applications listed in a help-seeker's request detail (the accepted one
+# first, then by `applied_at`); the rest are paged with ApplicationsFilter.
+DETAIL_APPLICATIONS = 10
+
+RequestInfoField = Literal[
+    "id", "name", "description", "description_preview", "reward", "status", "start", "end",
+    "address", "longitude", "latitude", "created_at", "request_types", "application_count",
+]
+
+
+class SparseFieldsParams(BaseModel):
+    """
+    `fields=name,reward` (or repeated `fields=`) limits list items to those
+    fields plus `id`, and services load only the columns behind them.
+    Without it items have every field except `description_preview`.
+    """
+    fields: List[str] = Field(default_factory=list)
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            return [name for item in value for name in str(item).split(",") if name]
+        return value
+
+    @property
+    def is_sparse(self) -> bool:
+        return 0 < len(self.fields)
+
+    def wants(self, name: str) -> bool:
+        if not self.is_sparse:
+            return name != "description_preview"
+        return name == "id" or name in self.fields
+
+    def response_exclude(self, item_type: type) -> Optional[Dict[str, Any]]:
+        # Exclude spec for serializing a Pagination of `item_type`.
+        if not self.is_sparse:
+            return None
+        excluded = {f.name for f in dataclass_fields(item_type) if not self.wants(f.name)}
+        return {"data": {"__all__": excluded}}
+
+
+class MyRequestsFilter(PaginationParams, SparseFieldsParams):
     status: Literal["OPEN", "COMPLETED", "ALL"] = "ALL"
     sort: Literal["created_at", "start", "reward"] = "created_at"
     order: Literal["asc", "desc"] = "desc"
+    fields: List[RequestInfoField] = Field(default_factory=list)
+
+
+class MyApplicationsFilter(PaginationParams, SparseFieldsParams):
+    # The volunteer's applications by their status; archived ones included.
+    status: Literal["PENDING", "ACCEPTED", "DECLINED", "ALL"] = "ALL"
+    sort: Literal["applied_at", "start", "reward"] = "applied_at"
+    order: Literal["asc", "desc"] = "desc"
+    fields: List[Literal[RequestInfoField, "application_status", "applied_at"]] = Field(
+        default_factory=list
+    )
+
 
+class ApplicationsFilter(PaginationParams):
+    # A request's applications; `avg_rating` and `level` are the volunteer's.
+    status: Literal["PENDING", "ACCEPTED", "DECLINED", "ALL"] = "ALL"
+    sort: Literal["applied_at", "avg_rating", "level"] = "applied_at"
+    order: Literal["asc", "desc"] = "asc"
 
-class RequestsFilter(PaginationParams):
+
+class RecommendationsFilter(PaginationParams, SparseFieldsParams):
+    fields: List[Literal[RequestInfoField, "score"]] = Field(default_factory=list)
+
+
+class RequestsFilter(PaginationParams, SparseFieldsParams):
     status: Literal["OPEN", "COMPLETED", "APPLIED", "ALL"] = Field(default="OPEN")
     request_type_ids: List[int] = Field(default_factory=list)
     location_lat: Optional[float] = Field(default=None)
@@ -36,11 +106,51 @@ class RequestsFilter(PaginationParams):
     radius: int = Field(default=10)
     min_reward: Optional[int] = Field(default=None) 
     max_reward: Optional[int] = Field(default=None)
+    # Only requests whose [start, end) overlaps one of the volunteer's
+    # availability windows.
+    available: bool = Field(default=False)
     sort: Literal["start", "reward"] = Field(default="start")
     order: Literal["asc", "desc"] = Field(default="desc")
+    fields: List[Literal[RequestInfoField, "application_status"]] = Field(default_factory=list)
+
 
+class MapViewport(BaseModel):
+    min_lat: float = Field(ge=-90, le=90)
+    min_lng: float = Field(ge=-180, le=180)
+    max_lat: float = Field(ge=-90, le=90)
+    max_lng: float = Field(ge=-180, le=180)
+    zoom: int = Field(ge=0, le=22, description="Web map zoom level")
+    request_type_ids: List[int] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_corners(self) -> "MapViewport":
+        if self.max_lat < self.min_lat or self.max_lng < self.min_lng:
+            raise ValueError("The min corner must be south-west of the max corner")
+        return self
+
+
+class TileFilter(BaseModel):
+    # Same meaning as in RequestsFilter; APPLIED and ALL depend on the user.
+    status: Literal["OPEN", "COMPLETED", "APPLIED", "ALL"] = Field(default="OPEN")
+    request_type_ids: List[int] = Field(default_factory=list)
+
+
+class RequestEventsFilter(BaseModel):
+    # New requests within `radius` km of the location (anywhere without one)
+    # having any of the request types (any type without them).
+    location_lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    location_lng: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius: int = Field(default=10, gt=0, le=1000)
+    request_type_ids: List[int] = Field(default_factory=list)
 
-@dataclass
+    @model_validator(mode="after")
+    def check_location(self) -> "RequestEventsFilter":
+        if (self.location_lat is None) != (self.location_lng is None):
+            raise ValueError("location_lat and location_lng must be given together")
+        return self
+
+
+@dataclass(slots=True)
 class RequestInfo:
     id: int
     name: str
@@ -55,14 +165,30 @@ class RequestInfo:
     created_at: datetime
     request_types: List[RequestTypeInfo]
     application_count: int
+    # Only filled (and serialized) when requested through `fields`.
+    description_preview: Annotated[
+        Optional[str], Field(exclude_if=lambda value: value is None)
+    ] = field(default=None, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestWithApplicationStatus(RequestInfo):
     application_status: str
 
 
-@dataclass
+@dataclass(slots=True)
+class RequestWithApplication(RequestInfo):
+    application_status: str
+    applied_at: datetime
+
+
+@dataclass(slots=True)
+class RecommendedRequest(RequestInfo):
+    # Higher is a better match for the volunteer; comparable within a feed only.
+    score: float
+
+
+@dataclass(slots=True)
 class UserInfo:
     id: int
     first_name: str
@@ -70,7 +196,7 @@ class UserInfo:
     avg_rating: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ApplicationInfo:
     id: int
     status: str
@@ -78,19 +204,66 @@ class ApplicationInfo:
     applied_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
+class ApplicationCounts:
+    pending: int
+    accepted: int
+    declined: int
+
+
+@dataclass(slots=True)
 class RequestDetailForHelpSeeker(RequestInfo):
+    # The first DETAIL_APPLICATIONS applications, counted by status.
     applications: List[ApplicationInfo]
+    application_counts: ApplicationCounts
     has_rated_helper: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestDetailForVolunteer(RequestInfo):
     application_status: str
     creator: UserInfo
     has_rated_seeker: bool
 
 
+@dataclass(slots=True)
+class RequestTypeCount:
+    id: int
+    name: str
+    count: int
+
+
+@dataclass(slots=True)
+class MapCluster:
+    latitude: float
+    longitude: float
+    count: int
+    request_types: List[RequestTypeCount]
+
+
+@dataclass(slots=True)
+class MapPoint:
+    id: int
+    name: str
+    reward: float
+    latitude: float
+    longitude: float
+    request_types: List[RequestTypeInfo]
+
+
+@dataclass(slots=True)
+class MapView:
+    """
+    Open requests in a viewport: grid clusters (centroid, count, category
+    mix), or the requests themselves from `MAP_POINTS_ZOOM` on while they
+    fit in `MAP_MAX_POINTS`. `cell_size` is the grid's cell in degrees.
+    """
+    zoom: int
+    cell_size: Optional[float]
+    clusters: List[MapCluster]
+    points: List[MapPoint]
+
+
 class RequestServiceInterface(ABC):
     @abstractmethod
     async def create_request(
@@ -113,17 +286,51 @@ class RequestServiceInterface(ABC):
         self, user: UserTokenData, request_id: int
     ) -> RequestDetailForHelpSeeker: ...
 
+    @abstractmethod
+    async def get_request_applications(
+        self, user: UserTokenData, request_id: int, filters: ApplicationsFilter
+    ) -> Pagination[ApplicationInfo]: ...
+
     @abstractmethod
     async def get_request_for_volunteer(
         self, user: UserTokenData, request_id: int
     ) -> RequestDetailForVolunteer: ...
 
+    @abstractmethod
+    async def get_request_version_for_help_seeker(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion: ...
+
+    @abstractmethod
+    async def get_request_version_for_volunteer(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion: ...
+
     @abstractmethod
     async def get_my_requests(
         self, user: UserTokenData, filters: MyRequestsFilter
     ) -> Pagination[RequestInfo]: ...
 
+    @abstractmethod
+    async def get_my_applications(
+        self, user: UserTokenData, filters: MyApplicationsFilter
+    ) -> Pagination[RequestWithApplication]: ...
+
+    @abstractmethod
+    async def get_recommendations(
+        self, user: UserTokenData, filters: RecommendationsFilter
+    ) -> Pagination[RecommendedRequest]: ...
+
     @abstractmethod
     async def get_requests(
         self, user: UserTokenData, filters: RequestsFilter
     ) -> Pagination[RequestWithApplicationStatus]: ...
+
+    @abstractmethod
+    async def get_map(self, user: UserTokenData, viewport: MapViewport) -> MapView: ...
+
+    # Mapbox Vector Tile of the matching requests, in a layer named "requests".
+    @abstractmethod
+    async def get_tile(
+        self, user: UserTokenData, z: int, x: int, y: int, filters: TileFilter
+    ) -> bytes: ...
@@ -2,20 +2,48 @@ import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, status
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from .db import create_db_and_tables
-from .routers import auth, common, help_seeker, volunteer
+from .dependencies import SERVICE_BACKEND
+from .routers import auth, common, events, help_seeker, metrics, tiles, volunteer
 from .interfaces.exceptions import ServiceException
+from .services.ai_client import close_ai_client, open_ai_client
+
+
+if SERVICE_BACKEND != "memory":
+    from .db import DB_STATEMENT_STATS, async_session, check_schema, pg_listener, statement_counter
+    from .services.event_hub import APPLICATION_CHANNEL, NotificationEvents, event_hub
+    from .services.leaderboard import LEADERBOARD_CHANNEL, leaderboard_cache
+    from .services.request_type_catalog import REQUEST_TYPE_CHANNEL, request_type_catalog
+    from .services.tile_cache import REQUEST_CHANNEL, tile_cache
+else:
+    DB_STATEMENT_STATS = False
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_db_and_tables()
+    if SERVICE_BACKEND != "memory":
+        if not await check_schema():
+            raise RuntimeError(
+                "Database schema is missing or out of date, run `python -m scripts.migrate`"
+            )
+        async with async_session() as session:
+            await request_type_catalog.ensure_loaded(session)
+        pg_listener.add_listener(REQUEST_TYPE_CHANNEL, request_type_catalog.invalidate)
+        pg_listener.add_listener(REQUEST_CHANNEL, tile_cache.invalidate)
+        pg_listener.add_listener(LEADERBOARD_CHANNEL, leaderboard_cache.invalidate)
+        notification_events = NotificationEvents(event_hub, async_session)
+        pg_listener.add_listener(APPLICATION_CHANNEL, notification_events.on_application_changed)
+        pg_listener.add_listener(REQUEST_CHANNEL, notification_events.on_request_changed)
+        pg_listener.start()
+    open_ai_client()
     yield
+    await close_ai_client()
+    if SERVICE_BACKEND != "memory":
+        await pg_listener.stop()
 
 
 load_dotenv()
@@ -39,10 +67,25 @@ if os.environ.get("DEV", False):
         allow_headers=["*"],
     )
 
+if DB_STATEMENT_STATS:
+    @app.middleware("http")
+    async def count_db_statements(request: Request, call_next):
+        counter = [0]
+        token = statement_counter.set(counter)
+        try:
+            response = await call_next(request)
+        finally:
+            statement_counter.reset(token)
+        response.headers["X-DB-Statements"] = str(counter[0])
+        return response
+
 app.include_router(auth.router, prefix=API_ROUTES_PREFIX)
 app.include_router(common.router, prefix=API_ROUTES_PREFIX)
 app.include_router(help_seeker.router, prefix=API_ROUTES_PREFIX)
 app.include_router(volunteer.router, prefix=API_ROUTES_PREFIX)
+app.include_router(tiles.router, prefix=API_ROUTES_PREFIX)
+app.include_router(events.router, prefix=API_ROUTES_PREFIX)
+app.include_router(metrics.router)
 
 
 @app.exception_handler(ServiceException)
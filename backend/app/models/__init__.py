@@ -1,19 +1,36 @@
 from .application import Application, ApplicationStatus
+from .availability import Availability
+from .archive import ApplicationArchive, ApplicationHistory, RequestArchive, RequestHistory
 from .base import Base
+from .outbox import OutboxMessage
+from .recommendation import Recommendation, VolunteerProfile
 from .refresh_token import RefreshToken
 from .request import Request, RequestStatus
 from .request_type import RequestType
+from .schema_version import SchemaVersion
 from .type_of import TypeOf
 from .user import User
+from .user_stats import USER_STATS_COLUMNS, UserStats
 
 __all__ = [
     "Base",
     "Application",
     "ApplicationStatus",
+    "ApplicationArchive",
+    "ApplicationHistory",
+    "Availability",
+    "OutboxMessage",
+    "Recommendation",
     "Request",
+    "RequestArchive",
+    "RequestHistory",
     "RequestStatus",
     "RequestType",
+    "SchemaVersion",
     "TypeOf",
     "User",
+    "UserStats",
+    "USER_STATS_COLUMNS",
+    "VolunteerProfile",
     "RefreshToken",
 ]
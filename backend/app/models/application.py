@@ -3,10 +3,9 @@ from enum import Enum
 from typing import Optional
 
 import sqlalchemy as sa
-from sqlalchemy import event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base
+from .base import Base, add_table_ddl
 
 
 class ApplicationStatus(Enum):
@@ -19,6 +18,8 @@ class Application(Base):
     __tablename__ = "application"
     __table_args__ = (
         sa.UniqueConstraint("request_id", "user_id"),
+        # A volunteer's applications, newest first.
+        sa.Index("idx_application_user_applied_at", "user_id", "applied_at"),
     )
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
@@ -43,65 +44,68 @@ class Application(Base):
     request: Mapped["Request"] = relationship("Request", viewonly=True)
 
 
-update_help_seeker_func = sa.DDL("""
-CREATE OR REPLACE FUNCTION update_help_seeker_avg_rating_func()
-RETURNS TRIGGER AS $$
-DECLARE
-    help_seeker_id INT;
-BEGIN
-    IF (OLD.help_seeker_rating IS DISTINCT FROM NEW.help_seeker_rating) THEN
-        -- Get the creator_id (help seeker's ID) from the request table
-        SELECT creator_id INTO help_seeker_id
-        FROM request
-        WHERE id = NEW.request_id;
-
-        UPDATE "user"
-        SET avg_rating = (
-            SELECT COALESCE(AVG(a.help_seeker_rating), 0)
-            FROM application a
-            JOIN request r ON a.request_id = r.id
-            WHERE r.creator_id = help_seeker_id AND a.help_seeker_rating IS NOT NULL
-        )
-        WHERE id = help_seeker_id;
-    END IF;
-    RETURN NULL;
-END;
-$$ LANGUAGE plpgsql;
+# Rating averages used to be recomputed here by row triggers, holding the
+# rated user's row lock in the rating transaction. The outbox worker does it
+# now (refresh_rating); these drop the triggers from existing databases.
+drop_help_seeker_rating_trigger = sa.DDL("""
+DROP FUNCTION IF EXISTS update_help_seeker_avg_rating_func() CASCADE;
 """)
 
-update_help_seeker_trigger = sa.DDL("""
-CREATE OR REPLACE TRIGGER update_avg_help_seeker_rating
-AFTER UPDATE OF help_seeker_rating ON application
-FOR EACH ROW
-EXECUTE FUNCTION update_help_seeker_avg_rating_func();
+drop_volunteer_rating_trigger = sa.DDL("""
+DROP FUNCTION IF EXISTS update_volunteer_avg_rating_func() CASCADE;
 """)
 
-update_volunteer_func = sa.DDL("""
-CREATE OR REPLACE FUNCTION update_volunteer_avg_rating_func()
+# Notifies application_changed when a volunteer applies, withdraws or is
+# accepted, with the request's creator so the event reaches their streams.
+# Rows moved to the archive (kindly.archiving set) are not withdrawals.
+notify_application_changed_func = sa.DDL("""
+CREATE OR REPLACE FUNCTION notify_application_changed_func()
 RETURNS TRIGGER AS $$
+DECLARE
+    changed application%%ROWTYPE;
 BEGIN
-    IF (OLD.volunteer_rating IS DISTINCT FROM NEW.volunteer_rating) THEN
-        UPDATE "user"
-        SET avg_rating = (
-            SELECT COALESCE(AVG(a.volunteer_rating), 0)
-            FROM application a
-            WHERE a.user_id = NEW.user_id AND a.volunteer_rating IS NOT NULL
-        )
-        WHERE id = NEW.user_id;
+    IF current_setting('kindly.archiving', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
     END IF;
+
+    PERFORM pg_notify('application_changed', jsonb_build_object(
+        'op', TG_OP,
+        'request_id', changed.request_id,
+        'creator_id', (SELECT creator_id FROM request WHERE id = changed.request_id),
+        'volunteer_id', changed.user_id,
+        'status', changed.status
+    )::TEXT);
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 """)
 
-update_volunteer_trigger = sa.DDL("""
-CREATE OR REPLACE TRIGGER update_avg_volunteer_rating
-AFTER UPDATE OF volunteer_rating ON application
+notify_application_changed_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_application_changed
+AFTER INSERT OR DELETE ON application
+FOR EACH ROW
+EXECUTE FUNCTION notify_application_changed_func();
+""")
+
+notify_application_accepted_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_application_accepted
+AFTER UPDATE OF status ON application
 FOR EACH ROW
-EXECUTE FUNCTION update_volunteer_avg_rating_func();
+WHEN (NEW.status = 'ACCEPTED' AND OLD.status IS DISTINCT FROM NEW.status)
+EXECUTE FUNCTION notify_application_changed_func();
 """)
 
-event.listen(Application.__table__, "after_create", update_help_seeker_func.execute_if(dialect="postgresql"))
-event.listen(Application.__table__, "after_create", update_help_seeker_trigger.execute_if(dialect="postgresql"))
-event.listen(Application.__table__, "after_create", update_volunteer_func.execute_if(dialect="postgresql"))
-event.listen(Application.__table__, "after_create", update_volunteer_trigger.execute_if(dialect="postgresql"))
+add_table_ddl(
+    Application.__table__,
+    drop_help_seeker_rating_trigger,
+    drop_volunteer_rating_trigger,
+    notify_application_changed_func,
+    notify_application_changed_trigger,
+    notify_application_accepted_trigger,
+)
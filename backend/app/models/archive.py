@@ -0,0 +1,134 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, foreign, mapped_column, query_expression, relationship
+
+from .application import Application, ApplicationStatus
+from .base import Base
+from .request import Request, RequestStatus
+from .user import User
+
+
+# Completed requests moved out of `request` by the archiver (see
+# services.archive), with their request type ids folded into an array.
+# They are never shown on the map, so `location` is not kept.
+class RequestArchive(Base):
+    __tablename__ = "request_archive"
+    __table_args__ = (
+        sa.Index("idx_request_archive_latitude_longitude", "latitude", "longitude"),
+    )
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True, autoincrement=False)
+
+    name: Mapped[str] = mapped_column(sa.String, nullable=False)
+    description: Mapped[str] = mapped_column(sa.String, nullable=False)
+    reward: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+
+    application_count: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    status: Mapped[RequestStatus] = mapped_column(sa.Enum(RequestStatus), nullable=False)
+
+    start: Mapped[datetime] = mapped_column(sa.TIMESTAMP(timezone=True), nullable=False)
+    end: Mapped[datetime] = mapped_column(sa.TIMESTAMP(timezone=True), nullable=False)
+
+    address: Mapped[str] = mapped_column(sa.String, nullable=False)
+    longitude: Mapped[Decimal] = mapped_column(sa.Numeric, nullable=False)
+    latitude: Mapped[Decimal] = mapped_column(sa.Numeric, nullable=False)
+
+    creator_id: Mapped[int] = mapped_column(sa.Integer, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(sa.TIMESTAMP(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(sa.TIMESTAMP(timezone=True), nullable=False)
+
+    request_type_ids: Mapped[Optional[List[int]]] = mapped_column(sa.ARRAY(sa.Integer))
+    archived_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+
+
+# Applications of archived requests.
+class ApplicationArchive(Base):
+    __tablename__ = "application_archive"
+    __table_args__ = (
+        sa.Index("idx_application_archive_user_applied_at", "user_id", "applied_at"),
+    )
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True, autoincrement=False)
+
+    request_id: Mapped[int] = mapped_column(sa.Integer, nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+
+    status: Mapped[ApplicationStatus] = mapped_column(sa.Enum(ApplicationStatus), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(sa.TIMESTAMP(timezone=True), nullable=False)
+
+    volunteer_rating: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
+    help_seeker_rating: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
+
+    archived_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+
+
+# Columns shared by the live and archive tables, in the order the history
+# unions select them.
+REQUEST_HISTORY_COLUMNS = [
+    "id", "name", "description", "reward", "application_count", "status", "start", "end",
+    "address", "longitude", "latitude", "creator_id", "created_at", "updated_at",
+]
+APPLICATION_HISTORY_COLUMNS = [
+    "id", "request_id", "user_id", "status", "applied_at", "volunteer_rating", "help_seeker_rating",
+]
+
+request_history = sa.union_all(
+    sa.select(
+        *(Request.__table__.c[name] for name in REQUEST_HISTORY_COLUMNS),
+        Request.request_type_ids.expression.label("request_type_ids"),
+    ),
+    sa.select(
+        *(RequestArchive.__table__.c[name] for name in REQUEST_HISTORY_COLUMNS),
+        RequestArchive.__table__.c.request_type_ids,
+    ),
+).subquery("request_history")
+
+application_history = sa.union_all(
+    sa.select(*(Application.__table__.c[name] for name in APPLICATION_HISTORY_COLUMNS)),
+    sa.select(*(ApplicationArchive.__table__.c[name] for name in APPLICATION_HISTORY_COLUMNS)),
+).subquery("application_history")
+
+
+# Read-only views of live and archived rows together, for history reads (a
+# user's own requests and applications, details, rating averages). Postgres
+# pushes filters down into both sides of the union. They have the attributes
+# of Request and Application that the services read, so the same queries and
+# converters work on either.
+class ApplicationHistory(Base):
+    __table__ = application_history
+    __mapper_args__ = {"primary_key": [application_history.c.id]}
+
+    volunteer: Mapped[User] = relationship(
+        User,
+        primaryjoin=foreign(application_history.c.user_id) == User.id,
+        viewonly=True,
+    )
+
+
+class RequestHistory(Base):
+    __table__ = request_history
+    __mapper_args__ = {"primary_key": [request_history.c.id]}
+
+    description_preview: Mapped[Optional[str]] = query_expression()
+
+    creator: Mapped[User] = relationship(
+        User,
+        primaryjoin=foreign(request_history.c.creator_id) == User.id,
+        viewonly=True,
+    )
+    applications: Mapped[List[ApplicationHistory]] = relationship(
+        ApplicationHistory,
+        primaryjoin=request_history.c.id == foreign(application_history.c.request_id),
+        viewonly=True,
+    )
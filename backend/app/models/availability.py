@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import TSTZRANGE, ExcludeConstraint, Range
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# A [start, end) window in which a volunteer is free, matched against
+# tstzrange(request.start, request.end) by the feed's `available` filter.
+# A volunteer's windows never overlap; the exclusion constraint's GiST index
+# on (user_id, during) also serves the feed's per-request overlap probes.
+class Availability(Base):
+    __tablename__ = "availability"
+    __table_args__ = (
+        ExcludeConstraint(
+            ("user_id", "="),
+            ("during", "&&"),
+            name="excl_availability_user_during",
+            using="gist",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    during: Mapped[Range[datetime]] = mapped_column(TSTZRANGE, nullable=False)
+
+
+# btree_gist provides the GiST operator class behind `user_id WITH =`.
+event.listen(
+    Availability.__table__,
+    "before_create",
+    sa.DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
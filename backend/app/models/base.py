@@ -1,3 +1,13 @@
+from sqlalchemy import DDL, Table, event
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+
+def add_table_ddl(table: Table, *statements: DDL):
+    # Postgres-only DDL (functions, triggers, ...) that belongs to `table`. It
+    # runs when the table is created and is kept in table.info so the migrate
+    # command can re-apply it to tables that already exist.
+    for statement in statements:
+        event.listen(table, "after_create", statement.execute_if(dialect="postgresql"))
+    table.info.setdefault("ddl", []).extend(statements)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, add_table_ddl
+
+
+# A side effect written in the same transaction as the change causing it and
+# carried out later by the outbox worker (scripts.worker), which deletes it in
+# the transaction applying the effect. Pending messages with the same `key`
+# are coalesced into one; the worker clears the key when it claims a message,
+# so retried messages have none either. Messages out of retries are kept for
+# inspection, with `available_at` set to infinity.
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        sa.Index("idx_outbox_available", "available_at", "id"),
+        sa.Index("idx_outbox_key", "key", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(sa.BigInteger, primary_key=True)
+    kind: Mapped[str] = mapped_column(sa.String, nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    key: Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+
+    attempts: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+
+
+# Wakes the worker up; one notification per inserting statement.
+notify_outbox_func = sa.DDL("""
+CREATE OR REPLACE FUNCTION notify_outbox_func()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('outbox', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""")
+
+notify_outbox_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_outbox
+AFTER INSERT ON outbox
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_outbox_func();
+""")
+
+add_table_ddl(
+    OutboxMessage.__table__,
+    notify_outbox_func,
+    notify_outbox_trigger,
+)
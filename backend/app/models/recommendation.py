@@ -0,0 +1,58 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .types import Geography
+
+
+# What the recommendation feed knows about a volunteer, derived from their
+# applications (live and archived) by services.recommendations: the centroid
+# of the requests they applied to and their share of applications per
+# request type id (JSON object keys are the ids as strings). New requests are
+# scored for the volunteers whose home is near or whose affinity overlaps.
+class VolunteerProfile(Base):
+    __tablename__ = "volunteer_profile"
+    __table_args__ = (
+        sa.Index("idx_volunteer_profile_location", "location", postgresql_using="gist"),
+        sa.Index("idx_volunteer_profile_affinity", "affinity", postgresql_using="gin"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    latitude: Mapped[Optional[Decimal]] = mapped_column(sa.Numeric, nullable=True)
+    longitude: Mapped[Optional[Decimal]] = mapped_column(sa.Numeric, nullable=True)
+    location: Mapped[Optional[str]] = mapped_column(Geography("POINT", srid=4326), nullable=True)
+    affinity: Mapped[Dict[str, float]] = mapped_column(
+        JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+
+
+# A volunteer's precomputed candidate requests with their scores, at most
+# RECOMMENDATION_CANDIDATES per volunteer. Rows of requests that stopped
+# being open are filtered out when served and dropped on the next refresh.
+class Recommendation(Base):
+    __tablename__ = "recommendation"
+    __table_args__ = (
+        # Served by score descending, then request id descending: a backward scan.
+        sa.Index("idx_recommendation_user_score", "user_id", "score", "request_id"),
+        sa.Index("idx_recommendation_request", "request_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    request_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("request.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(sa.Float, nullable=False)
@@ -1,23 +1,48 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 import sqlalchemy as sa
-from geoalchemy2 import Geography
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Mapped, column_property, mapped_column, query_expression, relationship
 
-from .base import Base
+from .base import Base, add_table_ddl
+from .type_of import TypeOf
+from .types import Geography
 
 
 class RequestStatus(Enum):
     OPEN = "OPEN"
     CLOSED = "CLOSED"
     COMPLETED = "COMPLETED"
+    # Still open when its `end` passed; set by the expiry sweeper.
+    EXPIRED = "EXPIRED"
 
 
 class Request(Base):
     __tablename__ = "request"
+    __table_args__ = (
+        sa.Index("idx_request_location", "location", postgresql_using="gist"),
+        # Open requests by end, for the expiry sweeper and the feeds' end filter.
+        sa.Index("idx_request_open_end", "end", postgresql_where=sa.text("status = 'OPEN'")),
+        # Open requests' [start, end), for the feed's `available` filter
+        # when it is driven from the volunteer's availability windows.
+        sa.Index(
+            "idx_request_open_during",
+            sa.text('tstzrange(start, "end")'),
+            postgresql_using="gist",
+            postgresql_where=sa.text("status = 'OPEN'"),
+        ),
+        # Requests by coordinates, for the users active in a leaderboard area.
+        sa.Index("idx_request_latitude_longitude", "latitude", "longitude"),
+        # Completed requests by age, for the archiver.
+        sa.Index(
+            "idx_request_completed_updated_at",
+            "updated_at",
+            postgresql_where=sa.text("status = 'COMPLETED'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
 
@@ -36,7 +61,7 @@ class Request(Base):
     address: Mapped[str] = mapped_column(sa.String, nullable=False)
     longitude: Mapped[Decimal] = mapped_column(sa.Numeric, nullable=False)
     latitude: Mapped[Decimal] = mapped_column(sa.Numeric, nullable=False)
-    location: Mapped[Geography] = mapped_column(
+    location: Mapped[str] = mapped_column(
         Geography("POINT", srid=4326), nullable=False
     )
 
@@ -61,5 +86,73 @@ class Request(Base):
         "Application", back_populates="request"
     )
 
+    # Type ids without loading RequestType rows; names come from the
+    # request type catalog. Deferred, so queries opt in with undefer().
+    request_type_ids: Mapped[Optional[List[int]]] = column_property(
+        sa.select(sa.func.array_agg(aggregate_order_by(TypeOf.request_type_id, TypeOf.id)))
+        .where(TypeOf.request_id == id)
+        .correlate_except(TypeOf)
+        .scalar_subquery(),
+        deferred=True,
+    )
+    # Truncated description, filled by queries using with_expression().
+    description_preview: Mapped[Optional[str]] = query_expression()
+
     def calculate_experience(self) -> int:
         return self.reward / 10
+
+
+# Notifies request_changed with the old and new coordinates, e.g. for tile
+# cache invalidation. Updates that change nothing shown on the map (like
+# application_count) are skipped; updated_at covers request type changes.
+notify_request_changed_func = sa.DDL("""
+CREATE OR REPLACE FUNCTION notify_request_changed_func()
+RETURNS TRIGGER AS $$
+DECLARE
+    locations JSONB := '[]'::JSONB;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF (NEW.status, NEW.reward, NEW.latitude, NEW.longitude, NEW.updated_at)
+            IS NOT DISTINCT FROM
+            (OLD.status, OLD.reward, OLD.latitude, OLD.longitude, OLD.updated_at)
+        THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        locations := locations || jsonb_build_array(jsonb_build_array(OLD.latitude, OLD.longitude));
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        locations := locations || jsonb_build_array(jsonb_build_array(NEW.latitude, NEW.longitude));
+    END IF;
+
+    PERFORM pg_notify('request_changed', jsonb_build_object(
+        'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END,
+        'op', TG_OP,
+        'locations', locations
+    )::TEXT);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""")
+
+notify_request_changed_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_request_changed
+AFTER INSERT OR UPDATE OR DELETE ON request
+FOR EACH ROW
+EXECUTE FUNCTION notify_request_changed_func();
+""")
+
+# Enum types are only created with their table, so values added later are
+# added here for existing databases.
+add_expired_status = sa.DDL("""
+ALTER TYPE requeststatus ADD VALUE IF NOT EXISTS 'EXPIRED';
+""")
+
+add_table_ddl(
+    Request.__table__,
+    add_expired_status,
+    notify_request_changed_func,
+    notify_request_changed_trigger,
+)
@@ -3,7 +3,7 @@ from typing import List
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base
+from .base import Base, add_table_ddl
 
 
 class RequestType(Base):
@@ -15,3 +15,27 @@ class RequestType(Base):
     requests: Mapped[List["Request"]] = relationship(
         secondary="type_of", back_populates="request_types"
     )
+
+
+notify_request_type_changed_func = sa.DDL("""
+CREATE OR REPLACE FUNCTION notify_request_type_changed_func()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('request_type_changed', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""")
+
+notify_request_type_changed_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_request_type_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON request_type
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_request_type_changed_func();
+""")
+
+add_table_ddl(
+    RequestType.__table__,
+    notify_request_type_changed_func,
+    notify_request_type_changed_trigger,
+)
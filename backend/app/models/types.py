@@ -0,0 +1,15 @@
+from sqlalchemy.types import UserDefinedType
+
+
+class Geography(UserDefinedType):
+    # PostGIS geography column. Values are written with SQL functions
+    # (ST_Point, ...) and never decoded in Python, so the column type is all
+    # the ORM needs; this keeps geoalchemy2 out of every worker's imports.
+    cache_ok = True
+
+    def __init__(self, geometry_type: str = "GEOMETRY", srid: int = 4326):
+        self.geometry_type = geometry_type
+        self.srid = srid
+
+    def get_col_spec(self, **kw) -> str:
+        return f"geography({self.geometry_type},{self.srid})"
@@ -4,11 +4,15 @@ from typing import List
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base
+from .base import Base, add_table_ddl
 
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        # The leaderboard's order, for its top and its per-standing counts.
+        sa.Index("idx_user_level_experience", "level", "experience", "id"),
+    )
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
 
@@ -51,3 +55,40 @@ class User(Base):
         while self.experience >= self.experience_to_next_level():
             self.experience -= self.experience_to_next_level()
             self.level += 1
+
+
+# Notifies user_experience_changed with a user's old and new [level,
+# experience] (null for a new or deleted user), so the leaderboard cache
+# can move them without reloading.
+notify_user_experience_changed_func = sa.DDL("""
+CREATE OR REPLACE FUNCTION notify_user_experience_changed_func()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF (NEW.level, NEW.experience) IS NOT DISTINCT FROM (OLD.level, OLD.experience) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    PERFORM pg_notify('user_experience_changed', jsonb_build_object(
+        'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END,
+        'old', CASE WHEN TG_OP = 'INSERT' THEN NULL ELSE jsonb_build_array(OLD.level, OLD.experience) END,
+        'new', CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE jsonb_build_array(NEW.level, NEW.experience) END
+    )::TEXT);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""")
+
+notify_user_experience_changed_trigger = sa.DDL("""
+CREATE OR REPLACE TRIGGER notify_user_experience_changed
+AFTER INSERT OR DELETE OR UPDATE OF level, experience ON "user"
+FOR EACH ROW
+EXECUTE FUNCTION notify_user_experience_changed_func();
+""")
+
+add_table_ddl(
+    User.__table__,
+    notify_user_experience_changed_func,
+    notify_user_experience_changed_trigger,
+)
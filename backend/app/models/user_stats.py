@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Per-user activity counters shown on profiles, kept up to date by the
+# outbox worker at every state transition (see outbox.count_user_stats) and
+# recomputed from the live and archived rows by scripts.rebuild_user_stats.
+# Users without a row have done nothing yet.
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Created as a help-seeker.
+    requests_posted: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, server_default=sa.text("0")
+    )
+    # A help-seeker's completed requests, or the completed requests a
+    # volunteer was accepted for.
+    requests_completed: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, server_default=sa.text("0")
+    )
+    # A volunteer's applications, withdrawn ones excluded.
+    applications_made: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, server_default=sa.text("0")
+    )
+    applications_accepted: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, server_default=sa.text("0")
+    )
+    ratings_received: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, server_default=sa.text("0")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("CURRENT_TIMESTAMP"),
+    )
+
+
+USER_STATS_COLUMNS = [
+    "requests_posted",
+    "requests_completed",
+    "applications_made",
+    "applications_accepted",
+    "ratings_received",
+]
@@ -10,7 +10,7 @@ from sqlalchemy.sql import func
 
 T = TypeVar("T")
 
-@dataclass(frozen=False)
+@dataclass(slots=True)
 class Pagination(Generic[T]):
     data: List[T]
     page: int
@@ -38,3 +38,13 @@ class PaginationParams(BaseModel):
             total=total,
             totalPages=max(1, math.ceil(total / self.limit)),
         )
+
+    def paginate_items(self, items: List[Any]) -> Pagination[Any]:
+        offset = (self.page - 1) * self.limit
+        return Pagination(
+            data=items[offset:offset + self.limit],
+            page=self.page,
+            limit=self.limit,
+            total=len(items),
+            totalPages=max(1, math.ceil(len(items) / self.limit)),
+        )
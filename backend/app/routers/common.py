@@ -1,46 +1,97 @@
-from typing import List
+from typing import Annotated, List
 
+from fastapi import Query, Request
 from fastapi.routing import APIRouter
 
+from ..conditional import ResourceVersion, is_not_modified, not_modified
 from ..interfaces.auth_service import UserInfo
-from ..interfaces.common_service import RequestTypeInfo, UpdateProfileData
-from ..dependencies import CommonServiceDep, SuccessResponse, UserDataDep
+from ..interfaces.common_service import (
+    AvailabilityData,
+    AvailabilityInfo,
+    Leaderboard,
+    LeaderboardFilter,
+    RequestTypeInfo,
+    UpdateProfileData,
+    UserProfile,
+)
+from ..dependencies import CommonServiceDep, SuccessResponse, UserDataDep, success_response
+from ..services.category_cache import category_set_version
 
 router = APIRouter(prefix="/common", tags=["common"])
 
 
 @router.get("/profile")
 async def get_profile(
-    common_service: CommonServiceDep, user_data: UserDataDep
-) -> SuccessResponse[UserInfo]:
+    common_service: CommonServiceDep, user_data: UserDataDep, request: Request
+) -> SuccessResponse[UserProfile]:
+    version = await common_service.get_user_version(user_data["id"])
+    if is_not_modified(request, version):
+        return not_modified(version)
+
     user_info = await common_service.get_user(user_data["id"])
-    return SuccessResponse(
-        data=user_info
-    )
+    return success_response(UserProfile, user_info, headers=version.headers())
 
 
 @router.put("/profile")
 async def update_profile(
     common_service: CommonServiceDep, user_data: UserDataDep, body: UpdateProfileData
 ) -> SuccessResponse[UserInfo]:
-    user_info =  await common_service.update_profile(user_data, body)
-    return SuccessResponse(
-        data=user_info
-    )
+    user_info = await common_service.update_profile(user_data, body)
+    return success_response(UserInfo, user_info)
+
+
+@router.get("/availability")
+async def list_availability(
+    common_service: CommonServiceDep, user_data: UserDataDep
+) -> SuccessResponse[List[AvailabilityInfo]]:
+    windows = await common_service.list_availability(user_data)
+    return success_response(List[AvailabilityInfo], windows)
+
+
+@router.post("/availability")
+async def add_availability(
+    common_service: CommonServiceDep, user_data: UserDataDep, body: AvailabilityData
+) -> SuccessResponse[AvailabilityInfo]:
+    window = await common_service.add_availability(user_data, body)
+    return success_response(AvailabilityInfo, window)
+
+
+@router.delete("/availability/{availability_id}")
+async def delete_availability(
+    common_service: CommonServiceDep, user_data: UserDataDep, availability_id: int
+) -> SuccessResponse[None]:
+    await common_service.delete_availability(user_data, availability_id)
+    return SuccessResponse(data=None, message="Availability window deleted")
+
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+    common_service: CommonServiceDep, user_data: UserDataDep,
+    filters: Annotated[LeaderboardFilter, Query()],
+) -> SuccessResponse[Leaderboard]:
+    leaderboard = await common_service.get_leaderboard(user_data, filters)
+    return success_response(Leaderboard, leaderboard)
 
 
 @router.get("/users/{user_id}")
 async def get_user(
-    common_service: CommonServiceDep, _: UserDataDep, user_id: int
-) -> SuccessResponse[UserInfo]:
+    common_service: CommonServiceDep, _: UserDataDep, user_id: int, request: Request
+) -> SuccessResponse[UserProfile]:
+    version = await common_service.get_user_version(user_id)
+    if is_not_modified(request, version):
+        return not_modified(version)
+
     user_info = await common_service.get_user(user_id)
-    return SuccessResponse(
-        data=user_info
-    )
+    return success_response(UserProfile, user_info, headers=version.headers())
 
 
 @router.get("/request-types")
 async def list_request_types(
-    common_service: CommonServiceDep, user_data: UserDataDep
+    common_service: CommonServiceDep, user_data: UserDataDep, request: Request
 ) -> SuccessResponse[List[RequestTypeInfo]]:
-    return SuccessResponse(data=await common_service.list_request_types())
+    request_types = await common_service.list_request_types()
+    version = ResourceVersion(f'"{category_set_version(request_types)}"')
+    if is_not_modified(request, version):
+        return not_modified(version)
+
+    return success_response(List[RequestTypeInfo], request_types, headers=version.headers())
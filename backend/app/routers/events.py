@@ -0,0 +1,60 @@
+from typing import Annotated
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+
+from ..interfaces.auth_service import UserRoles
+from ..interfaces.request_service import RequestEventsFilter
+from ..dependencies import AuthServiceDep, UserDataDep
+from ..services.event_hub import Subscription, event_hub
+
+router = APIRouter()
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+
+def event_stream(subscription: Subscription) -> StreamingResponse:
+    return StreamingResponse(
+        event_hub.stream(subscription),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        # Proxies must pass events on as they come.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/help-seeker/events",
+    tags=["help-seeker"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {EVENT_STREAM_MEDIA_TYPE: {}}}},
+)
+async def help_seeker_events(auth_service: AuthServiceDep, user: UserDataDep):
+    """
+    Server-sent events about the applications to the user's requests:
+    `application_created`, `application_withdrawn` and `application_accepted`,
+    with the request id, volunteer id and application status. `resync` means
+    events may have been missed.
+    """
+    auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+    return event_stream(event_hub.subscribe_help_seeker(user["id"]))
+
+
+@router.get(
+    "/volunteer/events",
+    tags=["volunteer"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {EVENT_STREAM_MEDIA_TYPE: {}}}},
+)
+async def volunteer_events(
+    auth_service: AuthServiceDep,
+    user: UserDataDep,
+    filters: Annotated[RequestEventsFilter, Query()],
+):
+    """
+    Server-sent `new_request` events (a map point) for requests opened in the
+    subscribed area and request types. `resync` means events may have been
+    missed.
+    """
+    auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+    return event_stream(event_hub.subscribe_volunteer(user["id"], filters))
@@ -1,12 +1,16 @@
 from typing import Annotated, List
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 
+from ..conditional import is_not_modified, not_modified
 from ..pagination import Pagination
+from ..serialization import json_response
 from ..interfaces.ai_service import CategoryGenerationRequest
 from ..interfaces.common_service import RequestTypeInfo
 from ..interfaces.application_service import RateVolunteerData
 from ..interfaces.request_service import (
+    ApplicationInfo,
+    ApplicationsFilter,
     CreateOrUpdateRequestData,
     MyRequestsFilter,
     RequestDetailForHelpSeeker,
@@ -18,6 +22,7 @@ from ..dependencies import (
     RequestServiceDep,
     SuccessResponse,
     UserDataDep,
+    success_response,
 )
 
 
@@ -26,12 +31,15 @@ router = APIRouter(prefix="/help-seeker/requests", tags=["help-seeker"])
 
 @router.get("/{request_id}")
 async def get_request(
-    user: UserDataDep, request_service: RequestServiceDep, request_id: int
+    user: UserDataDep, request_service: RequestServiceDep, request_id: int,
+    request: Request,
 ) -> SuccessResponse[RequestDetailForHelpSeeker]:
+    version = await request_service.get_request_version_for_help_seeker(user, request_id)
+    if is_not_modified(request, version):
+        return not_modified(version)
+
     result = await request_service.get_request_for_help_seeker(user, request_id)
-    return SuccessResponse(
-        data=result
-    )
+    return success_response(RequestDetailForHelpSeeker, result, headers=version.headers())
 
 
 @router.post("/")
@@ -39,9 +47,7 @@ async def create_request(
     user: UserDataDep, request_service: RequestServiceDep, body: CreateOrUpdateRequestData
 ) -> SuccessResponse[RequestInfo]:
     request_info = await request_service.create_request(user, body)
-    return SuccessResponse(
-        data=request_info
-    )
+    return success_response(RequestInfo, request_info)
 
 
 @router.put("/{request_id}")
@@ -49,9 +55,7 @@ async def update_request(
     user: UserDataDep, request_service: RequestServiceDep, body: CreateOrUpdateRequestData, request_id: int
 ) -> SuccessResponse[RequestInfo]:
     request_info = await request_service.update_request(user, request_id, body)
-    return SuccessResponse(
-        data=request_info
-    )
+    return success_response(RequestInfo, request_info)
 
 
 @router.delete("/{request_id}")
@@ -68,7 +72,11 @@ async def delete_request(
 async def get_my_requests(
     user: UserDataDep, request_service: RequestServiceDep, body: Annotated[MyRequestsFilter, Query()]
 ) -> Pagination[RequestInfo]:
-    return await request_service.get_my_requests(user, body)
+    return json_response(
+        Pagination[RequestInfo],
+        await request_service.get_my_requests(user, body),
+        exclude=body.response_exclude(RequestInfo),
+    )
 
 
 @router.patch("/{request_id}/complete")
@@ -79,6 +87,17 @@ async def complete_request(
     return SuccessResponse(data=None)
 
 
+@router.get("/{request_id}/applications")
+async def get_applications(
+    user: UserDataDep, request_service: RequestServiceDep, request_id: int,
+    body: Annotated[ApplicationsFilter, Query()],
+) -> Pagination[ApplicationInfo]:
+    return json_response(
+        Pagination[ApplicationInfo],
+        await request_service.get_request_applications(user, request_id, body),
+    )
+
+
 @router.patch("/{request_id}/applications/{volunteer_id}/accept")
 async def accept_application(
     user: UserDataDep, application_service: ApplicationServiceDep, request_id: int, volunteer_id: int
@@ -99,4 +118,4 @@ async def rate_volunteer(
 async def generate_categories(
     user: UserDataDep, ai_service: AIServiceDep, body: CategoryGenerationRequest
 ) -> SuccessResponse[List[RequestTypeInfo]]:
-    return SuccessResponse(data=await ai_service.generate_categories(user, body))
+    return success_response(List[RequestTypeInfo], await ai_service.generate_categories(user, body))
@@ -0,0 +1,21 @@
+from fastapi import Response
+from fastapi.routing import APIRouter
+
+from ..dependencies import SERVICE_BACKEND
+from ..services.metrics import METRICS_MEDIA_TYPE, outbox_samples, process_samples, render
+
+if SERVICE_BACKEND != "memory":
+    from ..db import async_session
+
+# Outside API_ROUTES_PREFIX: scraped from inside the deployment rather than
+# through the public API.
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=Response, include_in_schema=False)
+async def get_metrics() -> Response:
+    samples = process_samples()
+    if SERVICE_BACKEND != "memory":
+        async with async_session() as session:
+            samples += await outbox_samples(session)
+    return Response(render(samples), media_type=METRICS_MEDIA_TYPE)
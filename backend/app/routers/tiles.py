@@ -0,0 +1,28 @@
+from typing import Annotated
+
+from fastapi import Path, Query, Response
+from fastapi.routing import APIRouter
+
+from ..interfaces.request_service import TileFilter
+from ..dependencies import RequestServiceDep, UserDataDep
+
+router = APIRouter(prefix="/volunteer/tiles", tags=["volunteer"])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get(
+    "/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}},
+)
+async def get_tile(
+    request_service: RequestServiceDep,
+    user: UserDataDep,
+    z: Annotated[int, Path(ge=0, le=22)],
+    x: Annotated[int, Path(ge=0)],
+    y: Annotated[int, Path(ge=0)],
+    filters: Annotated[TileFilter, Query()],
+) -> Response:
+    tile = await request_service.get_tile(user, z, x, y, filters)
+    return Response(tile, media_type=MVT_MEDIA_TYPE)
@@ -1,11 +1,19 @@
 from typing import Annotated
 
-from fastapi import Query
+from fastapi import Query, Request
 from fastapi.routing import APIRouter
 
+from ..conditional import is_not_modified, not_modified
 from ..pagination import Pagination
+from ..serialization import json_response
 from ..interfaces.request_service import (
+    MapView,
+    MapViewport,
+    MyApplicationsFilter,
+    RecommendationsFilter,
+    RecommendedRequest,
     RequestDetailForVolunteer,
+    RequestWithApplication,
     RequestWithApplicationStatus,
     RequestsFilter,
 )
@@ -15,6 +23,7 @@ from ..dependencies import (
     SuccessResponse,
     UserDataDep,
     ApplicationServiceDep,
+    success_response,
 )
 
 
@@ -24,16 +33,55 @@ router = APIRouter(prefix="/volunteer/requests", tags=["volunteer"])
 async def get_requests(
     request_service: RequestServiceDep, user: UserDataDep, body: Annotated[RequestsFilter, Query()]
 ) -> Pagination[RequestWithApplicationStatus]:
-    return await request_service.get_requests(user, body)
+    return json_response(
+        Pagination[RequestWithApplicationStatus],
+        await request_service.get_requests(user, body),
+        exclude=body.response_exclude(RequestWithApplicationStatus),
+    )
+
+
+@router.get("/applications")
+async def get_my_applications(
+    request_service: RequestServiceDep, user: UserDataDep,
+    body: Annotated[MyApplicationsFilter, Query()],
+) -> Pagination[RequestWithApplication]:
+    return json_response(
+        Pagination[RequestWithApplication],
+        await request_service.get_my_applications(user, body),
+        exclude=body.response_exclude(RequestWithApplication),
+    )
+
+
+@router.get("/recommended")
+async def get_recommendations(
+    request_service: RequestServiceDep, user: UserDataDep,
+    body: Annotated[RecommendationsFilter, Query()],
+) -> Pagination[RecommendedRequest]:
+    return json_response(
+        Pagination[RecommendedRequest],
+        await request_service.get_recommendations(user, body),
+        exclude=body.response_exclude(RecommendedRequest),
+    )
+
+
+@router.get("/map")
+async def get_map(
+    request_service: RequestServiceDep, user: UserDataDep, viewport: Annotated[MapViewport, Query()]
+) -> SuccessResponse[MapView]:
+    return success_response(MapView, await request_service.get_map(user, viewport))
 
 
 @router.get("/{request_id}")
 async def get_request(
-    request_service: RequestServiceDep, user: UserDataDep, request_id: int
+    request_service: RequestServiceDep, user: UserDataDep, request_id: int,
+    request: Request,
 ) -> SuccessResponse[RequestDetailForVolunteer]:
-    return SuccessResponse(
-        data=await request_service.get_request_for_volunteer(user, request_id),
-    )
+    version = await request_service.get_request_version_for_volunteer(user, request_id)
+    if is_not_modified(request, version):
+        return not_modified(version)
+
+    result = await request_service.get_request_for_volunteer(user, request_id)
+    return success_response(RequestDetailForVolunteer, result, headers=version.headers())
 
 
 @router.post("/{request_id}/application")
@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    # Building the serializer is the expensive part, so once per type.
+    return TypeAdapter(response_type)
+
+
+def json_response(
+    response_type: Any,
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+    exclude: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Encodes service results as `response_type` straight to JSON bytes.
+    Unlike returning them for FastAPI's response_model, nothing is
+    validated or copied first: the services already build well-typed DTOs.
+    Routes keep `response_type` as their return annotation, which is what
+    the OpenAPI schema is generated from. `exclude` is passed to the
+    serializer, e.g. for sparse fieldsets.
+    """
+    if isinstance(content, BaseModel):
+        body = content.__pydantic_serializer__.to_json(content, exclude=exclude)
+    else:
+        body = _adapter(response_type).dump_json(content, exclude=exclude)
+    return Response(body, status_code, headers, media_type="application/json")
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..interfaces.exceptions import AIServiceUnavailableError
+from .ai_client import AIClient, get_ai_client
+from .category_cache import normalize
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.S)
+
+Key = Tuple[str, str]
+
+
+@dataclass
+class _Batch:
+    category_names: List[str]
+    items: List[Tuple[Key, str, asyncio.Future]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def build_prompt(category_names: List[str], descriptions: List[str]) -> str:
+    numbered = "\n".join(
+        f"{i}. {json.dumps(description)}" for i, description in enumerate(descriptions, start=1)
+    )
+    return f"""
+    Please choose the most relevant categories for each of the following
+    numbered request descriptions from the following list:
+    {', '.join(category_names)}
+
+    Descriptions:
+    {numbered}
+
+    Respond with only a JSON object that maps each description number to a
+    list of the chosen category names, for example {{"1": ["{category_names[0] if category_names else ''}"], "2": []}}.
+    """
+
+
+def parse_response(content: Optional[str], count: int) -> List[List[str]]:
+    """
+    Chosen category names (lowercased) per description; descriptions whose
+    entry is missing or neither a list nor a string get none. Raises
+    ValueError when the response is not the requested JSON object.
+    """
+    if content is None:
+        return [[] for _ in range(count)]
+
+    match = _JSON_OBJECT.search(content)
+    if match is None:
+        raise ValueError("No JSON object in the response")
+    chosen = json.loads(match[0])
+    if not isinstance(chosen, dict):
+        raise ValueError("Response is not a JSON object")
+
+    results = []
+    for i in range(1, count + 1):
+        names = chosen.get(str(i))
+        if isinstance(names, str):
+            names = names.split(",")
+        elif not isinstance(names, list):
+            names = []
+        results.append([str(name).strip().lower() for name in names])
+    return results
+
+
+class CategoryBatcher:
+    """
+    Collects category suggestions for up to `max_wait` seconds (or until
+    `max_batch` descriptions are waiting) and asks the model for all of them
+    in one prompt. Callers asking about a description that is already
+    waiting or in flight share its future instead of adding another item.
+    """
+
+    def __init__(self, client: AIClient, max_batch: int = 16, max_wait: float = 0.005):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: Dict[str, _Batch] = {}
+        self._in_flight: Dict[Key, asyncio.Future] = {}
+        self.stats = {"calls": 0, "items": 0, "coalesced": 0}
+
+    async def classify(self, version: str, category_names: List[str], description: str) -> List[str]:
+        key = (version, normalize(description))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            # Keeps "exception was never retrieved" quiet when every waiter is gone.
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._in_flight[key] = future
+
+            batch = self._pending.get(version)
+            if batch is None:
+                batch = self._pending[version] = _Batch(category_names)
+                batch.timer = asyncio.get_running_loop().call_later(
+                    self.max_wait, self._flush, version
+                )
+            batch.items.append((key, description, future))
+            if len(batch.items) >= self.max_batch:
+                self._flush(version)
+
+        # One caller giving up must not cancel the answer for the others.
+        return await asyncio.shield(future)
+
+    def _flush(self, version: str) -> None:
+        batch = self._pending.pop(version, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        asyncio.get_running_loop().create_task(self._send(batch))
+
+    async def _send(self, batch: _Batch) -> None:
+        descriptions = [description for _, description, _ in batch.items]
+        self.stats["calls"] += 1
+        self.stats["items"] += len(descriptions)
+        try:
+            content = await self.client.complete(build_prompt(batch.category_names, descriptions))
+            try:
+                results = parse_response(content, len(descriptions))
+            except ValueError as exc:
+                raise AIServiceUnavailableError("AI Service returned an invalid response") from exc
+        except Exception as exc:
+            for _, _, future in batch.items:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, _, future), result in zip(batch.items, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for key, _, _ in batch.items:
+                self._in_flight.pop(key, None)
+
+
+_batcher: Optional[CategoryBatcher] = None
+
+
+def get_category_batcher() -> Optional[CategoryBatcher]:
+    # Follows the lifespan-managed client, so a reopened client gets a new batcher.
+    global _batcher
+    client = get_ai_client()
+    if client is None:
+        return None
+    if _batcher is None or _batcher.client is not client:
+        _batcher = CategoryBatcher(
+            client,
+            max_batch=int(os.getenv("GENAI_BATCH_SIZE", "16")),
+            max_wait=float(os.getenv("GENAI_BATCH_WAIT_MS", "5")) / 1000,
+        )
+    return _batcher
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+from ..interfaces.exceptions import AIServiceUnavailableError
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    until `reset_timeout` seconds have passed. After that calls are let
+    through again (half-open): the first success closes the breaker, the
+    first failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+class AIClient:
+    """
+    Process-wide chat completion client. One keep-alive connection pool is
+    shared by all requests, at most `max_concurrency` calls are in flight,
+    every call (including the wait for a slot) has a `timeout` deadline, and
+    an open circuit breaker fails calls fast with AIServiceUnavailableError.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str = "gemini-2.5-flash",
+        timeout: float = 10.0,
+        max_concurrency: int = 8,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = None
+
+    @classmethod
+    def from_env(cls) -> Optional["AIClient"]:
+        api_key = os.getenv("GENAI_API_KEY")
+        base_url = os.getenv("GENAI_URL")
+        if api_key is None or base_url is None:
+            return None
+
+        return cls(
+            api_key=api_key,
+            base_url=base_url,
+            model=os.getenv("GENAI_MODEL", "gemini-2.5-flash"),
+            timeout=float(os.getenv("GENAI_TIMEOUT", "10")),
+            max_concurrency=int(os.getenv("GENAI_MAX_CONCURRENCY", "8")),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("GENAI_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("GENAI_BREAKER_RESET", "30")),
+            ),
+        )
+
+    def _get_client(self):
+        if self._client is None:
+            # openai's type tree is the slowest import in the app; load it on first use.
+            import httpx
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                # The deadline and the breaker replace openai's own retries.
+                max_retries=0,
+                timeout=self.timeout,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                    ),
+                ),
+            )
+        return self._client
+
+    async def complete(self, prompt: str) -> Optional[str]:
+        if not self.breaker.allow():
+            raise AIServiceUnavailableError
+
+        from openai import APIError
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            # Every slot is busy for the whole deadline; the calls holding
+            # them record their own outcome, so this one is not counted.
+            raise AIServiceUnavailableError from None
+
+        try:
+            response = await asyncio.wait_for(
+                self._get_client().chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                ),
+                max(0.0, deadline - time.monotonic()),
+            )
+        except (APIError, asyncio.TimeoutError) as exc:
+            self.breaker.record_failure()
+            raise AIServiceUnavailableError from exc
+        finally:
+            self._semaphore.release()
+
+        self.breaker.record_success()
+        return response.choices[0].message.content
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+_ai_client: Optional[AIClient] = None
+
+
+def get_ai_client() -> Optional[AIClient]:
+    return _ai_client
+
+
+def open_ai_client() -> Optional[AIClient]:
+    global _ai_client
+    _ai_client = AIClient.from_env()
+    return _ai_client
+
+
+async def close_ai_client() -> None:
+    global _ai_client
+    if _ai_client is not None:
+        await _ai_client.close()
+        _ai_client = None
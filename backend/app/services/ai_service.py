@@ -1,7 +1,8 @@
+import asyncio
 import os
-from typing import List
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple
 
-from openai import AsyncOpenAI
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,54 +14,100 @@ from ..interfaces.ai_service import (
     CategoryGenerationRequest,
     RequestTypeInfo,
 )
-from ..models import RequestType
+from ..models import Request, TypeOf
+from .ai_batcher import CategoryBatcher
+from .category_cache import CategoryCache
+from .category_classifier import CategoryClassifier, ensure_category_classifier
+from .request_type_catalog import request_type_catalog
+
+# Local predictions at or above this confidence skip the LLM.
+CLASSIFIER_THRESHOLD = float(os.getenv("GENAI_CLASSIFIER_THRESHOLD", "0.25"))
+# The classifier is retrained from the latest requests after this many seconds.
+CLASSIFIER_MAX_AGE = float(os.getenv("GENAI_CLASSIFIER_MAX_AGE", "3600"))
+CLASSIFIER_TRAINING_LIMIT = 5000
+
+
+async def load_training_examples(
+    session: AsyncSession, limit: int = CLASSIFIER_TRAINING_LIMIT
+) -> List[Tuple[str, Sequence[int]]]:
+    """
+    The latest `limit` labelled requests as (name and description, type ids).
+    """
+    latest = (
+        select(Request.id, Request.name, Request.description)
+        .order_by(Request.id.desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = await session.execute(
+        select(latest.c.id, latest.c.name, latest.c.description, TypeOf.request_type_id)
+        .join(TypeOf, TypeOf.request_id == latest.c.id)
+    )
+
+    texts, labels = {}, defaultdict(list)
+    for request_id, name, description, request_type_id in rows:
+        texts[request_id] = f"{name}. {description}"
+        labels[request_id].append(request_type_id)
+    return [(texts[request_id], labels[request_id]) for request_id in texts]
 
 
 class AIService(AIServiceInterface):
-    def __init__(self, session: AsyncSession, auth_service: AuthServiceInterface):
+    def __init__(
+        self,
+        session: AsyncSession,
+        auth_service: AuthServiceInterface,
+        batcher: Optional[CategoryBatcher] = None,
+        cache: Optional[CategoryCache] = None,
+    ):
         self.session = session
         self.auth_service = auth_service
+        self.batcher = batcher
+        self.cache = cache
 
     async def generate_categories(self, user: UserTokenData, request: CategoryGenerationRequest) -> List[RequestTypeInfo]:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
 
-        api_key = os.getenv("GENAI_API_KEY")
-        base_url = os.getenv("GENAI_URL")
-        
-        if api_key is None or base_url is None:
-            raise AIServiceUnavailableError
-
-        all_request_types = (await self.session.execute(select(RequestType))).scalars().all()
-        category_names = [rt.name for rt in all_request_types]
+        await request_type_catalog.ensure_loaded(self.session)
+        all_request_types = request_type_catalog.all()
+        version = request_type_catalog.version
+        if self.cache is not None:
+            cached = self.cache.get(version, request.description)
+            if cached is not None:
+                return cached
 
-        prompt = f"""
-        The user has provided the following description for a request:
-        "{request.description}"
+        async def train() -> CategoryClassifier:
+            examples = await load_training_examples(self.session)
+            # Fitting is pure-Python CPU work; off the loop, other requests
+            # keep being served meanwhile.
+            return await asyncio.to_thread(
+                CategoryClassifier.fit,
+                {rt["id"]: rt["name"] for rt in all_request_types},
+                examples,
+            )
 
-        Please choose the most relevant categories from the following list:
-        {', '.join(category_names)}
+        classifier = await ensure_category_classifier(version, CLASSIFIER_MAX_AGE, train)
+        # Hand the connection back to the pool while waiting on the model.
+        await self.session.commit()
 
-        Return a comma-separated list of the chosen category names.
-        """
+        chosen_ids, confidence = classifier.predict(request.description)
+        local_result = request_type_catalog.infos(chosen_ids)
+        if CLASSIFIER_THRESHOLD <= confidence or self.batcher is None:
+            return local_result
 
-        client = AsyncOpenAI(api_key=api_key, base_url=base_url)
-        response = await client.chat.completions.create(
-            model="gemini-2.5-flash",
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-        
-        chosen_category_names = response.choices[0].message.content
-        if chosen_category_names is None:
-            return []
+        try:
+            chosen_category_names = await self.batcher.classify(
+                version, [rt["name"] for rt in all_request_types], request.description
+            )
+        except AIServiceUnavailableError:
+            # A low-confidence local guess beats no suggestion at all.
+            if local_result:
+                return local_result
+            raise
 
-        chosen_category_names = [
-            name.strip().lower() for name in chosen_category_names.split(",")
-        ]
-        
-        return [
-            RequestTypeInfo(id=rt.id, name=rt.name)
-            for rt in all_request_types
-            if rt.name.lower() in chosen_category_names
+        result = [
+            rt for rt in all_request_types
+            if rt["name"].lower() in chosen_category_names
         ]
+        if self.cache is not None:
+            self.cache.put(version, request.description, result)
+        return result
@@ -1,8 +1,17 @@
+from typing import Literal, Optional, Tuple, Union
+
 from sqlalchemy import delete, select, text, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Application, Request, RequestStatus, ApplicationStatus, User
+from ..models import (
+    Application,
+    ApplicationArchive,
+    ApplicationStatus,
+    Request,
+    RequestArchive,
+    RequestStatus,
+)
 from ..interfaces import AuthServiceInterface, ApplicationServiceInterface
 from ..interfaces.auth_service import UserRoles, UserTokenData
 from ..interfaces.application_service import (
@@ -19,6 +28,8 @@ from ..interfaces.exceptions import (
     NoRequestFoundError,
     ApplicationAlreadyExists,
 )
+from . import outbox
+from .request_service import IS_OPEN
 
 
 class ApplicationService(ApplicationServiceInterface):
@@ -30,15 +41,18 @@ class ApplicationService(ApplicationServiceInterface):
         self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
 
         async with self.session.begin():
-            request = (
+            row = (
                 await self.session.execute(
-                    select(Request).filter(Request.id == request_id).with_for_update()
+                    select(Request, IS_OPEN).filter(Request.id == request_id).with_for_update()
                 )
-            ).scalar_one_or_none()
-            if request is None:
+            ).one_or_none()
+            if row is None:
                 raise NoRequestFoundError
 
-            if request.status != RequestStatus.OPEN:
+            # Past-`end` requests are closed even before the expiry sweeper
+            # marks them, as in the feed.
+            request, is_open = row
+            if not is_open:
                 raise RequestNotOpen
 
             try:
@@ -51,6 +65,8 @@ class ApplicationService(ApplicationServiceInterface):
                 await self.session.flush()
             except IntegrityError:
                 raise ApplicationAlreadyExists
+            await self._refresh_recommendations(user["id"])
+            await outbox.enqueue_user_stats(self.session, user["id"], applications_made=1)
 
         return ApplicationInfo(
             id=application.id,
@@ -64,15 +80,16 @@ class ApplicationService(ApplicationServiceInterface):
         self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
 
         async with self.session.begin():
-            request = (
+            row = (
                 await self.session.execute(
-                    select(Request).filter(Request.id == request_id).with_for_update()
+                    select(Request, IS_OPEN).filter(Request.id == request_id).with_for_update()
                 )
-            ).scalar_one_or_none()
-            if request is None:
+            ).one_or_none()
+            if row is None:
                 raise NoRequestFoundError
 
-            if request.status != RequestStatus.OPEN:
+            request, is_open = row
+            if not is_open:
                 raise CanNotDeleteApplicationError
 
             result = await self.session.execute(
@@ -85,14 +102,16 @@ class ApplicationService(ApplicationServiceInterface):
             if rows_affected == 0:
                 raise NoApplicationFoundError
             request.application_count -= 1
+            await self._refresh_recommendations(user["id"])
+            await outbox.enqueue_user_stats(self.session, user["id"], applications_made=-1)
 
     async def accept_application(self, user: UserTokenData, request_id: int, volunteer_id: int) -> None:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
 
         async with self.session.begin():
-            request = (
+            row = (
                 await self.session.execute(
-                    select(Request)
+                    select(Request, IS_OPEN)
                     .join(Application)
                     .filter(Request.creator_id == user["id"])
                     .filter(
@@ -101,11 +120,12 @@ class ApplicationService(ApplicationServiceInterface):
                     )
                     .with_for_update()
                 )
-            ).scalar_one_or_none()
-            if request is None:
+            ).one_or_none()
+            if row is None:
                 raise NoRequestFoundError
 
-            if request.status != RequestStatus.OPEN:
+            request, is_open = row
+            if not is_open:
                 raise CanNotAcceptApplication
 
             await self.session.execute(
@@ -118,61 +138,87 @@ class ApplicationService(ApplicationServiceInterface):
                 )
             )
             request.status = RequestStatus.CLOSED
+            await outbox.enqueue_user_stats(self.session, volunteer_id, applications_accepted=1)
+            # Drops the request from every volunteer's recommendations.
+            await outbox.enqueue(
+                self.session, "rescore_request", {"request_id": request_id},
+                key=f"rescore_request:{request_id}",
+            )
 
     async def rate_volunteer(self, user: UserTokenData, request_id: int, rating_data: RateVolunteerData) -> None:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
 
         async with self.session.begin():
-            application = (
-                await self.session.execute(
-                    select(Application)
-                    .join(Request)
-                    .filter(Request.id == request_id)
-                    .filter(Request.creator_id == user["id"])
-                    .filter(Application.status == ApplicationStatus.ACCEPTED)
-                    .filter(Request.status == RequestStatus.COMPLETED)
-                )
-            ).scalar_one_or_none()
-            if application is None:
+            row = await self._accepted_application(request_id, creator_id=user["id"])
+            if row is None:
                 raise ApplicationCannotBeRated
+            application, _ = row
 
+            if application.volunteer_rating is None:
+                await outbox.enqueue_user_stats(self.session, application.user_id, ratings_received=1)
             application.volunteer_rating = rating_data.rating
-
-            xp = self._xp_for_rating(rating_data.rating)
-            volunteer = await self.session.get(User, application.user_id)
-            if volunteer is not None:
-                volunteer.add_experience(xp)
+            await self._rated(application.user_id, "volunteer", rating_data.rating)
 
     async def rate_seeker(self, user: UserTokenData, request_id: int, rating_data: RateSeekerData) -> None:
         self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
 
         async with self.session.begin():
-            application = (
-                await self.session.execute(
-                    select(Application)
-                    .join(Request)
-                    .filter(Request.id == request_id)
-                    .filter(Application.user_id == user["id"])
-                    .filter(Application.status == ApplicationStatus.ACCEPTED)
-                    .filter(Request.status == RequestStatus.COMPLETED)
-                )
-            ).scalar_one_or_none()
-            if application is None:
+            row = await self._accepted_application(request_id, volunteer_id=user["id"])
+            if row is None:
                 raise ApplicationCannotBeRated
+            application, creator_id = row
 
+            if application.help_seeker_rating is None:
+                await outbox.enqueue_user_stats(self.session, creator_id, ratings_received=1)
             application.help_seeker_rating = rating_data.rating
+            await self._rated(creator_id, "help_seeker", rating_data.rating)
+
+    async def _accepted_application(
+        self,
+        request_id: int,
+        creator_id: Optional[int] = None,
+        volunteer_id: Optional[int] = None,
+    ) -> Optional[Tuple[Union[Application, ApplicationArchive], int]]:
+        # The accepted application of a completed request and the request's
+        # creator. Completed requests are archived after a while, so the
+        # archive tables are read on a miss and ratings are written there.
+        # Locking the request makes the archiver skip it until commit.
+        for requests, applications in ((Request, Application), (RequestArchive, ApplicationArchive)):
+            query = (
+                select(applications, requests.creator_id)
+                .join(requests, requests.id == applications.request_id)
+                .filter(requests.id == request_id)
+                .filter(applications.status == ApplicationStatus.ACCEPTED)
+                .filter(requests.status == RequestStatus.COMPLETED)
+                .with_for_update()
+            )
+            if creator_id is not None:
+                query = query.filter(requests.creator_id == creator_id)
+            if volunteer_id is not None:
+                query = query.filter(applications.user_id == volunteer_id)
+            row = (await self.session.execute(query)).one_or_none()
+            if row is not None:
+                return row
+        return None
+
+    async def _refresh_recommendations(self, user_id: int) -> None:
+        # The volunteer's profile moved; keyed, so a burst of applications
+        # rebuilds their candidates once.
+        await outbox.enqueue(
+            self.session, "refresh_recommendations", {"user_id": user_id},
+            key=f"refresh_recommendations:{user_id}",
+        )
 
-            xp = self._xp_for_rating(rating_data.rating)
-            if xp > 0:
-                request = (
-                    await self.session.execute(
-                        select(Request).filter(Request.id == request_id)
-                    )
-                ).scalar_one_or_none()
-                if request is not None:
-                    seeker = await self.session.get(User, request.creator_id)
-                    if seeker is not None:
-                        seeker.add_experience(xp)
+    async def _rated(self, user_id: int, role: Literal["volunteer", "help_seeker"], rating: int) -> None:
+        # The rated user's average and XP are updated by the outbox worker,
+        # so the rating transaction doesn't wait for their row lock.
+        await outbox.enqueue(
+            self.session, "refresh_rating", {"user_id": user_id, "role": role},
+            key=outbox.refresh_rating_key(role, user_id),
+        )
+        xp = self._xp_for_rating(rating)
+        if xp > 0:
+            await outbox.enqueue(self.session, "award_experience", {"user_id": user_id, "xp": xp})
 
     def _xp_for_rating(self, rating: int) -> int:
         return rating * 10
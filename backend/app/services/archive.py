@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Application, ApplicationArchive, Request, RequestArchive, RequestStatus, TypeOf
+from ..models.archive import APPLICATION_HISTORY_COLUMNS, REQUEST_HISTORY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class RequestArchiver:
+    """
+    Moves requests completed more than `age_days` ago, with their
+    applications and request types, from the live tables to the archive
+    tables, keeping the live tables (and the feeds and map reading them)
+    the size of recent activity. A batch of `batch_size` requests is
+    claimed with FOR UPDATE SKIP LOCKED and moved in one transaction, so
+    every request is either live or archived, and batches are `pause`
+    seconds apart. History reads go through RequestHistory and
+    ApplicationHistory, which cover both.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        age_days: int = 90,
+        batch_size: int = 500,
+        pause: float = 0.5,
+    ):
+        self.session_factory = session_factory
+        self.age_days = age_days
+        self.batch_size = batch_size
+        self.pause = pause
+
+    @classmethod
+    def from_env(cls, session_factory: Callable[[], AsyncSession]) -> "RequestArchiver":
+        return cls(
+            session_factory,
+            age_days=int(os.getenv("ARCHIVE_AFTER_DAYS", "90")),
+            batch_size=int(os.getenv("ARCHIVE_BATCH_SIZE", "500")),
+            pause=float(os.getenv("ARCHIVE_PAUSE", "0.5")),
+        )
+
+    async def archive_once(self) -> int:
+        """Archives one batch, returning the number of requests archived."""
+        due = (
+            select(Request.id)
+            .where(Request.status == RequestStatus.COMPLETED)
+            .where(Request.updated_at < func.now() - timedelta(days=self.age_days))
+            .order_by(Request.updated_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session, session.begin():
+            request_ids = (await session.execute(due)).scalars().all()
+            if not request_ids:
+                return 0
+
+            # Silences the application_changed trigger: these are not
+            # withdrawals. Local to this transaction.
+            await session.execute(select(func.set_config("kindly.archiving", "on", True)))
+
+            applications = Application.__table__
+            moved_applications = (
+                delete(applications)
+                .where(applications.c.request_id.in_(request_ids))
+                .returning(*(applications.c[name] for name in APPLICATION_HISTORY_COLUMNS))
+                .cte("moved_applications")
+            )
+            await session.execute(
+                insert(ApplicationArchive)
+                .from_select(APPLICATION_HISTORY_COLUMNS, select(moved_applications))
+                .add_cte(moved_applications)
+            )
+
+            type_of = TypeOf.__table__
+            requests = Request.__table__
+            moved_types = (
+                delete(type_of)
+                .where(type_of.c.request_id.in_(request_ids))
+                .returning(type_of.c.id, type_of.c.request_id, type_of.c.request_type_id)
+                .cte("moved_types")
+            )
+            moved_requests = (
+                delete(requests)
+                .where(requests.c.id.in_(request_ids))
+                .returning(*(requests.c[name] for name in REQUEST_HISTORY_COLUMNS))
+                .cte("moved_requests")
+            )
+            request_type_ids = (
+                select(
+                    func.array_agg(
+                        aggregate_order_by(moved_types.c.request_type_id, moved_types.c.id)
+                    )
+                )
+                .where(moved_types.c.request_id == moved_requests.c.id)
+                .scalar_subquery()
+            )
+            await session.execute(
+                insert(RequestArchive)
+                .from_select(
+                    [*REQUEST_HISTORY_COLUMNS, "request_type_ids"],
+                    select(
+                        *(moved_requests.c[name] for name in REQUEST_HISTORY_COLUMNS),
+                        request_type_ids,
+                    ),
+                )
+                .add_cte(moved_types)
+                .add_cte(moved_requests)
+            )
+        return len(request_ids)
+
+    async def archive(self) -> int:
+        """Archives every due request, batch by batch."""
+        total = 0
+        while True:
+            count = await self.archive_once()
+            total += count
+            if count < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        if total:
+            logger.info("Archived %d completed requests", total)
+        return total
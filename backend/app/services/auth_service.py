@@ -1,8 +1,8 @@
 import os
 from datetime import datetime, timedelta, timezone
+from functools import cache
 
 import jwt
-from pwdlib import PasswordHash
 from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -30,7 +30,14 @@ from .common_service import CommonService
 JWT_ALGORITHM = "HS256"
 JWT_SECRET_KEY = os.getenv("JWT_SECRET")
 
-password_hash = PasswordHash.recommended()
+
+@cache
+def password_hash():
+    # argon2 (a cffi extension) is only loaded once a password is hashed or
+    # verified, not in every worker that merely checks access tokens.
+    from pwdlib import PasswordHash
+
+    return PasswordHash.recommended()
 
 
 class AuthService(AuthServiceInterface):
@@ -41,7 +48,7 @@ class AuthService(AuthServiceInterface):
         user = (
             await self.session.execute(select(User).filter(User.email == login_data.email))
         ).scalars().first()
-        if not user or not password_hash.verify(login_data.password, user.password):
+        if not user or not password_hash().verify(login_data.password, user.password):
             raise InvalidEmailOrPasswordError
 
         refresh_token = self._create_token(user, REFRESH_TOKEN_EXPIRY)
@@ -59,7 +66,7 @@ class AuthService(AuthServiceInterface):
             first_name=body.first_name,
             last_name=body.last_name,
             email=body.email,
-            password=password_hash.hash(body.password),
+            password=password_hash().hash(body.password),
             date_of_birth=body.date_of_birth,
             about_me=body.about_me,
             is_volunteer=body.is_volunteer,
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from ..interfaces.common_service import RequestTypeInfo
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# Mersenne prime used by the MinHash permutations, and a 32-bit mask.
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+
+
+def normalize(description: str) -> str:
+    return _NON_WORD.sub(" ", description.lower()).strip()
+
+
+def category_set_version(request_types: List[RequestTypeInfo]) -> str:
+    # Suggestions computed against another category list must not be served.
+    names = "\n".join(f"{rt['id']}:{rt['name']}" for rt in sorted(request_types, key=lambda rt: rt["id"]))
+    return hashlib.sha1(names.encode()).hexdigest()
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles, so descriptions that differ
+    by a word or some punctuation get signatures that agree in roughly the
+    fraction of their shingle sets' Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        generator = hashlib.blake2b(str(seed).encode(), digest_size=64)
+        self.permutations = []
+        for i in range(num_perm):
+            digest = hashlib.blake2b(generator.digest() + i.to_bytes(4, "big"), digest_size=16).digest()
+            a = int.from_bytes(digest[:8], "big") % (_PRIME - 1) + 1
+            b = int.from_bytes(digest[8:], "big") % _PRIME
+            self.permutations.append((a, b))
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> Set[int]:
+        text = f" {text} "
+        return {
+            zlib.crc32(text[i:i + self.shingle_size].encode())
+            for i in range(max(1, len(text) - self.shingle_size + 1))
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        shingles = self.shingles(text)
+        return tuple(
+            min(((a * shingle + b) % _PRIME) & _MASK for shingle in shingles)
+            for a, b in self.permutations
+        )
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(left, right)) / len(left)
+
+
+@dataclass
+class _Entry:
+    value: List[RequestTypeInfo]
+    expires_at: float
+    signature: Optional[Tuple[int, ...]]
+
+
+class CategoryCache:
+    """
+    LRU cache with a TTL for category suggestions, keyed on the normalized
+    description and the category set version. Misses can fall back to a
+    near-duplicate tier: MinHash signatures bucketed by LSH bands, accepted
+    when the estimated similarity reaches `near_duplicate_threshold`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        near_duplicate_threshold: Optional[float] = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.clock = clock
+        self.hasher = MinHasher(num_perm) if near_duplicate_threshold else None
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._buckets: Dict[Hashable, Set[Tuple[str, str]]] = {}
+        self.stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @classmethod
+    def from_env(cls) -> "CategoryCache":
+        threshold = float(os.getenv("GENAI_CACHE_NEAR_DUPLICATE", "0.8"))
+        return cls(
+            max_entries=int(os.getenv("GENAI_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("GENAI_CACHE_TTL", "3600")),
+            near_duplicate_threshold=threshold or None,
+        )
+
+    def get(self, version: str, description: str) -> Optional[List[RequestTypeInfo]]:
+        key = (version, normalize(description))
+        entry = self._live_entry(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return [rt.copy() for rt in entry.value]
+
+        if self.hasher is not None:
+            entry = self._near_duplicate(version, self.hasher.signature(key[1]))
+            if entry is not None:
+                self.stats["near_hits"] += 1
+                return [rt.copy() for rt in entry.value]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, version: str, description: str, value: List[RequestTypeInfo]) -> None:
+        key = (version, normalize(description))
+        if key in self._entries:
+            self._remove(key)
+
+        signature = self.hasher.signature(key[1]) if self.hasher is not None else None
+        self._entries[key] = _Entry([rt.copy() for rt in value], self.clock() + self.ttl, signature)
+        for band in self._band_keys(version, signature):
+            self._buckets.setdefault(band, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live_entry(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _near_duplicate(self, version: str, signature: Tuple[int, ...]) -> Optional[_Entry]:
+        candidates = set()
+        for band in self._band_keys(version, signature):
+            candidates |= self._buckets.get(band, set())
+
+        best, best_similarity = None, self.near_duplicate_threshold
+        for key in candidates:
+            entry = self._entries[key]
+            similarity = MinHasher.similarity(signature, entry.signature)
+            if best_similarity <= similarity:
+                best, best_similarity = key, similarity
+        return self._live_entry(best) if best is not None else None
+
+    def _band_keys(self, version: str, signature: Optional[Tuple[int, ...]]):
+        if signature is None:
+            return []
+        return [
+            (version, i, signature[i * self._rows:(i + 1) * self._rows])
+            for i in range(self.bands)
+        ]
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        for band in self._band_keys(key[0], entry.signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+
+_category_cache: Optional[CategoryCache] = None
+
+
+def get_category_cache() -> CategoryCache:
+    global _category_cache
+    if _category_cache is None:
+        _category_cache = CategoryCache.from_env()
+    return _category_cache
@@ -0,0 +1,156 @@
+import asyncio
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_WORD = re.compile(r"[a-z]+")
+_STOP_WORDS = frozenset("""
+    a about after all also am an and any are as at be been but by can could do
+    for from get have help i if in into is it its looking me my need needed of
+    on or our please so some someone that the their them then this to up us
+    want we will with would you your
+""".split())
+
+Vector = Dict[str, float]
+
+
+def _stem(word: str) -> str:
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # "shopping" -> "shop", "planned" -> "plan"
+            if suffix in ("ing", "ed") and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            return word
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOP_WORDS]
+
+
+def _normalized(vector: Vector) -> Vector:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {token: weight / norm for token, weight in vector.items()} if norm else {}
+
+
+class CategoryClassifier:
+    """
+    TF-IDF nearest-centroid classifier over request texts. Each category's
+    centroid is built from its labelled requests plus its own name, so a
+    category with no requests yet can still be recognised by name.
+
+    `predict` returns the best category together with any category scoring
+    within `related_ratio` of it, and the best cosine similarity as the
+    confidence.
+    """
+
+    def __init__(self, idf: Dict[str, float], centroids: Dict[int, Vector], related_ratio: float = 0.8):
+        self.idf = idf
+        self.centroids = centroids
+        self.related_ratio = related_ratio
+        self._default_idf = max(idf.values(), default=1.0)
+
+    @classmethod
+    def fit(
+        cls,
+        categories: Dict[int, str],
+        examples: Iterable[Tuple[str, Sequence[int]]],
+        name_weight: float = 2.0,
+        related_ratio: float = 0.8,
+    ) -> "CategoryClassifier":
+        documents = [(Counter(tokenize(text)), labels) for text, labels in examples]
+        names = {category_id: Counter(tokenize(name)) for category_id, name in categories.items()}
+
+        document_frequency = Counter()
+        for tokens, _ in documents:
+            document_frequency.update(tokens.keys())
+        for tokens in names.values():
+            document_frequency.update(tokens.keys())
+        total = len(documents) + len(names)
+        idf = {
+            token: math.log((1 + total) / (1 + frequency)) + 1
+            for token, frequency in document_frequency.items()
+        }
+
+        sums: Dict[int, Vector] = defaultdict(lambda: defaultdict(float))
+        for tokens, labels in documents:
+            vector = _normalized({token: count * idf[token] for token, count in tokens.items()})
+            for label in labels:
+                if label in categories:
+                    for token, weight in vector.items():
+                        sums[label][token] += weight
+        for category_id, tokens in names.items():
+            vector = _normalized({token: count * idf[token] for token, count in tokens.items()})
+            for token, weight in vector.items():
+                sums[category_id][token] += name_weight * weight
+
+        centroids = {category_id: _normalized(sums[category_id]) for category_id in categories}
+        return cls(idf, centroids, related_ratio)
+
+    def scores(self, text: str) -> Dict[int, float]:
+        vector = _normalized({
+            token: count * self.idf.get(token, self._default_idf)
+            for token, count in Counter(tokenize(text)).items()
+        })
+        return {
+            category_id: sum(weight * centroid.get(token, 0.0) for token, weight in vector.items())
+            for category_id, centroid in self.centroids.items()
+        }
+
+    def predict(self, text: str) -> Tuple[List[int], float]:
+        scores = self.scores(text)
+        best = max(scores.values(), default=0.0)
+        if best <= 0:
+            return [], 0.0
+
+        chosen = sorted(
+            (category_id for category_id, score in scores.items() if best * self.related_ratio <= score),
+            key=lambda category_id: -scores[category_id],
+        )
+        return chosen, best
+
+
+_classifier: Optional[Tuple[str, float, CategoryClassifier]] = None
+_training = asyncio.Lock()
+
+
+def get_category_classifier(version: str, max_age: float) -> Optional[CategoryClassifier]:
+    # A classifier trained on another category set, or long ago, is stale.
+    if _classifier is None:
+        return None
+    trained_version, trained_at, classifier = _classifier
+    if trained_version != version or max_age <= time.monotonic() - trained_at:
+        return None
+    return classifier
+
+
+def set_category_classifier(version: str, classifier: CategoryClassifier) -> None:
+    global _classifier
+    _classifier = (version, time.monotonic(), classifier)
+
+
+async def ensure_category_classifier(
+    version: str, max_age: float, train: Callable[[], Awaitable[CategoryClassifier]]
+) -> CategoryClassifier:
+    """
+    The current classifier, trained with `train` by one caller at a time.
+    While it retrains an expired classifier, other callers keep using the
+    expired one; after a category change they wait for the new one.
+    """
+    classifier = get_category_classifier(version, max_age)
+    if classifier is not None:
+        return classifier
+    if _training.locked() and _classifier is not None and _classifier[0] == version:
+        return _classifier[2]
+
+    async with _training:
+        classifier = get_category_classifier(version, max_age)
+        if classifier is None:
+            classifier = await train()
+            set_category_classifier(version, classifier)
+    return classifier
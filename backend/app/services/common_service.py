@@ -1,27 +1,82 @@
-from typing import List
+from typing import List, Optional, Type, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import delete, desc, func, select, tuple_, union, union_all
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-from ..interfaces.exceptions import UserNotFoundError
+from ..conditional import ResourceVersion
+from ..interfaces.exceptions import (
+    AvailabilityNotFoundError,
+    AvailabilityOverlapError,
+    NotAuthorizedError,
+    UserNotFoundError,
+)
 from ..interfaces.auth_service import UserTokenData
 from ..interfaces.common_service import (CommonServiceInterface,
                                          UpdateProfileData, UserInfo)
-from ..interfaces.common_service import RequestTypeInfo
-from ..models import RequestType, User
+from ..interfaces.common_service import (
+    AvailabilityData,
+    AvailabilityInfo,
+    Leaderboard,
+    LeaderboardEntry,
+    LeaderboardFilter,
+    RequestTypeInfo,
+    UserProfile,
+    UserStatsInfo,
+)
+from ..models import (
+    ApplicationHistory,
+    ApplicationStatus,
+    Availability,
+    RequestHistory,
+    RequestType,
+    User,
+    UserStats,
+)
+from .leaderboard import area_bounds, competition_ranks, leaderboard_cache
+from .request_type_catalog import request_type_catalog
+
+U = TypeVar("U", bound=UserInfo)
 
 
 class CommonService(CommonServiceInterface):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_user(self, user_id: int) -> UserInfo:
-        user = await self.session.get(User, user_id)
-        if not user:
+    async def get_user(self, user_id: int) -> UserProfile:
+        # One primary-key read of each; the stats are counted as they change.
+        row = (
+            await self.session.execute(
+                select(User, UserStats)
+                .outerjoin(UserStats, UserStats.user_id == User.id)
+                .where(User.id == user_id)
+            )
+        ).first()
+        if row is None:
             raise UserNotFoundError
 
-        return self.to_user_info(user)
+        user, stats = row
+        return self.to_user_info(user, cls=UserProfile, stats=self.to_user_stats_info(stats))
+
+    async def get_user_version(self, user_id: int) -> ResourceVersion:
+        # Every change to the user row, including the outbox's XP and
+        # avg_rating updates, sets updated_at; the stats have their own.
+        row = (
+            await self.session.execute(
+                select(User.updated_at, UserStats.updated_at)
+                .outerjoin(UserStats, UserStats.user_id == User.id)
+                .where(User.id == user_id)
+            )
+        ).first()
+        if row is None:
+            raise UserNotFoundError
+
+        updated_at, stats_updated_at = row
+        return ResourceVersion.of(
+            user_id, *row, last_modified=max(updated_at, stats_updated_at or updated_at)
+        )
 
     async def update_profile(self, user: UserTokenData, profile_data: UpdateProfileData) -> UserInfo:
         user = await self.session.get(User, user["id"])
@@ -39,8 +94,151 @@ class CommonService(CommonServiceInterface):
         return self.to_user_info(user)
 
     async def list_request_types(self) -> List[RequestTypeInfo]:
-        request_types = await self.session.scalars(select(RequestType))
-        return [self.to_request_type_info(rt) for rt in request_types]
+        await request_type_catalog.ensure_loaded(self.session)
+        return request_type_catalog.all()
+
+    async def list_availability(self, user: UserTokenData) -> List[AvailabilityInfo]:
+        self.authorize_volunteer(user)
+        windows = (
+            await self.session.execute(
+                select(Availability)
+                .where(Availability.user_id == user["id"])
+                .order_by(Availability.during)
+            )
+        ).scalars().all()
+        return [self.to_availability_info(window) for window in windows]
+
+    async def add_availability(
+        self, user: UserTokenData, availability_data: AvailabilityData
+    ) -> AvailabilityInfo:
+        self.authorize_volunteer(user)
+        async with self.session.begin():
+            window = Availability(
+                user_id=user["id"],
+                during=Range(availability_data.start, availability_data.end),
+            )
+            self.session.add(window)
+            try:
+                await self.session.flush()
+            except IntegrityError:
+                # excl_availability_user_during
+                raise AvailabilityOverlapError
+        return self.to_availability_info(window)
+
+    async def delete_availability(self, user: UserTokenData, availability_id: int) -> None:
+        self.authorize_volunteer(user)
+        async with self.session.begin():
+            result = await self.session.execute(
+                delete(Availability)
+                .where(Availability.id == availability_id)
+                .where(Availability.user_id == user["id"])
+            )
+            if result.rowcount == 0:  # pyright: ignore[reportAttributeAccessIssue]
+                raise AvailabilityNotFoundError
+
+    async def get_leaderboard(
+        self, user: UserTokenData, filters: LeaderboardFilter
+    ) -> Leaderboard:
+        me = (
+            await self.session.execute(
+                select(User.id, User.first_name, User.last_name, User.level, User.experience)
+                .where(User.id == user["id"])
+            )
+        ).first()
+        if me is None:
+            raise UserNotFoundError
+
+        if filters.scope == "global":
+            await leaderboard_cache.ensure_loaded(self.session)
+            top = leaderboard_cache.top(filters.limit)
+            names = {
+                id: (first_name, last_name)
+                for id, first_name, last_name in await self.session.execute(
+                    select(User.id, User.first_name, User.last_name)
+                    .where(User.id.in_([user_id for _, user_id, _, _ in top]))
+                )
+            }
+            return Leaderboard(
+                entries=[
+                    LeaderboardEntry(rank, user_id, *names[user_id], level, experience)
+                    for rank, user_id, level, experience in top
+                    if user_id in names
+                ],
+                me=LeaderboardEntry(leaderboard_cache.rank(me.level, me.experience), *me),
+            )
+
+        members = await self._area_members(user["id"])
+        if members is None:
+            return Leaderboard(entries=[], me=None)
+        rows = (
+            await self.session.execute(
+                select(User.id, User.first_name, User.last_name, User.level, User.experience)
+                .where(User.id.in_(members))
+                .order_by(User.level.desc(), User.experience.desc(), User.id.desc())
+                .limit(filters.limit)
+            )
+        ).all()
+        above = (
+            await self.session.execute(
+                select(func.count())
+                .select_from(User)
+                .where(User.id.in_(members))
+                .where(tuple_(User.level, User.experience) > tuple_(me.level, me.experience))
+            )
+        ).scalar_one()
+        ranks = competition_ranks((row.level, row.experience) for row in rows)
+        return Leaderboard(
+            entries=[LeaderboardEntry(rank, *row) for rank, row in zip(ranks, rows)],
+            me=LeaderboardEntry(above + 1, *me),
+        )
+
+    async def _area_members(self, user_id: int):
+        # Users with requests in the area of the caller's latest request,
+        # live or archived: created ones, and ones they were accepted for.
+        # None when the caller has none to place them.
+        accepted = (
+            select(RequestHistory)
+            .join(ApplicationHistory, ApplicationHistory.request_id == RequestHistory.id)
+            .where(ApplicationHistory.status == ApplicationStatus.ACCEPTED)
+        )
+        latest = (
+            await self.session.execute(
+                union_all(
+                    select(RequestHistory.latitude, RequestHistory.longitude, RequestHistory.created_at)
+                    .where(RequestHistory.creator_id == user_id),
+                    accepted.with_only_columns(
+                        RequestHistory.latitude, RequestHistory.longitude, ApplicationHistory.applied_at
+                    ).where(ApplicationHistory.user_id == user_id),
+                )
+                .order_by(desc("created_at"))
+                .limit(1)
+            )
+        ).first()
+        if latest is None:
+            return None
+
+        min_lat, min_lng, max_lat, max_lng = area_bounds(float(latest[0]), float(latest[1]))
+        in_area = (
+            RequestHistory.latitude.between(min_lat, max_lat)
+            & RequestHistory.longitude.between(min_lng, max_lng)
+        )
+        return union(
+            select(RequestHistory.creator_id).where(in_area),
+            accepted.with_only_columns(ApplicationHistory.user_id).where(in_area),
+        )
+
+    @staticmethod
+    def authorize_volunteer(user: UserTokenData) -> None:
+        # Availability is a volunteer setting; CommonService has no
+        # AuthService to ask.
+        if not user["is_volunteer"]:
+            raise NotAuthorizedError
+
+    @staticmethod
+    def to_availability_info(window: Availability) -> AvailabilityInfo:
+        return AvailabilityInfo(
+            id=window.id, start=window.during.lower, end=window.during.upper
+        )
 
     @staticmethod
     def to_request_type_info(request_type: RequestType) -> RequestTypeInfo:
@@ -50,8 +248,24 @@ class CommonService(CommonServiceInterface):
         )
 
     @staticmethod
-    def to_user_info(user: User) -> UserInfo:
-        return UserInfo(
+    def to_user_stats_info(stats: Optional[UserStats]) -> UserStatsInfo:
+        if stats is None:
+            return UserStatsInfo(0, 0, 0, 0, 0, acceptance_rate=None)
+        return UserStatsInfo(
+            requests_posted=stats.requests_posted,
+            requests_completed=stats.requests_completed,
+            applications_made=stats.applications_made,
+            applications_accepted=stats.applications_accepted,
+            ratings_received=stats.ratings_received,
+            acceptance_rate=(
+                stats.applications_accepted / stats.applications_made
+                if stats.applications_made > 0 else None
+            ),
+        )
+
+    @staticmethod
+    def to_user_info(user: User, cls: Type[U] = UserInfo, **extra) -> U:
+        return cls(
             id=user.id,
             first_name=user.first_name,
             last_name=user.last_name,
@@ -62,5 +276,6 @@ class CommonService(CommonServiceInterface):
             avg_rating=user.avg_rating,
             level=user.level,
             experience=user.experience,
-            experience_to_next_level=100 * user.level
+            experience_to_next_level=100 * user.level,
+            **extra,
         )
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from ..interfaces.request_service import MapPoint, RequestEventsFilter
+from ..models import Request
+from ..models.request import RequestStatus
+from .map_grid import distance_meters
+from .request_service import RequestService
+from .request_type_catalog import request_type_catalog
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel notified by the application table's trigger.
+APPLICATION_CHANNEL = "application_changed"
+
+_APPLICATION_EVENTS = {"INSERT": "application_created", "DELETE": "application_withdrawn"}
+
+
+@dataclass(slots=True)
+class Event:
+    name: str
+    data: bytes
+
+    def encode(self) -> bytes:
+        return b"event: " + self.name.encode() + b"\ndata: " + self.data + b"\n\n"
+
+
+# Sent when events may have been lost; clients should refetch what they show.
+RESYNC = Event("resync", b"{}")
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    queue: "asyncio.Queue[Event]"
+    # Latitude, longitude and radius in meters of a volunteer's area.
+    area: Optional[Tuple[float, float, float]] = None
+    request_type_ids: FrozenSet[int] = frozenset()
+
+    def in_area(self, latitude: float, longitude: float) -> bool:
+        if self.area is None:
+            return True
+        lat, lng, radius = self.area
+        return distance_meters(lat, lng, latitude, longitude) <= radius
+
+    def wants(self, point: MapPoint) -> bool:
+        return self.in_area(point.latitude, point.longitude) and (
+            not self.request_type_ids
+            or any(rt["id"] in self.request_type_ids for rt in point.request_types)
+        )
+
+
+class EventHub:
+    """
+    In-process fan-out of server-sent events to the streams open in this
+    worker: application changes to the help-seeker owning the request, new
+    requests to the volunteers whose area and request types they match.
+    Every event is encoded once, whatever the number of subscribers. A
+    subscriber too slow to keep `queue_size` events buffered gets a single
+    `resync` event in place of its backlog.
+    """
+
+    def __init__(self, queue_size: int = 100, keepalive: float = 15):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._help_seekers: Dict[int, Set[Subscription]] = {}
+        self._volunteers: Set[Subscription] = set()
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0}
+
+    @classmethod
+    def from_env(cls) -> "EventHub":
+        return cls(
+            queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "100")),
+            keepalive=float(os.getenv("EVENT_KEEPALIVE", "15")),
+        )
+
+    @property
+    def has_volunteers(self) -> bool:
+        return bool(self._volunteers)
+
+    def subscribe_help_seeker(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, asyncio.Queue(self.queue_size))
+        self._help_seekers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def subscribe_volunteer(self, user_id: int, filters: RequestEventsFilter) -> Subscription:
+        area = None
+        if filters.location_lat is not None and filters.location_lng is not None:
+            area = (filters.location_lat, filters.location_lng, filters.radius * 1000)
+        subscription = Subscription(
+            user_id, asyncio.Queue(self.queue_size), area, frozenset(filters.request_type_ids)
+        )
+        self._volunteers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._volunteers.discard(subscription)
+        subscriptions = self._help_seekers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._help_seekers[subscription.user_id]
+
+    def wants_location(self, latitude: float, longitude: float) -> bool:
+        # Whether a new request there could reach any volunteer.
+        return any(s.in_area(latitude, longitude) for s in self._volunteers)
+
+    def publish_application(
+        self, op: str, creator_id: int, request_id: int, volunteer_id: int, status: str
+    ) -> None:
+        subscriptions = self._help_seekers.get(creator_id)
+        if not subscriptions:
+            return
+        name = _APPLICATION_EVENTS.get(op) or f"application_{status.lower()}"
+        data = to_json({"request_id": request_id, "volunteer_id": volunteer_id, "status": status})
+        self._publish(Event(name, data), subscriptions)
+
+    def publish_request(self, point: MapPoint) -> None:
+        subscriptions = [s for s in self._volunteers if s.wants(point)]
+        if subscriptions:
+            self._publish(Event("new_request", to_json(point)), subscriptions)
+
+    def resync(self, payload: Optional[str] = None) -> None:
+        self._publish(RESYNC, self._all())
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        # Body of a text/event-stream response; unsubscribes when it ends,
+        # e.g. because the client went away.
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            self.unsubscribe(subscription)
+
+    def _all(self) -> Iterable[Subscription]:
+        yield from self._volunteers
+        for subscriptions in self._help_seekers.values():
+            yield from subscriptions
+
+    def _publish(self, event: Event, subscriptions: Iterable[Subscription]) -> None:
+        self.stats["published"] += 1
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(event)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                self.stats["dropped"] += subscription.queue.qsize() + 1
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(RESYNC)
+
+
+class NotificationEvents:
+    """
+    Feeds an EventHub from the application_changed and request_changed
+    notifications of the worker's single listener connection (SQL backend).
+    A new request is loaded once per worker, and only if it is in some
+    subscribed volunteer's area.
+    """
+
+    def __init__(self, hub: EventHub, session_factory: Callable[[], AsyncSession]):
+        self.hub = hub
+        self.session_factory = session_factory
+        self._tasks: Set[asyncio.Task] = set()
+
+    def on_application_changed(self, payload: Optional[str]) -> None:
+        # Called with None on (re)connect, for both channels; one resync
+        # covers them.
+        if payload is None:
+            self.hub.resync()
+            return
+        change = json.loads(payload)
+        self.hub.publish_application(
+            change["op"], change["creator_id"], change["request_id"],
+            change["volunteer_id"], change["status"],
+        )
+
+    def on_request_changed(self, payload: Optional[str]) -> None:
+        if payload is None or not self.hub.has_volunteers:
+            return
+        change = json.loads(payload)
+        if change["op"] != "INSERT":
+            return
+        latitude, longitude = change["locations"][-1]
+        if not self.hub.wants_location(float(latitude), float(longitude)):
+            return
+        task = asyncio.create_task(self._publish_request(change["id"]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _publish_request(self, request_id: int) -> None:
+        try:
+            async with self.session_factory() as session:
+                await request_type_catalog.ensure_loaded(session)
+                request = (
+                    await session.execute(
+                        select(Request)
+                        .options(load_only(
+                            Request.id, Request.name, Request.reward, Request.status,
+                            Request.latitude, Request.longitude, Request.request_type_ids,
+                        ))
+                        .filter(Request.id == request_id)
+                    )
+                ).scalar_one_or_none()
+        except Exception:
+            logger.exception("Loading request %s for subscribers failed", request_id)
+            return
+        if request is not None and request.status == RequestStatus.OPEN:
+            self.hub.publish_request(RequestService.to_map_point(request))
+
+
+event_hub = EventHub.from_env()
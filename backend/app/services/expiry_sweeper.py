@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import os
+from typing import Callable
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Request, RequestStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ExpirySweeper:
+    """
+    Marks open requests whose `end` has passed as EXPIRED. Rows are claimed
+    `batch_size` at a time with FOR UPDATE SKIP LOCKED, so a request being
+    edited is left for the next sweep instead of waiting on (or blocking)
+    its writer, and batches are `pause` seconds apart, which caps the sweep
+    at batch_size / pause rows per second however large the backlog.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 100,
+        pause: float = 0.5,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+
+    @classmethod
+    def from_env(cls, session_factory: Callable[[], AsyncSession]) -> "ExpirySweeper":
+        return cls(
+            session_factory,
+            batch_size=int(os.getenv("EXPIRY_BATCH_SIZE", "100")),
+            pause=float(os.getenv("EXPIRY_PAUSE", "0.5")),
+        )
+
+    async def sweep_once(self) -> int:
+        """Expires one batch, returning the number of requests expired."""
+        expired = (
+            select(Request.id)
+            .where(Request.status == RequestStatus.OPEN)
+            .where(Request.end <= func.now())
+            .order_by(Request.end)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session, session.begin():
+            result = await session.execute(
+                update(Request)
+                .where(Request.id.in_(expired))
+                .values(status=RequestStatus.EXPIRED)
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def sweep(self) -> int:
+        """Expires every due request, batch by batch."""
+        total = 0
+        while True:
+            count = await self.sweep_once()
+            total += count
+            if count < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        if total:
+            logger.info("Expired %d requests", total)
+        return total
@@ -0,0 +1,15 @@
+from .ai_service import InMemoryAIService
+from .application_service import InMemoryApplicationService
+from .auth_service import InMemoryAuthService
+from .common_service import InMemoryCommonService
+from .request_service import InMemoryRequestService
+from .store import InMemoryStore
+
+__all__ = [
+    "InMemoryAIService",
+    "InMemoryApplicationService",
+    "InMemoryAuthService",
+    "InMemoryCommonService",
+    "InMemoryRequestService",
+    "InMemoryStore",
+]
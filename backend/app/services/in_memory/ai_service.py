@@ -0,0 +1,36 @@
+import re
+from typing import List
+
+from ...interfaces import AuthServiceInterface
+from ...interfaces.auth_service import UserRoles, UserTokenData
+from ...interfaces.ai_service import (
+    AIServiceInterface,
+    CategoryGenerationRequest,
+    RequestTypeInfo,
+)
+from ..common_service import CommonService
+from .store import InMemoryStore
+
+_WORD = re.compile(r"[a-z]+")
+
+
+class InMemoryAIService(AIServiceInterface):
+    # Deterministic stand-in for the LLM: a category matches when one of the
+    # words in its name (or that word without a trailing "ing") appears in the
+    # description, e.g. "walk my dog" -> "Dog Walking".
+    def __init__(self, store: InMemoryStore, auth_service: AuthServiceInterface):
+        self.store = store
+        self.auth_service = auth_service
+
+    async def generate_categories(self, user: UserTokenData, request: CategoryGenerationRequest) -> List[RequestTypeInfo]:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+
+        words = set(_WORD.findall(request.description.lower()))
+        return [
+            CommonService.to_request_type_info(rt)
+            for rt in self.store.request_types.values()
+            if any(
+                word in words or word.removesuffix("ing") in words
+                for word in _WORD.findall(rt.name.lower())
+            )
+        ]
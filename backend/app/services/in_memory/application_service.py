@@ -0,0 +1,168 @@
+from ...models import Application, RequestStatus, ApplicationStatus
+from ...interfaces import AuthServiceInterface, ApplicationServiceInterface
+from ...interfaces.auth_service import UserRoles, UserTokenData
+from ...interfaces.application_service import (
+    ApplicationInfo,
+    RateSeekerData,
+    RateVolunteerData,
+)
+from ...interfaces.exceptions import (
+    ApplicationCannotBeRated,
+    CanNotAcceptApplication,
+    CanNotDeleteApplicationError,
+    NoApplicationFoundError,
+    RequestNotOpen,
+    NoRequestFoundError,
+    ApplicationAlreadyExists,
+)
+from ..event_hub import event_hub
+from .store import InMemoryStore, is_open, utcnow
+
+
+class InMemoryApplicationService(ApplicationServiceInterface):
+    def __init__(self, store: InMemoryStore, auth_service: AuthServiceInterface):
+        self.store = store
+        self.auth_service = auth_service
+
+    async def create_application(self, user: UserTokenData, request_id: int) -> ApplicationInfo:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+
+        request = self.store.get_request(request_id)
+        if request is None:
+            raise NoRequestFoundError
+
+        if not is_open(request, utcnow()):
+            raise RequestNotOpen
+
+        if self.store.get_application(request_id, user["id"]) is not None:
+            raise ApplicationAlreadyExists
+
+        application = Application(
+            id=self.store.next_id("application"),
+            request_id=request_id,
+            user_id=user["id"],
+            status=ApplicationStatus.PENDING,
+            applied_at=utcnow(),
+        )
+        application.volunteer = self.store.users[user["id"]]
+        self.store.applications[(request_id, user["id"])] = application
+        request.applications.append(application)
+        request.application_count += 1
+        request.updated_at = utcnow()
+        self.store.count_user_stats(user["id"], applications_made=1)
+        event_hub.publish_application(
+            "INSERT", request.creator_id, request_id, user["id"], application.status.value
+        )
+
+        return ApplicationInfo(
+            id=application.id,
+            request_id=application.request_id,
+            user_id=application.user_id,
+            status=application.status.value,
+            applied_at=application.applied_at
+        )
+
+    async def delete_application(self, user: UserTokenData, request_id: int) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+
+        request = self.store.get_request(request_id)
+        if request is None:
+            raise NoRequestFoundError
+
+        if not is_open(request, utcnow()):
+            raise CanNotDeleteApplicationError
+
+        application = self.store.applications.pop((request_id, user["id"]), None)
+        if application is None:
+            raise NoApplicationFoundError
+        request.applications.remove(application)
+        request.application_count -= 1
+        request.updated_at = utcnow()
+        self.store.count_user_stats(user["id"], applications_made=-1)
+        event_hub.publish_application(
+            "DELETE", request.creator_id, request_id, user["id"], application.status.value
+        )
+
+    async def accept_application(self, user: UserTokenData, request_id: int, volunteer_id: int) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+
+        request = self.store.get_request(request_id)
+        if (
+            request is None
+            or request.creator_id != user["id"]
+            or self.store.get_application(request_id, volunteer_id) is None
+        ):
+            raise NoRequestFoundError
+
+        if not is_open(request, utcnow()):
+            raise CanNotAcceptApplication
+
+        for application in request.applications:
+            application.status = (
+                ApplicationStatus.ACCEPTED
+                if application.user_id == volunteer_id
+                else ApplicationStatus.DECLINED
+            )
+        request.status = RequestStatus.CLOSED
+        request.updated_at = utcnow()
+        self.store.count_user_stats(volunteer_id, applications_accepted=1)
+        event_hub.publish_application(
+            "UPDATE", user["id"], request_id, volunteer_id, ApplicationStatus.ACCEPTED.value
+        )
+
+    async def rate_volunteer(self, user: UserTokenData, request_id: int, rating_data: RateVolunteerData) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+
+        request = self.store.get_request(request_id)
+        application = self._accepted_application(request_id)
+        if (
+            application is None
+            or request.creator_id != user["id"]
+            or request.status != RequestStatus.COMPLETED
+        ):
+            raise ApplicationCannotBeRated
+
+        if application.volunteer_rating is None:
+            self.store.count_user_stats(application.user_id, ratings_received=1)
+        application.volunteer_rating = rating_data.rating
+        self.store.update_volunteer_avg_rating(application.user_id)
+
+        xp = self._xp_for_rating(rating_data.rating)
+        volunteer = self.store.users.get(application.user_id)
+        if volunteer is not None:
+            volunteer.add_experience(xp)
+
+    async def rate_seeker(self, user: UserTokenData, request_id: int, rating_data: RateSeekerData) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+
+        request = self.store.get_request(request_id)
+        application = self._accepted_application(request_id)
+        if (
+            application is None
+            or application.user_id != user["id"]
+            or request.status != RequestStatus.COMPLETED
+        ):
+            raise ApplicationCannotBeRated
+
+        if application.help_seeker_rating is None:
+            self.store.count_user_stats(request.creator_id, ratings_received=1)
+        application.help_seeker_rating = rating_data.rating
+        self.store.update_help_seeker_avg_rating(request.creator_id)
+
+        xp = self._xp_for_rating(rating_data.rating)
+        seeker = self.store.users.get(request.creator_id)
+        if seeker is not None:
+            seeker.add_experience(xp)
+
+    def _accepted_application(self, request_id: int) -> Application | None:
+        return next(
+            (
+                application
+                for application in self.store.applications_for_request(request_id)
+                if application.status == ApplicationStatus.ACCEPTED
+            ),
+            None,
+        )
+
+    def _xp_for_rating(self, rating: int) -> int:
+        return rating * 10
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from ...interfaces.exceptions import (
+    InvalidEmailOrPasswordError,
+    InvalidTokenError,
+    UserAlreadyExistsError,
+)
+from ...interfaces.auth_service import (
+    AuthResult,
+    AuthTokens,
+    LoginData,
+    RegistrationData,
+    ACCESS_TOKEN_EXPIRY,
+    REFRESH_TOKEN_EXPIRY,
+)
+from ...models import User
+from ..auth_service import AuthService, password_hash
+from ..common_service import CommonService
+from .store import InMemoryStore, utcnow
+
+
+class InMemoryAuthService(AuthService):
+    # Token encoding and role checks are shared with AuthService; only the
+    # persistence of users and refresh tokens is replaced.
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def login(self, login_data: LoginData) -> AuthResult:
+        user = self.store.users_by_email.get(login_data.email)
+        if not user or not password_hash().verify(login_data.password, user.password):
+            raise InvalidEmailOrPasswordError
+
+        return self._issue_tokens(user)
+
+    async def register(self, body: RegistrationData) -> AuthResult:
+        if body.email in self.store.users_by_email:
+            raise UserAlreadyExistsError
+
+        now = utcnow()
+        user = User(
+            id=self.store.next_id("user"),
+            first_name=body.first_name,
+            last_name=body.last_name,
+            email=body.email,
+            password=password_hash().hash(body.password),
+            date_of_birth=body.date_of_birth,
+            about_me=body.about_me,
+            is_volunteer=body.is_volunteer,
+            avg_rating=0.0,
+            level=1,
+            experience=0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.store.users[user.id] = user
+        self.store.users_by_email[user.email] = user
+
+        return self._issue_tokens(user)
+
+    async def refresh(
+        self, refresh_token: str, access_expires: timedelta = ACCESS_TOKEN_EXPIRY
+    ) -> AuthTokens:
+        user_data = self.authenticate(refresh_token)
+        key = (user_data["id"], refresh_token)
+        if key not in self.store.refresh_tokens:
+            raise InvalidTokenError
+
+        new_refresh = self._recreate_token(refresh_token, REFRESH_TOKEN_EXPIRY)
+        self.store.refresh_tokens.discard(key)
+        self.store.refresh_tokens.add((user_data["id"], new_refresh))
+
+        new_access = self._recreate_token(refresh_token, ACCESS_TOKEN_EXPIRY)
+        return AuthTokens(access_token=new_access, refresh_token=new_refresh)
+
+    async def logout(self, user_id: int, refresh_token: str) -> None:
+        self.store.refresh_tokens.discard((user_id, refresh_token))
+
+    def _issue_tokens(self, user: User) -> AuthResult:
+        refresh_token = self._create_token(user, REFRESH_TOKEN_EXPIRY)
+        self.store.refresh_tokens.add((user.id, refresh_token))
+
+        access_token = self._create_token(user, ACCESS_TOKEN_EXPIRY)
+        return AuthResult(
+            user=CommonService.to_user_info(user),
+            tokens=AuthTokens(access_token=access_token, refresh_token=refresh_token),
+        )
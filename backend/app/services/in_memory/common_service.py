@@ -0,0 +1,157 @@
+from typing import List
+
+from sqlalchemy.dialects.postgresql import Range
+
+from ...conditional import ResourceVersion
+from ...interfaces.exceptions import (
+    AvailabilityNotFoundError,
+    AvailabilityOverlapError,
+    UserNotFoundError,
+)
+from ...interfaces.auth_service import UserTokenData
+from ...interfaces.common_service import (CommonServiceInterface,
+                                          UpdateProfileData, UserInfo)
+from ...interfaces.common_service import (
+    AvailabilityData,
+    AvailabilityInfo,
+    Leaderboard,
+    LeaderboardEntry,
+    LeaderboardFilter,
+    RequestTypeInfo,
+    UserProfile,
+)
+from ...models import ApplicationStatus, Availability
+from ..common_service import CommonService
+from ..leaderboard import area_bounds, competition_ranks
+from .store import InMemoryStore, utcnow
+
+
+class InMemoryCommonService(CommonServiceInterface):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def get_user(self, user_id: int) -> UserProfile:
+        user = self.store.users.get(user_id)
+        if not user:
+            raise UserNotFoundError
+
+        stats = CommonService.to_user_stats_info(self.store.user_stats.get(user_id))
+        return CommonService.to_user_info(user, cls=UserProfile, stats=stats)
+
+    async def get_user_version(self, user_id: int) -> ResourceVersion:
+        user = self.store.users.get(user_id)
+        if not user:
+            raise UserNotFoundError
+
+        stats = self.store.user_stats.get(user_id)
+        return ResourceVersion.of(
+            await self.get_user(user_id),
+            last_modified=max(user.updated_at, stats.updated_at) if stats else user.updated_at,
+        )
+
+    async def update_profile(self, user: UserTokenData, profile_data: UpdateProfileData) -> UserInfo:
+        user = self.store.users.get(user["id"])
+        if not user:
+            raise UserNotFoundError
+
+        user.first_name = profile_data.first_name
+        user.last_name = profile_data.last_name
+        user.about_me = profile_data.about_me
+        user.date_of_birth = profile_data.date_of_birth
+        user.updated_at = utcnow()
+
+        return CommonService.to_user_info(user)
+
+    async def list_request_types(self) -> List[RequestTypeInfo]:
+        return [
+            CommonService.to_request_type_info(rt)
+            for rt in self.store.request_types.values()
+        ]
+
+    async def list_availability(self, user: UserTokenData) -> List[AvailabilityInfo]:
+        CommonService.authorize_volunteer(user)
+        return [
+            CommonService.to_availability_info(window)
+            for window in self.store.availability_of(user["id"])
+        ]
+
+    async def add_availability(
+        self, user: UserTokenData, availability_data: AvailabilityData
+    ) -> AvailabilityInfo:
+        CommonService.authorize_volunteer(user)
+        during = Range(availability_data.start, availability_data.end)
+        # Mirrors excl_availability_user_during.
+        if any(window.during.overlaps(during) for window in self.store.availability_of(user["id"])):
+            raise AvailabilityOverlapError
+
+        window = Availability(id=self.store.next_id("availability"), user_id=user["id"], during=during)
+        self.store.availability[window.id] = window
+        return CommonService.to_availability_info(window)
+
+    async def delete_availability(self, user: UserTokenData, availability_id: int) -> None:
+        CommonService.authorize_volunteer(user)
+        window = self.store.availability.get(availability_id)
+        if window is None or window.user_id != user["id"]:
+            raise AvailabilityNotFoundError
+        del self.store.availability[availability_id]
+
+    async def get_leaderboard(
+        self, user: UserTokenData, filters: LeaderboardFilter
+    ) -> Leaderboard:
+        me = self.store.users.get(user["id"])
+        if me is None:
+            raise UserNotFoundError
+
+        if filters.scope == "global":
+            members = list(self.store.users.values())
+        else:
+            # Requests are never archived here, so the live ones are the history.
+            placed = [
+                (request.created_at, request) for request in self.store.requests.values()
+                if request.creator_id == me.id
+            ] + [
+                (application.applied_at, self.store.requests[application.request_id])
+                for application in self.store.applications.values()
+                if application.user_id == me.id and application.status == ApplicationStatus.ACCEPTED
+            ]
+            if not placed:
+                return Leaderboard(entries=[], me=None)
+            _, latest = max(placed, key=lambda item: item[0])
+            min_lat, min_lng, max_lat, max_lng = area_bounds(
+                float(latest.latitude), float(latest.longitude)
+            )
+            member_ids = set()
+            for request in self.store.requests.values():
+                if (
+                    min_lat <= float(request.latitude) <= max_lat
+                    and min_lng <= float(request.longitude) <= max_lng
+                ):
+                    member_ids.add(request.creator_id)
+                    member_ids.update(
+                        application.user_id for application in request.applications
+                        if application.status == ApplicationStatus.ACCEPTED
+                    )
+            members = [self.store.users[user_id] for user_id in member_ids]
+
+        members.sort(key=lambda member: (member.level, member.experience, member.id), reverse=True)
+        top = members[:filters.limit]
+        ranks = competition_ranks((member.level, member.experience) for member in top)
+        above = sum(
+            1 for member in members
+            if (me.level, me.experience) < (member.level, member.experience)
+        )
+        return Leaderboard(
+            entries=[self._leaderboard_entry(rank, member) for rank, member in zip(ranks, top)],
+            me=self._leaderboard_entry(above + 1, me),
+        )
+
+    @staticmethod
+    def _leaderboard_entry(rank: int, user) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            rank=rank,
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            level=user.level,
+            experience=user.experience,
+        )
@@ -0,0 +1,81 @@
+"""
+Minimal Mapbox Vector Tile (v2) encoder for point layers, standing in for
+PostGIS's ST_AsMVT in the in-memory backend.
+"""
+import struct
+from typing import Dict, Iterable, List, Tuple, Union
+
+Value = Union[str, int, float, bool]
+
+_MOVE_TO_ONE = 1 | (1 << 3)
+_POINT = 1
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    # Length-delimited field (wire type 2).
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _value(value: Value) -> bytes:
+    if isinstance(value, bool):
+        return _uint_field(7, int(value))
+    if isinstance(value, int):
+        return _uint_field(6, _zigzag(value)) if value < 0 else _uint_field(5, value)
+    if isinstance(value, float):
+        return _varint(3 << 3 | 1) + struct.pack("<d", value)
+    return _field(1, str(value).encode())
+
+
+def encode_points(
+    layer: str, points: Iterable[Tuple[int, int, Dict[str, Value]]], extent: int = 4096
+) -> bytes:
+    """
+    One layer of points given in tile pixel coordinates (y pointing down).
+    None attributes are left out, as ST_AsMVT does. An empty layer encodes
+    to b"", like ST_AsMVT over no rows.
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, Value], int] = {}
+    features: List[bytes] = []
+    for x, y, attributes in points:
+        tags = []
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+        geometry = [_MOVE_TO_ONE, _zigzag(x), _zigzag(y)]
+        features.append(
+            _field(2, b"".join(map(_varint, tags)))
+            + _uint_field(3, _POINT)
+            + _field(4, b"".join(map(_varint, geometry)))
+        )
+    if not features:
+        return b""
+
+    body = _uint_field(15, 2) + _field(1, layer.encode())
+    body += b"".join(_field(2, feature) for feature in features)
+    body += b"".join(_field(3, key.encode()) for key in keys)
+    body += b"".join(_field(4, _value(value)) for _, value in values)
+    body += _uint_field(5, extent)
+    return _field(3, body)
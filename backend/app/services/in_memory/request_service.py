@@ -0,0 +1,529 @@
+from collections import Counter
+from decimal import Decimal
+from operator import attrgetter
+from typing import List, Optional, Type
+
+from sqlalchemy.dialects.postgresql import Range
+
+from ...conditional import ResourceVersion
+from ...interfaces.request_service import (
+    DESCRIPTION_PREVIEW_LENGTH,
+    DETAIL_APPLICATIONS,
+    ApplicationCounts,
+    ApplicationInfo,
+    ApplicationsFilter,
+    CreateOrUpdateRequestData,
+    MapCluster,
+    MapView,
+    MapViewport,
+    MyApplicationsFilter,
+    MyRequestsFilter,
+    Pagination,
+    RecommendationsFilter,
+    RecommendedRequest,
+    RequestDetailForHelpSeeker,
+    RequestDetailForVolunteer,
+    RequestInfo,
+    RequestServiceInterface,
+    RequestTypeCount,
+    RequestWithApplication,
+    RequestWithApplicationStatus,
+    RequestsFilter,
+    SparseFieldsParams,
+    TileFilter,
+    UserInfo,
+)
+from ...interfaces.auth_service import AuthServiceInterface, UserRoles, UserTokenData
+from ...interfaces.exceptions import (
+    RequestCannotBeUpdatedError,
+    RequestNotFoundError,
+    TileNotFoundError,
+)
+from ...models import ApplicationStatus, Request, RequestType
+from ...models.request import RequestStatus
+from .. import map_grid, recommendations
+from ..common_service import CommonService
+from ..event_hub import event_hub
+from ..request_service import R, RequestService
+from . import mvt
+from .store import InMemoryStore, is_open, utcnow
+
+
+class InMemoryRequestService(RequestServiceInterface):
+    def __init__(self, store: InMemoryStore, auth_service: AuthServiceInterface):
+        self.auth_service = auth_service
+        self.store = store
+
+    async def create_request(
+        self, user: UserTokenData, request_data: CreateOrUpdateRequestData
+    ) -> RequestInfo:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        now = utcnow()
+        request = Request(
+            id=self.store.next_id("request"),
+            name=request_data.name,
+            description=request_data.description,
+            address=request_data.address,
+            longitude=Decimal(str(request_data.longitude)),
+            latitude=Decimal(str(request_data.latitude)),
+            start=request_data.start,
+            end=request_data.end,
+            reward=int(request_data.reward),
+            application_count=0,
+            status=RequestStatus.OPEN,
+            creator_id=user["id"],
+            created_at=now,
+            updated_at=now,
+        )
+        request.request_types.extend(self._request_types(request_data.request_type_ids))
+        self.store.requests[request.id] = request
+        self.store.count_user_stats(user["id"], requests_posted=1)
+        if event_hub.has_volunteers:
+            event_hub.publish_request(RequestService.to_map_point(
+                request, [CommonService.to_request_type_info(rt) for rt in request.request_types]
+            ))
+
+        return self.to_request_info(request)
+
+    async def update_request(
+        self, user: UserTokenData, request_id: int, request_data: CreateOrUpdateRequestData
+    ) -> RequestInfo:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        request = self.store.get_request(request_id)
+        if request is None or request.creator_id != user["id"] or request.application_count > 0:
+            raise RequestCannotBeUpdatedError
+
+        if 0 < len(request_data.request_type_ids):
+            request.request_types.clear()
+            request.request_types.extend(self._request_types(request_data.request_type_ids))
+
+        request.name = request_data.name
+        request.description = request_data.description
+        request.start = request_data.start
+        request.end = request_data.end
+        request.reward = int(request_data.reward)
+        request.address = request_data.address
+        request.latitude = Decimal(str(request_data.latitude))
+        request.longitude = Decimal(str(request_data.longitude))
+        request.updated_at = utcnow()
+
+        return self.to_request_info(request)
+
+    async def delete_request(self, user: UserTokenData, request_id: int) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        request = self.store.get_request(request_id)
+        if request is None or request.creator_id != user["id"] or request.applications:
+            raise RequestCannotBeUpdatedError
+
+        request.request_types.clear()
+        del self.store.requests[request_id]
+        self.store.count_user_stats(user["id"], requests_posted=-1)
+
+    async def complete_request(self, user: UserTokenData, request_id: int) -> None:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        request = self.store.get_request(request_id)
+        if request is None or request.creator_id != user["id"]:
+            raise RequestNotFoundError
+
+        if request.status != RequestStatus.CLOSED:
+            raise RequestCannotBeUpdatedError
+
+        request.status = RequestStatus.COMPLETED
+        request.updated_at = utcnow()
+
+        # The SQL backend stores experience in an Integer column.
+        experience_gain = int(request.calculate_experience())
+        caretaker = self.store.users.get(user["id"])
+        if caretaker is not None:
+            caretaker.add_experience(experience_gain)
+        self.store.count_user_stats(user["id"], requests_completed=1)
+
+        for application in request.applications:
+            if application.status == ApplicationStatus.ACCEPTED:
+                volunteer = self.store.users.get(application.user_id)
+                if volunteer is not None:
+                    volunteer.add_experience(experience_gain)
+                self.store.count_user_stats(application.user_id, requests_completed=1)
+
+    async def get_my_requests(
+        self, user: UserTokenData, filters: MyRequestsFilter
+    ) -> Pagination[RequestInfo]:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        requests = [
+            request for request in self.store.requests.values()
+            if request.creator_id == user["id"]
+            and (filters.status == "ALL" or request.status.value == filters.status.upper())
+        ]
+        requests.sort(key=lambda r: getattr(r, filters.sort), reverse=filters.order == "desc")
+
+        pagination_result = filters.paginate_items(requests)
+        pagination_result.data = [
+            self.to_request_info(request, sparse=filters)
+            for request in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_my_applications(
+        self, user: UserTokenData, filters: MyApplicationsFilter
+    ) -> Pagination[RequestWithApplication]:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        applications = [
+            application for (_, user_id), application in self.store.applications.items()
+            if user_id == user["id"]
+            and (filters.status == "ALL" or application.status.value == filters.status)
+        ]
+        if filters.sort == "applied_at":
+            applications.sort(key=lambda a: (a.applied_at, a.id), reverse=filters.order == "desc")
+        else:
+            applications.sort(
+                key=lambda a: (getattr(self.store.requests[a.request_id], filters.sort), a.id),
+                reverse=filters.order == "desc",
+            )
+
+        pagination_result = filters.paginate_items(applications)
+        pagination_result.data = [
+            self.to_request_info(
+                self.store.requests[application.request_id],
+                cls=RequestWithApplication,
+                sparse=filters,
+                application_status=application.status.value,
+                applied_at=application.applied_at,
+            )
+            for application in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_recommendations(
+        self, user: UserTokenData, filters: RecommendationsFilter
+    ) -> Pagination[RecommendedRequest]:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        # Scored on the fly: there is no worker to precompute candidates.
+        applications = sorted(
+            (
+                application for (_, user_id), application in self.store.applications.items()
+                if user_id == user["id"]
+            ),
+            key=attrgetter("applied_at"),
+            reverse=True,
+        )
+        profile = recommendations.Profile.of(
+            (
+                float(request.latitude),
+                float(request.longitude),
+                [rt.id for rt in request.request_types],
+            )
+            for request in (
+                self.store.requests[application.request_id]
+                for application in applications[:recommendations.PROFILE_APPLICATIONS]
+            )
+        )
+        applied = {application.request_id for application in applications}
+
+        now = utcnow()
+        scored = sorted(
+            (
+                (
+                    profile.score(
+                        recommendations.Candidate(
+                            id=request.id,
+                            latitude=request.latitude,
+                            longitude=request.longitude,
+                            request_type_ids=[rt.id for rt in request.request_types],
+                            reward=request.reward,
+                            start=request.start,
+                            seeker_rating=self.store.users[request.creator_id].avg_rating,
+                        ),
+                        now,
+                    ),
+                    request.id,
+                )
+                for request in self.store.requests.values()
+                if is_open(request, now) and request.id not in applied
+            ),
+            reverse=True,
+        )
+
+        pagination_result = filters.paginate_items(scored)
+        pagination_result.data = [
+            self.to_request_info(
+                self.store.requests[request_id], cls=RecommendedRequest, sparse=filters, score=score
+            )
+            for score, request_id in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_requests(
+        self, user: UserTokenData, filters: RequestsFilter
+    ) -> Pagination[RequestWithApplicationStatus]:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+
+        now = utcnow()
+        windows = self.store.availability_of(user["id"])
+        matches = []
+        for request in self.store.requests.values():
+            application = self.store.get_application(request.id, user["id"])
+            application_status = application.status.value if application else "NOT_APPLIED"
+
+            if filters.status == "OPEN" and not is_open(request, now):
+                continue
+            if filters.status == "APPLIED" and application_status != "PENDING":
+                continue
+            if filters.status == "COMPLETED" and request.status != RequestStatus.COMPLETED:
+                continue
+            if filters.status == "ALL" and application is None and not is_open(request, now):
+                continue
+
+            if filters.max_reward is not None and not request.reward < filters.max_reward:
+                continue
+            if filters.available and not any(
+                window.during.overlaps(Range(request.start, request.end)) for window in windows
+            ):
+                continue
+            if filters.min_reward is not None and not filters.min_reward < request.reward:
+                continue
+
+            if filters.location_lat and filters.location_lng and filters.radius * 1000 < (
+                map_grid.distance_meters(
+                    filters.location_lat, filters.location_lng,
+                    float(request.latitude), float(request.longitude),
+                )
+            ):
+                continue
+
+            if 0 < len(filters.request_type_ids) and not any(
+                rt.id in filters.request_type_ids for rt in request.request_types
+            ):
+                continue
+
+            matches.append((request, application_status))
+
+        matches.sort(
+            key=lambda match: getattr(match[0], filters.sort), reverse=filters.order == "desc"
+        )
+
+        pagination_result = filters.paginate_items(matches)
+        pagination_result.data = [
+            self.to_request_info(
+                request,
+                cls=RequestWithApplicationStatus,
+                sparse=filters,
+                application_status=application_status,
+            )
+            for request, application_status in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_map(self, user: UserTokenData, viewport: MapViewport) -> MapView:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        now = utcnow()
+        in_view = sorted(
+            (
+                request for request in self.store.requests.values()
+                if is_open(request, now)
+                and viewport.min_lat <= request.latitude <= viewport.max_lat
+                and viewport.min_lng <= request.longitude <= viewport.max_lng
+                and (
+                    not viewport.request_type_ids
+                    or any(rt.id in viewport.request_type_ids for rt in request.request_types)
+                )
+            ),
+            key=lambda request: request.id,
+        )
+
+        if map_grid.wants_points(viewport) and len(in_view) <= map_grid.MAP_MAX_POINTS:
+            return MapView(
+                zoom=viewport.zoom,
+                cell_size=None,
+                clusters=[],
+                points=[
+                    RequestService.to_map_point(
+                        request,
+                        [CommonService.to_request_type_info(rt) for rt in request.request_types],
+                    )
+                    for request in in_view
+                ],
+            )
+
+        size = map_grid.cell_size(viewport)
+        cells = {}
+        for request in in_view:
+            cell = (
+                map_grid.snap(float(request.longitude), size),
+                map_grid.snap(float(request.latitude), size),
+            )
+            cells.setdefault(cell, []).append(request)
+
+        clusters = []
+        for requests in cells.values():
+            type_counts = Counter(rt.id for request in requests for rt in request.request_types)
+            names = {rt.id: rt.name for request in requests for rt in request.request_types}
+            clusters.append(MapCluster(
+                latitude=sum(float(r.latitude) for r in requests) / len(requests),
+                longitude=sum(float(r.longitude) for r in requests) / len(requests),
+                count=len(requests),
+                request_types=sorted(
+                    (
+                        RequestTypeCount(id=id, name=names[id], count=count)
+                        for id, count in type_counts.items()
+                    ),
+                    key=lambda rt: (-rt.count, rt.id),
+                ),
+            ))
+        return MapView(zoom=viewport.zoom, cell_size=size, clusters=clusters, points=[])
+
+    async def get_tile(
+        self, user: UserTokenData, z: int, x: int, y: int, filters: TileFilter
+    ) -> bytes:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        if not map_grid.tile_exists(z, x, y):
+            raise TileNotFoundError
+
+        min_lat, min_lng, max_lat, max_lng = map_grid.tile_bounds(z, x, y)
+        now = utcnow()
+        points = []
+        for request in sorted(self.store.requests.values(), key=lambda r: r.id):
+            if not (min_lat <= request.latitude <= max_lat and min_lng <= request.longitude <= max_lng):
+                continue
+            if filters.request_type_ids and not any(
+                rt.id in filters.request_type_ids for rt in request.request_types
+            ):
+                continue
+            application = self.store.get_application(request.id, user["id"])
+            if filters.status == "OPEN" and not is_open(request, now):
+                continue
+            if filters.status == "COMPLETED" and request.status != RequestStatus.COMPLETED:
+                continue
+            if filters.status == "APPLIED" and (
+                application is None or application.status != ApplicationStatus.PENDING
+            ):
+                continue
+            if filters.status == "ALL" and not is_open(request, now) and application is None:
+                continue
+
+            tile_x, tile_y = map_grid.tile_position(float(request.latitude), float(request.longitude), z)
+            points.append((
+                round((tile_x - x) * map_grid.TILE_EXTENT),
+                round((tile_y - y) * map_grid.TILE_EXTENT),
+                {
+                    "id": request.id,
+                    "reward": int(request.reward),
+                    "status": request.status.value,
+                    "request_type_id": request.request_types[0].id if request.request_types else None,
+                },
+            ))
+        return mvt.encode_points("requests", points, map_grid.TILE_EXTENT)
+
+    async def get_request_for_help_seeker(
+        self, user: UserTokenData, request_id: int
+    ) -> RequestDetailForHelpSeeker:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        request = self.store.get_request(request_id)
+        if request is None or request.creator_id != user["id"]:
+            raise RequestNotFoundError
+
+        first = sorted(
+            request.applications,
+            key=lambda a: (a.status != ApplicationStatus.ACCEPTED, a.applied_at, a.id),
+        )[:DETAIL_APPLICATIONS]
+        counts = Counter(application.status for application in request.applications)
+        return self.to_request_info(
+            request,
+            cls=RequestDetailForHelpSeeker,
+            applications=[RequestService.to_application_info(app) for app in first],
+            application_counts=ApplicationCounts(
+                pending=counts[ApplicationStatus.PENDING],
+                accepted=counts[ApplicationStatus.ACCEPTED],
+                declined=counts[ApplicationStatus.DECLINED],
+            ),
+            has_rated_helper=any(
+                application.volunteer_rating is not None
+                for application in request.applications
+            )
+        )
+
+    async def get_request_applications(
+        self, user: UserTokenData, request_id: int, filters: ApplicationsFilter
+    ) -> Pagination[ApplicationInfo]:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        request = self.store.get_request(request_id)
+        if request is None or request.creator_id != user["id"]:
+            raise RequestNotFoundError
+
+        applications = [
+            application for application in request.applications
+            if filters.status == "ALL" or application.status.value == filters.status
+        ]
+        # avg_rating and level are the volunteer's.
+        key = attrgetter("applied_at" if filters.sort == "applied_at" else f"volunteer.{filters.sort}")
+        applications.sort(key=lambda a: (key(a), a.id), reverse=filters.order == "desc")
+
+        pagination_result = filters.paginate_items(applications)
+        pagination_result.data = [
+            RequestService.to_application_info(application)
+            for application in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_request_for_volunteer(
+        self, user: UserTokenData, request_id: int
+    ) -> RequestDetailForVolunteer:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        request = self.store.get_request(request_id)
+        if request is None:
+            raise RequestNotFoundError
+
+        application = self.store.get_application(request_id, user["id"])
+        creator = self.store.users[request.creator_id]
+        creator_info = UserInfo(
+            id=creator.id,
+            first_name=creator.first_name,
+            last_name=creator.last_name,
+            avg_rating=creator.avg_rating
+        )
+
+        return self.to_request_info(
+            request,
+            cls=RequestDetailForVolunteer,
+            application_status=application.status.value if application else "NOT_APPLIED",
+            creator=creator_info,
+            has_rated_seeker=application is not None and application.help_seeker_rating is not None,
+        )
+
+    # Building the detail is cheap in memory, so the version is its digest.
+    async def get_request_version_for_help_seeker(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion:
+        detail = await self.get_request_for_help_seeker(user, request_id)
+        return ResourceVersion.of(detail)
+
+    async def get_request_version_for_volunteer(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion:
+        detail = await self.get_request_for_volunteer(user, request_id)
+        return ResourceVersion.of(user["id"], detail)
+
+    @staticmethod
+    def to_request_info(
+        request: Request,
+        cls: Type[R] = RequestInfo,
+        sparse: Optional[SparseFieldsParams] = None,
+        **extra,
+    ) -> R:
+        # The store keeps the relationship populated, so no catalog lookup,
+        # and the preview the SQL backend truncates in the query is cut here.
+        if sparse is not None and sparse.wants("description_preview"):
+            extra["description_preview"] = request.description[:DESCRIPTION_PREVIEW_LENGTH]
+        return RequestService.to_request_info(
+            request,
+            [CommonService.to_request_type_info(rt) for rt in request.request_types],
+            cls,
+            sparse,
+            **extra,
+        )
+
+    def _request_types(self, request_type_ids: List[int]) -> List[RequestType]:
+        return [
+            self.store.request_types[request_type_id]
+            for request_type_id in dict.fromkeys(request_type_ids)
+            if request_type_id in self.store.request_types
+        ]
@@ -0,0 +1,116 @@
+import itertools
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...models import (
+    USER_STATS_COLUMNS,
+    Application,
+    Availability,
+    Request,
+    RequestStatus,
+    RequestType,
+    User,
+    UserStats,
+)
+
+DEFAULT_REQUEST_TYPES = [
+    "Shopping",
+    "Dog Walking",
+    "Cleaning",
+    "Gardening",
+    "Tutoring",
+    "Pet Sitting",
+    "Home Repair",
+]
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def is_open(request: Request, now: datetime) -> bool:
+    # Same as the SQL services' IS_OPEN: past-`end` requests aren't open.
+    return request.status == RequestStatus.OPEN and now < request.end
+
+
+class InMemoryStore:
+    """
+    Process-local replacement for the database. Rows are transient ORM
+    instances so the SQL services' converters work on them unchanged.
+    Mutations never await, so the event loop serializes them the same way
+    row locks do in Postgres.
+    """
+
+    def __init__(self):
+        self.users: Dict[int, User] = {}
+        self.users_by_email: Dict[str, User] = {}
+        self.refresh_tokens: Set[Tuple[int, str]] = set()
+        self.request_types: Dict[int, RequestType] = {}
+        self.requests: Dict[int, Request] = {}
+        self.applications: Dict[Tuple[int, int], Application] = {}
+        self.availability: Dict[int, Availability] = {}
+        self.user_stats: Dict[int, UserStats] = {}
+        self._ids = defaultdict(lambda: itertools.count(1))
+
+    @classmethod
+    def with_default_request_types(cls) -> "InMemoryStore":
+        store = cls()
+        for name in DEFAULT_REQUEST_TYPES:
+            store.add_request_type(name)
+        return store
+
+    def next_id(self, table: str) -> int:
+        return next(self._ids[table])
+
+    def add_request_type(self, name: str) -> RequestType:
+        request_type = RequestType(id=self.next_id("request_type"), name=name)
+        self.request_types[request_type.id] = request_type
+        return request_type
+
+    def get_request(self, request_id: int) -> Optional[Request]:
+        return self.requests.get(request_id)
+
+    def get_application(self, request_id: int, user_id: int) -> Optional[Application]:
+        return self.applications.get((request_id, user_id))
+
+    def availability_of(self, user_id: int) -> List[Availability]:
+        return sorted(
+            (window for window in self.availability.values() if window.user_id == user_id),
+            key=lambda window: window.during.lower,
+        )
+
+    # Mirrors outbox.count_user_stats, applied right away.
+    def count_user_stats(self, user_id: int, **deltas: int):
+        stats = self.user_stats.get(user_id)
+        if stats is None:
+            stats = UserStats(user_id=user_id, **{column: 0 for column in USER_STATS_COLUMNS})
+            self.user_stats[user_id] = stats
+        for column, delta in deltas.items():
+            setattr(stats, column, getattr(stats, column) + delta)
+        stats.updated_at = utcnow()
+
+    def applications_for_request(self, request_id: int) -> List[Application]:
+        request = self.requests.get(request_id)
+        return list(request.applications) if request is not None else []
+
+    # Mirrors the update_*_avg_rating_func triggers on the application table.
+    def update_volunteer_avg_rating(self, volunteer_id: int):
+        ratings = [
+            application.volunteer_rating
+            for application in self.applications.values()
+            if application.user_id == volunteer_id and application.volunteer_rating is not None
+        ]
+        volunteer = self.users.get(volunteer_id)
+        if volunteer is not None:
+            volunteer.avg_rating = sum(ratings) / len(ratings) if ratings else 0.0
+
+    def update_help_seeker_avg_rating(self, help_seeker_id: int):
+        ratings = [
+            application.help_seeker_rating
+            for application in self.applications.values()
+            if application.help_seeker_rating is not None
+            and self.requests[application.request_id].creator_id == help_seeker_id
+        ]
+        help_seeker = self.users.get(help_seeker_id)
+        if help_seeker is not None:
+            help_seeker.avg_rating = sum(ratings) / len(ratings) if ratings else 0.0
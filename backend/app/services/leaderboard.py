@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import time
+from bisect import insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..interfaces.common_service import LEADERBOARD_SIZE
+from ..models import User
+from .map_grid import tile_bounds, tile_position
+
+# Postgres channel notified by the user table's trigger with a user's old
+# and new [level, experience].
+LEADERBOARD_CHANNEL = "user_experience_changed"
+# Safety net for missed notifications, e.g. when no listener is running.
+LEADERBOARD_MAX_AGE = float(os.getenv("LEADERBOARD_MAX_AGE", "300"))
+# Zoom of the map tile that makes up a user's area (10 is about 40 km wide
+# at the equator).
+LEADERBOARD_AREA_ZOOM = int(os.getenv("LEADERBOARD_AREA_ZOOM", "10"))
+
+# (level, experience); higher compares greater.
+Standing = Tuple[int, int]
+
+
+def competition_ranks(standings: Iterable[Standing]) -> List[int]:
+    """
+    Ranks of standings listed best first, from the top: tied users share a
+    rank and the next one skips past them (1, 2, 2, 4).
+    """
+    ranks: List[int] = []
+    previous = None
+    for position, standing in enumerate(standings, start=1):
+        ranks.append(ranks[-1] if standing == previous else position)
+        previous = standing
+    return ranks
+
+
+def area_bounds(latitude: float, longitude: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of the area containing a point."""
+    x, y = tile_position(latitude, longitude, LEADERBOARD_AREA_ZOOM)
+    return tile_bounds(LEADERBOARD_AREA_ZOOM, int(x), int(y))
+
+
+class LeaderboardCache:
+    """
+    Process-wide global leaderboard: the best `size` users by (level,
+    experience) and the number of users per standing. Both are loaded from
+    idx_user_level_experience (a backward scan and an index-only grouping)
+    and then kept up to date from user_experience_changed notifications, so
+    neither the top nor a user's rank reads the user table. It is reloaded
+    after a missed notification (payload None, e.g. on reconnect) or after
+    `max_age` seconds; a change racing a reload is picked up by the next one.
+    """
+
+    def __init__(self, size: int = LEADERBOARD_SIZE, max_age: float = LEADERBOARD_MAX_AGE):
+        self.size = size
+        self.max_age = max_age
+        # (level, experience, user_id), best first.
+        self._top: List[Tuple[int, int, int]] = []
+        # Users per level and per experience within the level.
+        self._counts: Dict[int, Dict[int, int]] = {}
+        self._level_counts: Dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or self.max_age <= time.monotonic() - self._loaded_at
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                top = await session.execute(
+                    select(User.level, User.experience, User.id)
+                    .order_by(User.level.desc(), User.experience.desc(), User.id.desc())
+                    .limit(self.size)
+                )
+                counts = await session.execute(
+                    select(User.level, User.experience, func.count())
+                    .group_by(User.level, User.experience)
+                )
+                self.replace(top.tuples(), counts.tuples())
+
+    def replace(
+        self, top: Iterable[Tuple[int, int, int]], counts: Iterable[Tuple[int, int, int]]
+    ) -> None:
+        self._top = sorted(top, reverse=True)[:self.size]
+        self._counts = defaultdict(dict)
+        self._level_counts = defaultdict(int)
+        for level, experience, count in counts:
+            self._counts[level][experience] = count
+            self._level_counts[level] += count
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        # Listener callback.
+        try:
+            change = json.loads(payload) if payload else None
+            user_id, old, new = change["id"], change["old"], change["new"]
+        except (ValueError, KeyError, TypeError):
+            self._loaded_at = None
+            return
+        self.apply(user_id, tuple(old) if old else None, tuple(new) if new else None)
+
+    def apply(self, user_id: int, old: Optional[Standing], new: Optional[Standing]) -> None:
+        """Moves a user from `old` to `new`; None for a new or deleted user."""
+        if self._loaded_at is None:
+            return
+        if old is not None:
+            self._count(old, -1)
+        if new is not None:
+            self._count(new, 1)
+
+        was_top = any(entry[2] == user_id for entry in self._top)
+        if was_top:
+            self._top = [entry for entry in self._top if entry[2] != user_id]
+        if new is not None:
+            entry = (*new, user_id)
+            if len(self._top) < self.size or self._top[-1] < entry:
+                insort(self._top, entry, key=lambda e: (-e[0], -e[1], -e[2]))
+                del self._top[self.size:]
+        if was_top and len(self._top) < min(self.size, self.user_count):
+            # Someone left the top and whoever is next isn't known here.
+            self._loaded_at = None
+
+    @property
+    def user_count(self) -> int:
+        return sum(self._level_counts.values())
+
+    def top(self, limit: int) -> List[Tuple[int, int, int, int]]:
+        """(rank, user_id, level, experience) of the best `limit` users."""
+        top = self._top[:limit]
+        ranks = competition_ranks((level, experience) for level, experience, _ in top)
+        return [
+            (rank, user_id, level, experience)
+            for rank, (level, experience, user_id) in zip(ranks, top)
+        ]
+
+    def rank(self, level: int, experience: int) -> int:
+        """One plus the number of users with a better standing."""
+        above = sum(count for other, count in self._level_counts.items() if level < other)
+        above += sum(
+            count for other, count in self._counts.get(level, {}).items() if experience < other
+        )
+        return above + 1
+
+    def _count(self, standing: Standing, delta: int) -> None:
+        level, experience = standing
+        experiences = self._counts[level]
+        experiences[experience] = experiences.get(experience, 0) + delta
+        if experiences[experience] <= 0:
+            del experiences[experience]
+        self._level_counts[level] += delta
+
+
+leaderboard_cache = LeaderboardCache()
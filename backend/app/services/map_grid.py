@@ -0,0 +1,72 @@
+import math
+import os
+from typing import Tuple
+
+from ..interfaces.request_service import MapViewport
+
+# Grid cells per 256 px map tile, i.e. about one cluster per 64 px.
+CELLS_PER_TILE = 4
+# Cells along the longer side of the viewport at most, which bounds the
+# number of clusters whatever the viewport and zoom level.
+MAP_MAX_GRID = int(os.getenv("MAP_MAX_GRID", "32"))
+# Zoom level from which requests are returned individually.
+MAP_POINTS_ZOOM = int(os.getenv("MAP_POINTS_ZOOM", "15"))
+# More requests than this in view are clustered even from MAP_POINTS_ZOOM.
+MAP_MAX_POINTS = int(os.getenv("MAP_MAX_POINTS", "500"))
+
+
+def wants_points(viewport: MapViewport) -> bool:
+    return MAP_POINTS_ZOOM <= viewport.zoom
+
+
+def cell_size(viewport: MapViewport) -> float:
+    # A tile spans 360 / 2^zoom degrees of longitude.
+    size = 360 / 2 ** viewport.zoom / CELLS_PER_TILE
+    span = max(viewport.max_lng - viewport.min_lng, viewport.max_lat - viewport.min_lat)
+    return max(size, span / MAP_MAX_GRID)
+
+
+def snap(value: float, size: float) -> float:
+    # Same rounding (half to even) as ST_SnapToGrid.
+    return round(value / size) * size
+
+
+# Web Mercator tiles, as addressed by /{z}/{x}/{y} map tile URLs.
+MAX_TILE_ZOOM = 22
+# Tile coordinate space of generated vector tiles.
+TILE_EXTENT = 4096
+MAX_MERCATOR_LAT = 85.0511287798
+
+
+def tile_exists(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of a tile."""
+    n = 2 ** z
+
+    def latitude(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return latitude(y + 1), x / n * 360 - 180, latitude(y), (x + 1) / n * 360 - 180
+
+
+def tile_position(latitude: float, longitude: float, z: int) -> Tuple[float, float]:
+    # Fractional tile coordinates; the integer parts address the tile.
+    n = 2 ** z
+    lat = math.radians(max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, latitude)))
+    x = (longitude + 180) / 360 * n
+    y = (1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n
+    return min(max(x, 0), n - 1e-9), min(max(y, 0), n - 1e-9)
+
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+
+def distance_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
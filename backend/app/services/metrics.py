@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .ai_batcher import get_category_batcher
+from .category_cache import get_category_cache
+from .event_hub import event_hub
+from .outbox import outbox_lag
+from .tile_cache import tile_cache
+
+METRIC_PREFIX = "kindly"
+# Prometheus text exposition format.
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Sample(NamedTuple):
+    name: str
+    kind: str  # "counter" or "gauge"
+    value: float
+    help: str
+
+
+def _counters(component: str, stats: Dict[str, int], help: str) -> List[Sample]:
+    return [
+        Sample(f"{component}_{name}_total", "counter", value, f"{help}: {name.replace('_', ' ')}")
+        for name, value in stats.items()
+    ]
+
+
+def process_samples() -> List[Sample]:
+    """
+    The in-process counters of this worker's caches and event hub. Each
+    process counts on its own and from its start; Prometheus sums and rates
+    them across processes.
+    """
+    samples = _counters("category_cache", get_category_cache().stats, "AI category suggestion cache")
+    samples += _counters("tile_cache", tile_cache.stats, "Vector tile cache")
+    samples += _counters("event_hub", event_hub.stats, "Server-sent events")
+    batcher = get_category_batcher()
+    if batcher is not None:
+        samples += _counters("ai_batcher", batcher.stats, "Batched LLM category suggestions")
+    return samples
+
+
+async def outbox_samples(session: AsyncSession) -> List[Sample]:
+    # Read from the outbox table, so the same for every process; alert on
+    # oldest_age growing or failed being above zero.
+    lag = await outbox_lag(session)
+    return [
+        Sample("outbox_pending", "gauge", lag.pending, "Outbox messages waiting for the worker"),
+        Sample(
+            "outbox_oldest_age_seconds", "gauge", lag.oldest_age,
+            "Seconds since the oldest pending outbox message was written",
+        ),
+        Sample("outbox_failed", "gauge", lag.failed, "Outbox messages out of retries"),
+    ]
+
+
+def render(samples: Iterable[Sample]) -> str:
+    lines = []
+    for sample in samples:
+        name = f"{METRIC_PREFIX}_{sample.name}"
+        lines += [
+            f"# HELP {name} {sample.help}",
+            f"# TYPE {name} {sample.kind}",
+            f"{name} {float(sample.value)!r}",
+        ]
+    return "\n".join(lines) + "\n"
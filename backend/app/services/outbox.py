@@ -0,0 +1,256 @@
+import logging
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional
+
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import (
+    Application,
+    ApplicationHistory,
+    ApplicationStatus,
+    OutboxMessage,
+    Request,
+    RequestHistory,
+    User,
+    UserStats,
+)
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel notified by the outbox table's trigger.
+OUTBOX_CHANNEL = "outbox"
+
+# available_at of messages out of retries.
+NEVER = literal_column("'infinity'::timestamptz")
+
+Handler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+HANDLERS: Dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    def register(function: Handler) -> Handler:
+        HANDLERS[kind] = function
+        return function
+    return register
+
+
+async def enqueue(
+    session: AsyncSession, kind: str, payload: Dict[str, Any], key: Optional[str] = None
+) -> None:
+    # Part of the caller's transaction; a no-op while a message with the same
+    # key is pending. Claimed messages have given up their key, so an
+    # enqueue racing the worker adds a message the worker hasn't seen yet.
+    await session.execute(
+        insert(OutboxMessage)
+        .values(kind=kind, payload=payload, key=key)
+        .on_conflict_do_nothing(index_elements=[OutboxMessage.key])
+    )
+
+
+@handler("award_experience")
+async def award_experience(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    user = await session.get(
+        User, payload["user_id"], with_for_update=True, populate_existing=True
+    )
+    if user is not None:
+        user.add_experience(payload["xp"])
+
+
+async def enqueue_user_stats(session: AsyncSession, user_id: int, **deltas: int) -> None:
+    # Counter changes for a user_stats row, applied by the worker so the
+    # transition doesn't wait for the row lock of whoever it counts for.
+    await enqueue(session, "count_user_stats", {"user_id": user_id, "deltas": deltas})
+
+
+@handler("count_user_stats")
+async def count_user_stats(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    deltas = payload["deltas"]
+    await session.execute(
+        insert(UserStats)
+        .values(user_id=payload["user_id"], **deltas)
+        .on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                **{name: getattr(UserStats, name) + delta for name, delta in deltas.items()},
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+@handler("request_completed")
+async def request_completed(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    # The help-seeker and the accepted volunteer earn the request's XP and
+    # count it as completed.
+    request = await session.get(Request, payload["request_id"])
+    if request is None:
+        return
+    volunteer_id = (
+        await session.execute(
+            select(Application.user_id)
+            .filter(Application.request_id == request.id)
+            .filter(Application.status == ApplicationStatus.ACCEPTED)
+        )
+    ).scalar_one_or_none()
+    xp = request.calculate_experience()
+    for user_id in (request.creator_id, volunteer_id):
+        if user_id is not None:
+            await award_experience(session, {"user_id": user_id, "xp": xp})
+            await count_user_stats(
+                session, {"user_id": user_id, "deltas": {"requests_completed": 1}}
+            )
+
+
+def refresh_rating_key(role: Literal["volunteer", "help_seeker"], user_id: int) -> str:
+    return f"refresh_rating:{role}:{user_id}"
+
+
+@handler("refresh_rating")
+async def refresh_rating(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    # Volunteers are rated through their applications, help-seekers through
+    # the applications to their requests; archived ones count too.
+    user_id = payload["user_id"]
+    if payload["role"] == "volunteer":
+        rating = ApplicationHistory.volunteer_rating
+        ratings = select(rating).filter(ApplicationHistory.user_id == user_id)
+    else:
+        rating = ApplicationHistory.help_seeker_rating
+        ratings = (
+            select(rating)
+            .join(RequestHistory, RequestHistory.id == ApplicationHistory.request_id)
+            .filter(RequestHistory.creator_id == user_id)
+        )
+    average = (
+        ratings.filter(rating.is_not(None))
+        .with_only_columns(func.coalesce(func.avg(rating), 0))
+        .scalar_subquery()
+    )
+    await session.execute(update(User).where(User.id == user_id).values(avg_rating=average))
+
+
+@dataclass(slots=True)
+class OutboxLag:
+    pending: int
+    failed: int
+    # Seconds since the oldest pending message was written.
+    oldest_age: float
+
+
+class OutboxWorker:
+    """
+    Carries out outbox messages in batches. A batch is claimed with FOR
+    UPDATE SKIP LOCKED, so workers never share messages, and releases its
+    keys, so changes made while it runs are enqueued anew. Every message
+    runs in a savepoint: its effects and its deletion commit together, so
+    each message takes effect exactly once. Failed messages are retried with
+    exponential backoff, up to `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 100,
+        max_attempts: int = 10,
+        max_backoff: float = 300,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_env(cls, session_factory: Callable[[], AsyncSession]) -> "OutboxWorker":
+        return cls(
+            session_factory,
+            batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", "100")),
+            max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")),
+            max_backoff=float(os.getenv("OUTBOX_MAX_BACKOFF", "300")),
+        )
+
+    async def run_once(self) -> int:
+        """Processes one batch, returning the number of messages claimed."""
+        claimed = (
+            select(OutboxMessage.id)
+            .filter(OutboxMessage.available_at <= func.now())
+            .order_by(OutboxMessage.available_at, OutboxMessage.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session, session.begin():
+            # An enqueue with a claimed key waits for this transaction and
+            # then inserts, instead of being coalesced into a message whose
+            # handler may already have read the state before its change.
+            messages = (
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(claimed))
+                    .values(key=None)
+                    .returning(
+                        OutboxMessage.id,
+                        OutboxMessage.kind,
+                        OutboxMessage.payload,
+                        OutboxMessage.attempts,
+                        OutboxMessage.available_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            # RETURNING rows come in no particular order.
+            messages.sort(key=lambda message: (message.available_at, message.id))
+
+            done = []
+            for id, kind, payload, attempts, _ in messages:
+                try:
+                    async with session.begin_nested():
+                        function = HANDLERS.get(kind)
+                        if function is None:
+                            raise LookupError(f"No outbox handler for {kind!r}")
+                        await function(session, payload)
+                        await session.flush()
+                    done.append(id)
+                except Exception as exc:
+                    await self._failed(session, id, kind, attempts + 1, exc)
+
+            if done:
+                await session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(done)))
+        return len(messages)
+
+    async def _failed(
+        self, session: AsyncSession, id: int, kind: str, attempts: int, exc: Exception
+    ) -> None:
+        values: Dict[str, Any] = {"attempts": attempts, "last_error": repr(exc)[:1000]}
+        if self.max_attempts <= attempts:
+            logger.error("Outbox message %s (%s) failed for good: %r", id, kind, exc)
+            values.update(available_at=NEVER)
+        else:
+            logger.warning("Outbox message %s (%s) failed, attempt %s: %r", id, kind, attempts, exc)
+            backoff = min(2 ** attempts, self.max_backoff)
+            values.update(available_at=func.now() + timedelta(seconds=backoff))
+        await session.execute(
+            update(OutboxMessage).where(OutboxMessage.id == id).values(**values)
+        )
+
+    async def lag(self) -> OutboxLag:
+        async with self.session_factory() as session:
+            return await outbox_lag(session)
+
+
+async def outbox_lag(session: AsyncSession) -> OutboxLag:
+    failed = OutboxMessage.available_at == NEVER
+    pending, failed_count, oldest_age = (
+        await session.execute(
+            select(
+                func.count().filter(~failed),
+                func.count().filter(failed),
+                func.extract(
+                    "epoch", func.now() - func.min(OutboxMessage.created_at).filter(~failed)
+                ),
+            )
+        )
+    ).one()
+    return OutboxLag(pending=pending, failed=failed_count, oldest_age=float(oldest_age or 0))
@@ -0,0 +1,316 @@
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, or_, select, tuple_, union
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import (
+    Application,
+    ApplicationHistory,
+    Recommendation,
+    Request,
+    RequestHistory,
+    TypeOf,
+    User,
+    VolunteerProfile,
+)
+from . import outbox
+from .map_grid import distance_meters
+from .request_service import IS_OPEN
+
+# Candidate requests kept per volunteer.
+RECOMMENDATION_CANDIDATES = int(os.getenv("RECOMMENDATION_CANDIDATES", "200"))
+# Open requests this close to a volunteer's home are candidates, and new
+# requests are scored for the volunteers living this close.
+RECOMMENDATION_RADIUS_KM = float(os.getenv("RECOMMENDATION_RADIUS_KM", "25"))
+# Hours after which the worker refreshes a profile and its candidates; this
+# also bounds how stale the time-to-start term and seeker ratings get.
+RECOMMENDATION_MAX_AGE = float(os.getenv("RECOMMENDATION_MAX_AGE", "6"))
+
+# Most recent applications a profile is derived from.
+PROFILE_APPLICATIONS = 200
+
+# Weights of the score terms, each of which is in [0, 1].
+WEIGHTS = {
+    "distance": 0.35,
+    "affinity": 0.3,
+    "start": 0.15,
+    "reward": 0.1,
+    "seeker_rating": 0.1,
+}
+# The distance and time-to-start terms fall by a factor of e every
+# DISTANCE_SCALE_KM and START_SCALE_HOURS; the reward term is a half at
+# REWARD_SCALE.
+DISTANCE_SCALE_KM = 5.0
+START_SCALE_HOURS = 48.0
+REWARD_SCALE = 100.0
+# Terms with nothing to go on (no home yet, unrated seeker) count as this.
+NEUTRAL = 0.5
+
+
+class Candidate(NamedTuple):
+    id: int
+    latitude: float
+    longitude: float
+    request_type_ids: Optional[List[int]]
+    reward: float
+    start: datetime
+    seeker_rating: Optional[float]
+
+
+@dataclass(slots=True)
+class Profile:
+    # Centroid of the requests applied to; None before the first application.
+    latitude: Optional[float]
+    longitude: Optional[float]
+    # Share of the applications per request type id.
+    affinity: Dict[int, float]
+
+    @classmethod
+    def of(cls, applied: Iterable[Tuple[float, float, Optional[List[int]]]]) -> "Profile":
+        applied = list(applied)
+        if not applied:
+            return cls(latitude=None, longitude=None, affinity={})
+        counts = Counter(
+            request_type_id for _, _, request_type_ids in applied
+            for request_type_id in request_type_ids or []
+        )
+        return cls(
+            latitude=sum(latitude for latitude, _, _ in applied) / len(applied),
+            longitude=sum(longitude for _, longitude, _ in applied) / len(applied),
+            affinity={
+                request_type_id: count / len(applied) for request_type_id, count in counts.items()
+            },
+        )
+
+    def score(self, candidate: Candidate, now: datetime) -> float:
+        if self.latitude is None or self.longitude is None:
+            distance = NEUTRAL
+        else:
+            meters = distance_meters(
+                self.latitude, self.longitude, float(candidate.latitude), float(candidate.longitude)
+            )
+            distance = math.exp(-meters / 1000 / DISTANCE_SCALE_KM)
+        affinity = max(
+            (self.affinity.get(i, 0.0) for i in candidate.request_type_ids or []), default=0.0
+        )
+        hours = max(0.0, (candidate.start - now).total_seconds() / 3600)
+        reward = max(0.0, float(candidate.reward))
+        terms = {
+            "distance": distance,
+            "affinity": affinity,
+            "start": math.exp(-hours / START_SCALE_HOURS),
+            "reward": reward / (reward + REWARD_SCALE),
+            "seeker_rating": candidate.seeker_rating / 5 if candidate.seeker_rating else NEUTRAL,
+        }
+        return sum(WEIGHTS[name] * value for name, value in terms.items())
+
+
+def refresh_key(user_id: int) -> str:
+    return f"refresh_recommendations:{user_id}"
+
+
+def _candidates():
+    # Open requests with what Profile.score reads, in Candidate order.
+    return (
+        select(
+            Request.id,
+            Request.latitude,
+            Request.longitude,
+            Request.request_type_ids,
+            Request.reward,
+            Request.start,
+            User.avg_rating,
+        )
+        .join(User, User.id == Request.creator_id)
+        .where(IS_OPEN)
+    )
+
+
+async def _profile(session: AsyncSession, user_id: int) -> Profile:
+    # From live and archived applications alike.
+    applied = await session.execute(
+        select(RequestHistory.latitude, RequestHistory.longitude, RequestHistory.request_type_ids)
+        .join(ApplicationHistory, ApplicationHistory.request_id == RequestHistory.id)
+        .where(ApplicationHistory.user_id == user_id)
+        .order_by(ApplicationHistory.applied_at.desc())
+        .limit(PROFILE_APPLICATIONS)
+    )
+    return Profile.of(
+        (float(latitude), float(longitude), request_type_ids)
+        for latitude, longitude, request_type_ids in applied
+    )
+
+
+@outbox.handler("refresh_recommendations")
+async def refresh_recommendations(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    # Rebuilds a volunteer's profile and candidate set. Candidates come from
+    # bounded, indexed pools: requests near home, in the volunteer's request
+    # types and ending soonest (the latter is all a new volunteer gets).
+    user_id = payload["user_id"]
+    profile = await _profile(session, user_id)
+
+    not_applied = ~(
+        select(Application.id)
+        .where(Application.request_id == Request.id)
+        .where(Application.user_id == user_id)
+        .exists()
+    )
+    pool = select(Request.id).where(IS_OPEN).where(not_applied).order_by(Request.end)
+    pools = [pool.limit(RECOMMENDATION_CANDIDATES)]
+    if profile.latitude is not None:
+        pools.append(
+            pool.where(
+                func.ST_DWithin(
+                    Request.location,
+                    func.ST_Point(profile.latitude, profile.longitude),
+                    RECOMMENDATION_RADIUS_KM * 1000,
+                )
+            ).limit(RECOMMENDATION_CANDIDATES)
+        )
+    if profile.affinity:
+        pools.append(
+            pool.where(
+                Request.id.in_(
+                    select(TypeOf.request_id)
+                    .where(TypeOf.request_type_id.in_(list(profile.affinity)))
+                )
+            ).limit(RECOMMENDATION_CANDIDATES)
+        )
+    candidates = [
+        Candidate(*row)
+        for row in await session.execute(_candidates().where(Request.id.in_(union(*pools))))
+    ]
+
+    now = datetime.now(timezone.utc)
+    scored = sorted(
+        ((profile.score(candidate, now), candidate.id) for candidate in candidates), reverse=True
+    )[:RECOMMENDATION_CANDIDATES]
+
+    await session.execute(delete(Recommendation).where(Recommendation.user_id == user_id))
+    if scored:
+        await session.execute(
+            insert(Recommendation),
+            [
+                {"user_id": user_id, "request_id": request_id, "score": score}
+                for score, request_id in scored
+            ],
+        )
+    values = {
+        "latitude": profile.latitude,
+        "longitude": profile.longitude,
+        "location": (
+            None if profile.latitude is None
+            else func.ST_Point(profile.latitude, profile.longitude)
+        ),
+        "affinity": {str(i): share for i, share in profile.affinity.items()},
+        "refreshed_at": func.now(),
+    }
+    await session.execute(
+        insert(VolunteerProfile)
+        .values(user_id=user_id, **values)
+        .on_conflict_do_update(index_elements=[VolunteerProfile.user_id], set_=values)
+    )
+
+
+@outbox.handler("rescore_request")
+async def rescore_request(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    # Scores a new or changed request for the volunteers living near it or
+    # applying to its request types, keeping each volunteer's best
+    # RECOMMENDATION_CANDIDATES. A request no longer open is just dropped.
+    request_id = payload["request_id"]
+    await session.execute(delete(Recommendation).where(Recommendation.request_id == request_id))
+    row = (await session.execute(_candidates().where(Request.id == request_id))).first()
+    if row is None:
+        return
+    candidate = Candidate(*row)
+
+    # `location` is ST_Point(latitude, longitude), as for requests.
+    nearby = [
+        func.ST_DWithin(
+            VolunteerProfile.location,
+            func.ST_Point(candidate.latitude, candidate.longitude),
+            RECOMMENDATION_RADIUS_KM * 1000,
+        )
+    ]
+    if candidate.request_type_ids:
+        nearby.append(
+            VolunteerProfile.affinity.has_any(array([str(i) for i in candidate.request_type_ids]))
+        )
+    profiles = (
+        await session.execute(select(VolunteerProfile).where(or_(*nearby)))
+    ).scalars().all()
+    if not profiles:
+        return
+
+    now = datetime.now(timezone.utc)
+    await session.execute(
+        insert(Recommendation),
+        [
+            {
+                "user_id": volunteer.user_id,
+                "request_id": candidate.id,
+                "score": Profile(
+                    latitude=None if volunteer.latitude is None else float(volunteer.latitude),
+                    longitude=None if volunteer.longitude is None else float(volunteer.longitude),
+                    affinity={int(i): share for i, share in volunteer.affinity.items()},
+                ).score(candidate, now),
+            }
+            for volunteer in profiles
+        ],
+    )
+
+    ranked = (
+        select(
+            Recommendation.user_id,
+            Recommendation.request_id,
+            func.row_number().over(
+                partition_by=Recommendation.user_id,
+                order_by=(Recommendation.score.desc(), Recommendation.request_id.desc()),
+            ).label("rank"),
+        )
+        .where(Recommendation.user_id.in_([volunteer.user_id for volunteer in profiles]))
+        .subquery()
+    )
+    await session.execute(
+        delete(Recommendation).where(
+            tuple_(Recommendation.user_id, Recommendation.request_id).in_(
+                select(ranked.c.user_id, ranked.c.request_id)
+                .where(ranked.c.rank > RECOMMENDATION_CANDIDATES)
+            )
+        )
+    )
+
+
+async def enqueue_stale(session: AsyncSession, limit: int) -> int:
+    """
+    Enqueues refreshes for up to `limit` volunteers without a profile or
+    with one older than RECOMMENDATION_MAX_AGE, oldest first. Returns the
+    number enqueued.
+    """
+    stale = (
+        await session.execute(
+            select(User.id)
+            .outerjoin(VolunteerProfile, VolunteerProfile.user_id == User.id)
+            .where(User.is_volunteer)
+            .where(
+                VolunteerProfile.user_id.is_(None)
+                | (
+                    VolunteerProfile.refreshed_at
+                    < func.now() - timedelta(hours=RECOMMENDATION_MAX_AGE)
+                )
+            )
+            .order_by(VolunteerProfile.refreshed_at.asc().nulls_first())
+            .limit(limit)
+        )
+    ).scalars().all()
+    for user_id in stale:
+        await outbox.enqueue(
+            session, "refresh_recommendations", {"user_id": user_id}, key=refresh_key(user_id)
+        )
+    return len(stale)
@@ -1,29 +1,106 @@
 from decimal import Decimal
+from operator import attrgetter
+from typing import List, Optional, Type, TypeVar
 
-from geoalchemy2.functions import ST_DWithin, ST_Point
-from sqlalchemy import String
+from sqlalchemy import String, delete, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import defer, joinedload
-from sqlalchemy.sql import asc, desc, func, select
+from sqlalchemy.orm import (
+    contains_eager,
+    defer,
+    joinedload,
+    load_only,
+    undefer,
+    with_expression,
+)
+from sqlalchemy.sql import asc, desc, func, select, true, union
 
+from ..conditional import ResourceVersion
 from ..interfaces.request_service import (
+    DESCRIPTION_PREVIEW_LENGTH,
+    DETAIL_APPLICATIONS,
+    ApplicationCounts,
     ApplicationInfo,
+    ApplicationsFilter,
     CreateOrUpdateRequestData,
+    MapCluster,
+    MapPoint,
+    MapView,
+    MapViewport,
+    MyApplicationsFilter,
     MyRequestsFilter,
     Pagination,
+    RecommendationsFilter,
+    RecommendedRequest,
     RequestDetailForHelpSeeker,
     RequestDetailForVolunteer,
     RequestInfo,
     RequestServiceInterface,
+    RequestTypeCount,
+    RequestWithApplication,
     RequestWithApplicationStatus,
     RequestsFilter,
+    SparseFieldsParams,
+    TileFilter,
     UserInfo,
 )
 from ..interfaces.auth_service import AuthServiceInterface, UserRoles, UserTokenData
 from ..interfaces.common_service import RequestTypeInfo
-from ..interfaces.exceptions import RequestCannotBeUpdatedError, RequestNotFoundError
-from ..models import Application, ApplicationStatus, Request, RequestType, User, TypeOf
+from ..interfaces.exceptions import (
+    RequestCannotBeUpdatedError,
+    RequestNotFoundError,
+    TileNotFoundError,
+)
+from ..models import (
+    Application,
+    ApplicationHistory,
+    ApplicationStatus,
+    Availability,
+    Recommendation,
+    Request,
+    RequestHistory,
+    TypeOf,
+    User,
+)
 from ..models.request import RequestStatus
+from . import map_grid, outbox
+from .request_type_catalog import request_type_catalog
+from .tile_cache import tile_cache
+
+R = TypeVar("R", bound=RequestInfo)
+
+# Requests open to volunteers. Past-`end` ones are excluded before the expiry
+# sweeper gets to them; both terms match idx_request_open_end.
+IS_OPEN = (Request.status == RequestStatus.OPEN) & (Request.end > func.now())
+
+# Attributes and readers behind the RequestInfo fields, for sparse fieldsets.
+_FIELD_COLUMNS = {
+    "name": "name",
+    "description": "description",
+    "reward": "reward",
+    "status": "status",
+    "start": "start",
+    "end": "end",
+    "address": "address",
+    "longitude": "longitude",
+    "latitude": "latitude",
+    "created_at": "created_at",
+    "application_count": "application_count",
+    "request_types": "request_type_ids",
+}
+_FIELD_GETTERS = {
+    "name": attrgetter("name"),
+    "description": attrgetter("description"),
+    "reward": attrgetter("reward"),
+    "status": lambda request: request.status.value,
+    "start": attrgetter("start"),
+    "end": attrgetter("end"),
+    "address": attrgetter("address"),
+    "longitude": lambda request: float(request.longitude),
+    "latitude": lambda request: float(request.latitude),
+    "created_at": attrgetter("created_at"),
+    "application_count": attrgetter("application_count"),
+}
 
 
 class RequestService(RequestServiceInterface):
@@ -35,50 +112,62 @@ class RequestService(RequestServiceInterface):
         self, user: UserTokenData, request_data: CreateOrUpdateRequestData
     ) -> RequestInfo:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        await request_type_catalog.ensure_loaded(self.session)
         request = Request(
             name=request_data.name,
             description=request_data.description,
             address=request_data.address,
             longitude=request_data.longitude,
             latitude=request_data.latitude,
-            location=ST_Point(request_data.latitude, request_data.longitude),
+            location=func.ST_Point(request_data.latitude, request_data.longitude),
             start=request_data.start,
             end=request_data.end,
             reward=request_data.reward,
             creator_id=user["id"]
         )
 
-        request_types = await self.session.scalars(
-            select(RequestType).where(RequestType.id.in_(request_data.request_type_ids))
-        )
-        request.request_types.extend(request_types)
+        request_type_ids = request_type_catalog.valid_ids(request_data.request_type_ids)
         self.session.add(request)
+        await self.session.flush()
+        self.session.add_all(
+            TypeOf(request_id=request.id, request_type_id=request_type_id)
+            for request_type_id in request_type_ids
+        )
+        # Scored for nearby volunteers' recommendations by the outbox worker.
+        await outbox.enqueue(
+            self.session, "rescore_request", {"request_id": request.id},
+            key=f"rescore_request:{request.id}",
+        )
+        await outbox.enqueue_user_stats(self.session, user["id"], requests_posted=1)
         await self.session.commit()
 
-        return self._to_request_info(request)
+        return self.to_request_info(request, request_type_catalog.infos(request_type_ids))
 
     async def update_request(
         self, user: UserTokenData, request_id: int, request_data: CreateOrUpdateRequestData
     ) -> RequestInfo:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
         async with self.session.begin():
+            await request_type_catalog.ensure_loaded(self.session)
             request = (
                 await self.session.execute(
                     select(Request)
-                    .options(joinedload(Request.request_types))
+                    .options(undefer(Request.request_type_ids))
                     .filter(Request.id == request_id)
                     .filter(Request.creator_id == user["id"])
                 )
-            ).unique().scalar_one_or_none()
+            ).scalar_one_or_none()
             if request is None or request.application_count > 0:
                 raise RequestCannotBeUpdatedError
 
+            request_type_ids = request.request_type_ids
             if 0 < len(request_data.request_type_ids):
-                request_types = await self.session.scalars(
-                    select(RequestType).where(RequestType.id.in_(request_data.request_type_ids))
+                request_type_ids = request_type_catalog.valid_ids(request_data.request_type_ids)
+                await self.session.execute(delete(TypeOf).where(TypeOf.request_id == request.id))
+                self.session.add_all(
+                    TypeOf(request_id=request.id, request_type_id=request_type_id)
+                    for request_type_id in request_type_ids
                 )
-                request.request_types.clear()
-                request.request_types.extend(request_types)
 
             # Update request fields
             request.name = request_data.name
@@ -89,9 +178,16 @@ class RequestService(RequestServiceInterface):
             request.address = request_data.address
             request.latitude = Decimal(str(request_data.latitude))
             request.longitude = Decimal(str(request_data.longitude))
-            request.location = ST_Point(request_data.latitude, request_data.longitude)
+            request.location = func.ST_Point(request_data.latitude, request_data.longitude)
+            # Changing only the types leaves the row alone, but the ETag
+            # probes rely on updated_at moving.
+            request.updated_at = func.now()
+            await outbox.enqueue(
+                self.session, "rescore_request", {"request_id": request.id},
+                key=f"rescore_request:{request.id}",
+            )
 
-        return self._to_request_info(request)
+        return self.to_request_info(request, request_type_catalog.infos(request_type_ids))
 
     async def delete_request(self, user: UserTokenData, request_id: int) -> None:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
@@ -108,6 +204,7 @@ class RequestService(RequestServiceInterface):
             raise RequestCannotBeUpdatedError
 
         await self.session.delete(request)
+        await outbox.enqueue_user_stats(self.session, user["id"], requests_posted=-1)
         await self.session.commit()
 
     async def complete_request(self, user: UserTokenData, request_id: int) -> None:
@@ -126,68 +223,147 @@ class RequestService(RequestServiceInterface):
             raise RequestCannotBeUpdatedError
 
         request.status = RequestStatus.COMPLETED
-
-        experience_gain = request.calculate_experience()
-        caretaker = await self.session.get(User, user["id"])
-        if caretaker is not None:
-            caretaker.add_experience(experience_gain)
-
-        accepted_application = (
-            await self.session.execute(
-                select(Application)
-                .filter(Application.request_id == request.id)
-                .filter(Application.status == ApplicationStatus.ACCEPTED)
-            )
-        ).scalar_one_or_none()
-        if accepted_application is not None:
-            volunteer = await self.session.get(User, accepted_application.user_id)
-            if volunteer is not None:
-                volunteer.add_experience(experience_gain)
-
+        # XP is awarded by the outbox worker.
+        await outbox.enqueue(
+            self.session, "request_completed", {"request_id": request.id},
+            key=f"request_completed:{request.id}",
+        )
         await self.session.commit()
 
     async def get_my_requests(
         self, user: UserTokenData, filters: MyRequestsFilter
     ) -> Pagination[RequestInfo]:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        await request_type_catalog.ensure_loaded(self.session)
+        # Completed requests may have been archived.
+        requests = Request if filters.status == "OPEN" else RequestHistory
+        sort = getattr(requests, filters.sort)
         query = (
-            select(Request)
-            .options(defer(Request.location))
-            .options(joinedload(Request.request_types))
-            .where(Request.creator_id == user["id"])
-            .order_by(asc(filters.sort) if filters.order == "asc" else desc(filters.sort))
+            select(requests)
+            .options(*self.list_load_options(filters, requests))
+            .where(requests.creator_id == user["id"])
+            .order_by(asc(sort) if filters.order == "asc" else desc(sort))
         )
 
         if filters.status != "ALL":
-            query = query.where(Request.status == filters.status.upper())
+            query = query.where(requests.status == filters.status.upper())
 
         pagination_result = await filters.paginate(self.session, query)
         pagination_result.data = [
-            self._to_request_info(row)
+            self.to_request_info(row, sparse=filters)
             for row in pagination_result.data
         ]
         return pagination_result
 
+    async def get_my_applications(
+        self, user: UserTokenData, filters: MyApplicationsFilter
+    ) -> Pagination[RequestWithApplication]:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+        # Driven from the volunteer's applications (idx_application_user_applied_at
+        # on both sides of the union), joining only their requests by id.
+        # The application id breaks ties so pages neither repeat nor skip rows.
+        if filters.sort == "applied_at":
+            sort = ApplicationHistory.applied_at
+        else:
+            sort = getattr(RequestHistory, filters.sort)
+        direction = asc if filters.order == "asc" else desc
+        query = (
+            select(
+                RequestHistory,
+                func.cast(ApplicationHistory.status, String),
+                ApplicationHistory.applied_at,
+            )
+            .select_from(ApplicationHistory)
+            .join(RequestHistory, RequestHistory.id == ApplicationHistory.request_id)
+            .options(*self.list_load_options(filters, RequestHistory))
+            .where(ApplicationHistory.user_id == user["id"])
+            .order_by(direction(sort), direction(ApplicationHistory.id))
+        )
+        if filters.status != "ALL":
+            query = query.where(ApplicationHistory.status == ApplicationStatus(filters.status))
+
+        pagination_result = await filters.paginate(self.session, query, scalar=False)
+        pagination_result.data = [
+            self.to_request_info(
+                request,
+                cls=RequestWithApplication,
+                sparse=filters,
+                application_status=application_status,
+                applied_at=applied_at,
+            )
+            for request, application_status, applied_at in pagination_result.data
+        ]
+        return pagination_result
+
     async def get_requests(
         self, user: UserTokenData, filters: RequestsFilter
     ) -> Pagination[RequestWithApplicationStatus]:
         self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+        query = self.requests_query(user, filters)
+
+        pagination_result = await filters.paginate(self.session, query, scalar=False)
+        pagination_result.data = [
+            self.to_request_info(
+                request_obj,
+                cls=RequestWithApplicationStatus,
+                sparse=filters,
+                application_status=application_status,
+            )
+            for request_obj, application_status in pagination_result.data
+        ]
+        return pagination_result
+
+    async def get_recommendations(
+        self, user: UserTokenData, filters: RecommendationsFilter
+    ) -> Pagination[RecommendedRequest]:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+        # The candidates precomputed by services.recommendations, read in
+        # score order from idx_recommendation_user_score. Requests closed or
+        # applied to since the last refresh are skipped.
+        applied = (
+            select(Application.id)
+            .where(Application.request_id == Request.id)
+            .where(Application.user_id == user["id"])
+            .exists()
+        )
+        query = (
+            select(Request, Recommendation.score)
+            .join(Recommendation, Recommendation.request_id == Request.id)
+            .options(*self.list_load_options(filters))
+            .where(Recommendation.user_id == user["id"])
+            .where(IS_OPEN)
+            .where(~applied)
+            .order_by(Recommendation.score.desc(), Recommendation.request_id.desc())
+        )
 
+        pagination_result = await filters.paginate(self.session, query, scalar=False)
+        pagination_result.data = [
+            self.to_request_info(request, cls=RecommendedRequest, sparse=filters, score=score)
+            for request, score in pagination_result.data
+        ]
+        return pagination_result
+
+    def requests_query(self, user: UserTokenData, filters: RequestsFilter):
+        # The volunteer feed's query, also EXPLAINed by scripts.check_feed_plans.
+        # Completed requests may have been archived, so they are read from
+        # the history views.
+        if filters.status == "COMPLETED":
+            requests, applications = RequestHistory, ApplicationHistory
+        else:
+            requests, applications = Request, Application
         application_status = func.coalesce(
-            func.cast(Application.status, String), "NOT_APPLIED"
+            func.cast(applications.status, String), "NOT_APPLIED"
         ).label("application_status")
         query = (
-            select(Request, application_status)
-            .options(
-                joinedload(Request.creator).load_only(
-                    User.id, User.first_name, User.last_name, User.avg_rating
-                )
-            )
-            .options(joinedload(Request.request_types))
+            select(requests, application_status)
+            .options(*self.list_load_options(filters, requests))
             .join(
-                Application,
-                (Request.id == Application.request_id)
-                & (Application.user_id == user["id"]),
+                applications,
+                (requests.id == applications.request_id)
+                & (applications.user_id == user["id"]),
                 isouter=True,
             )
             .order_by(
@@ -195,106 +371,410 @@ class RequestService(RequestServiceInterface):
             )
         )
         if filters.status == "OPEN":
-            query = query.filter(Request.status == RequestStatus.OPEN)
+            query = query.filter(IS_OPEN)
         elif filters.status == "APPLIED":
-            query = query.filter(application_status == "PENDING")
+            # On the column rather than the coalesced label, so the outer
+            # join becomes an inner one driven from the user's applications.
+            query = query.filter(Application.status == ApplicationStatus.PENDING)
         elif filters.status == "COMPLETED":
-            query = query.filter(Request.status == RequestStatus.COMPLETED)
+            query = query.filter(requests.status == RequestStatus.COMPLETED)
         elif filters.status == "ALL":
-            query = query.filter(
-                (Request.status == RequestStatus.OPEN)
-                | (application_status is not None)
+            # Open requests plus those applied to, as a UNION of two
+            # index scans (idx_request_open_end, idx_application_user_applied_at);
+            # an OR of the two would scan every request.
+            listed = union(
+                select(Request.id).where(IS_OPEN),
+                select(Application.request_id).where(Application.user_id == user["id"]),
             )
+            query = query.filter(Request.id.in_(listed))
 
         if filters.max_reward is not None:
-            query = query.filter(Request.reward < filters.max_reward)
+            query = query.filter(requests.reward < filters.max_reward)
         if filters.min_reward is not None:
-            query = query.filter(filters.min_reward < Request.reward)
+            query = query.filter(filters.min_reward < requests.reward)
 
         if filters.location_lat and filters.location_lng:
+            # Archived requests keep no `location`; it is rebuilt from their
+            # coordinates, the way create_request writes it.
+            if requests is Request:
+                location = Request.location
+            else:
+                location = func.geography(func.ST_Point(requests.latitude, requests.longitude))
             query = query.filter(
-                ST_DWithin(
-                    Request.location,
-                    ST_Point(filters.location_lat, filters.location_lng),
+                func.ST_DWithin(
+                    location,
+                    func.ST_Point(filters.location_lat, filters.location_lng),
                     filters.radius * 1000,
                 )
             )
 
-        if 0 < len(filters.request_type_ids):
+        if filters.available:
+            # Probed per request on excl_availability_user_during's
+            # (user_id, during) index, or driven from the volunteer's
+            # windows through idx_request_open_during.
+            query = query.filter(
+                select(Availability.id)
+                .where(Availability.user_id == user["id"])
+                .where(Availability.during.overlaps(func.tstzrange(requests.start, requests.end)))
+                .exists()
+            )
+
+        if 0 < len(filters.request_type_ids) and requests is RequestHistory:
+            # The history views carry the type ids as an array.
+            query = query.filter(
+                requests.request_type_ids.op("&&")(array(filters.request_type_ids))
+            )
+        elif 0 < len(filters.request_type_ids):
             query = (
                 query
                 .join(TypeOf, isouter=True)
                 .filter(TypeOf.request_type_id.in_(filters.request_type_ids))
                 .distinct()
             )
+        return query
 
-        pagination_result = await filters.paginate(self.session, query, scalar=False)
-        pagination_result.data = [
-            RequestWithApplicationStatus(
-                **self._to_request_info(request_obj).__dict__,
-                application_status=application_status
+    async def get_map(self, user: UserTokenData, viewport: MapViewport) -> MapView:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+
+        if map_grid.wants_points(viewport):
+            rows = (
+                await self.session.execute(
+                    self._open_in_viewport(select(Request), viewport)
+                    .options(load_only(
+                        Request.id, Request.name, Request.reward,
+                        Request.latitude, Request.longitude, Request.request_type_ids,
+                    ))
+                    .order_by(Request.id)
+                    .limit(map_grid.MAP_MAX_POINTS + 1)
+                )
+            ).scalars().all()
+            if len(rows) <= map_grid.MAP_MAX_POINTS:
+                return MapView(
+                    zoom=viewport.zoom,
+                    cell_size=None,
+                    clusters=[],
+                    points=[self.to_map_point(row) for row in rows],
+                )
+
+        size = map_grid.cell_size(viewport)
+        snapped = func.ST_SnapToGrid(func.ST_MakePoint(Request.longitude, Request.latitude), size)
+        cells = self._open_in_viewport(
+            select(
+                Request.id,
+                Request.latitude,
+                Request.longitude,
+                func.ST_X(snapped).label("cell_x"),
+                func.ST_Y(snapped).label("cell_y"),
+            ),
+            viewport,
+        ).cte("cells")
+        cell_key = (cells.c.cell_x, cells.c.cell_y)
+
+        clusters = {}
+        for cell_x, cell_y, count, latitude, longitude in await self.session.execute(
+            select(
+                *cell_key,
+                func.count(),
+                func.avg(cells.c.latitude),
+                func.avg(cells.c.longitude),
+            ).group_by(*cell_key)
+        ):
+            clusters[cell_x, cell_y] = MapCluster(
+                latitude=float(latitude),
+                longitude=float(longitude),
+                count=count,
+                request_types=[],
             )
-            for request_obj, application_status in pagination_result.data
-        ]
-        return pagination_result
+
+        # The category mix, counted per cell and request type in the database.
+        for cell_x, cell_y, request_type_id, count in await self.session.execute(
+            select(*cell_key, TypeOf.request_type_id, func.count())
+            .join(TypeOf, TypeOf.request_id == cells.c.id)
+            .group_by(*cell_key, TypeOf.request_type_id)
+        ):
+            for info in request_type_catalog.infos([request_type_id]):
+                clusters[cell_x, cell_y].request_types.append(
+                    RequestTypeCount(id=info["id"], name=info["name"], count=count)
+                )
+
+        for cluster in clusters.values():
+            cluster.request_types.sort(key=lambda rt: (-rt.count, rt.id))
+        return MapView(zoom=viewport.zoom, cell_size=size, clusters=list(clusters.values()), points=[])
+
+    @classmethod
+    def _open_in_viewport(cls, query, viewport: MapViewport):
+        query = cls._in_bounds(
+            query.where(IS_OPEN),
+            viewport.min_lat, viewport.min_lng, viewport.max_lat, viewport.max_lng,
+        )
+        return cls._with_request_types(query, viewport.request_type_ids)
+
+    async def get_tile(
+        self, user: UserTokenData, z: int, x: int, y: int, filters: TileFilter
+    ) -> bytes:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        if not map_grid.tile_exists(z, x, y):
+            raise TileNotFoundError
+
+        # APPLIED and ALL depend on the user's applications, which the tile
+        # cache is not invalidated for, so only shared variants are cached.
+        variant = (filters.status, tuple(sorted(set(filters.request_type_ids))))
+        cacheable = filters.status in ("OPEN", "COMPLETED")
+        if cacheable:
+            body = tile_cache.get((z, x, y), variant)
+            if body is not None:
+                return body
+
+        envelope = func.ST_TileEnvelope(z, x, y)
+        point = func.ST_SetSRID(func.ST_MakePoint(Request.longitude, Request.latitude), 4326)
+        primary_type = (
+            select(TypeOf.request_type_id)
+            .where(TypeOf.request_id == Request.id)
+            .order_by(TypeOf.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = select(
+            Request.id,
+            Request.reward,
+            func.cast(Request.status, String).label("status"),
+            primary_type.label("request_type_id"),
+            func.ST_AsMVTGeom(
+                func.ST_Transform(point, 3857), envelope, map_grid.TILE_EXTENT
+            ).label("geom"),
+        )
+        query = self._in_bounds(query, *map_grid.tile_bounds(z, x, y))
+        query = self._with_request_types(query, filters.request_type_ids)
+
+        has_applied = (
+            select(Application.id)
+            .where(Application.request_id == Request.id)
+            .where(Application.user_id == user["id"])
+        )
+        if filters.status == "OPEN":
+            query = query.where(IS_OPEN)
+        elif filters.status == "COMPLETED":
+            query = query.where(Request.status == RequestStatus.COMPLETED)
+        elif filters.status == "APPLIED":
+            query = query.where(
+                has_applied.where(Application.status == ApplicationStatus.PENDING).exists()
+            )
+        elif filters.status == "ALL":
+            query = query.where(IS_OPEN | has_applied.exists())
+
+        features = query.subquery("features")
+        body = (
+            await self.session.execute(
+                select(func.ST_AsMVT(features.table_valued(), "requests", map_grid.TILE_EXTENT, "geom"))
+            )
+        ).scalar_one()
+        body = bytes(body or b"")
+        if cacheable:
+            tile_cache.put((z, x, y), variant, body)
+        return body
+
+    @staticmethod
+    def _in_bounds(query, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+        # Requests within the bounds, by the exact coordinate columns.
+        query = (
+            query
+            .where(Request.latitude.between(min_lat, max_lat))
+            .where(Request.longitude.between(min_lng, max_lng))
+        )
+        # `location` is written as ST_Point(latitude, longitude), so a
+        # matching envelope lets the GiST index narrow the scan. Geography
+        # coerces that second axis into [-90, 90], so longitudes outside it
+        # are only found through the columns above.
+        if -90 <= min_lng and max_lng <= 90:
+            envelope = func.ST_MakeEnvelope(min_lat, min_lng, max_lat, max_lng, 4326)
+            query = query.where(Request.location.op("&&")(func.geography(envelope)))
+        return query
+
+    @staticmethod
+    def _with_request_types(query, request_type_ids: List[int]):
+        if 0 < len(request_type_ids):
+            query = query.where(
+                select(TypeOf.id)
+                .where(TypeOf.request_id == Request.id)
+                .where(TypeOf.request_type_id.in_(request_type_ids))
+                .exists()
+            )
+        return query
 
     async def get_request_for_help_seeker(
         self, user: UserTokenData, request_id: int
     ) -> RequestDetailForHelpSeeker:
         self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
-        result = (
+        await request_type_catalog.ensure_loaded(self.session)
+        return await self._with_archive(self._request_for_help_seeker, user, request_id)
+
+    async def _request_for_help_seeker(
+        self,
+        user: UserTokenData,
+        request_id: int,
+        requests: Type[Request | RequestHistory],
+        applications: Type[Application | ApplicationHistory],
+    ) -> RequestDetailForHelpSeeker:
+        # Applications are counted in the database; only the first few are loaded.
+        summary = self._applications_summary(applications, request_id)
+        row = (
             await self.session.execute(
-                select(Request)
-                .options(joinedload(Request.request_types))
-                .options(joinedload(Request.applications))
-                .options(joinedload(Request.applications).joinedload(Application.volunteer))
-                .filter(Request.id == request_id)
-                .filter(Request.creator_id == user["id"])
+                select(requests, summary)
+                .options(undefer(requests.request_type_ids))
+                .join(summary, true())
+                .filter(requests.id == request_id)
+                .filter(requests.creator_id == user["id"])
             )
-        ).unique().scalar_one_or_none()
-        if result is None:
+        ).first()
+        if row is None:
             raise RequestNotFoundError
 
-        request_info = self._to_request_info(result)
-        applications = [self._to_application_info(app) for app in result.applications]
-        return RequestDetailForHelpSeeker(
-            **request_info.__dict__,
-            applications=applications,
-            has_rated_helper=any(
-                application.volunteer_rating is not None
-                for application in result.applications
+        request = row[0]
+        first = (
+            await self.session.execute(
+                self._applications_query(applications, request_id)
+                .order_by(*self._detail_applications_order(applications))
+                .limit(DETAIL_APPLICATIONS)
             )
+        ).scalars()
+        return self.to_request_info(
+            request,
+            cls=RequestDetailForHelpSeeker,
+            applications=[self.to_application_info(app) for app in first],
+            application_counts=ApplicationCounts(
+                pending=row.PENDING, accepted=row.ACCEPTED, declined=row.DECLINED
+            ),
+            has_rated_helper=row.has_rated_helper,
+        )
+
+    async def get_request_applications(
+        self, user: UserTokenData, request_id: int, filters: ApplicationsFilter
+    ) -> Pagination[ApplicationInfo]:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        return await self._with_archive(self._request_applications, user, request_id, filters)
+
+    async def _request_applications(
+        self,
+        user: UserTokenData,
+        request_id: int,
+        filters: ApplicationsFilter,
+        requests: Type[Request | RequestHistory],
+        applications: Type[Application | ApplicationHistory],
+    ) -> Pagination[ApplicationInfo]:
+        owned = (
+            await self.session.execute(
+                select(requests.id)
+                .filter(requests.id == request_id)
+                .filter(requests.creator_id == user["id"])
+            )
+        ).first()
+        if owned is None:
+            raise RequestNotFoundError
+
+        sort = {
+            "applied_at": applications.applied_at,
+            "avg_rating": User.avg_rating,
+            "level": User.level,
+        }[filters.sort]
+        ordered = asc if filters.order == "asc" else desc
+        query = (
+            self._applications_query(applications, request_id)
+            .order_by(ordered(sort), ordered(applications.id))
+        )
+        if filters.status != "ALL":
+            query = query.where(applications.status == ApplicationStatus(filters.status))
+
+        pagination_result = await filters.paginate(self.session, query)
+        pagination_result.data = [
+            self.to_application_info(application) for application in pagination_result.data
+        ]
+        return pagination_result
+
+    @staticmethod
+    def _applications_summary(
+        applications: Type[Application | ApplicationHistory], request_id: int
+    ):
+        # One row: the request's applications counted by status, and whether
+        # the accepted volunteer was rated.
+        return (
+            select(
+                *(
+                    func.count().filter(applications.status == status).label(status.name)
+                    for status in ApplicationStatus
+                ),
+                func.coalesce(
+                    func.bool_or(applications.volunteer_rating.is_not(None)), False
+                ).label("has_rated_helper"),
+            )
+            .where(applications.request_id == request_id)
+            .subquery("summary")
+        )
+
+    @staticmethod
+    def _detail_applications_order(applications: Type[Application | ApplicationHistory]) -> list:
+        # The DETAIL_APPLICATIONS shown with a request: accepted first, then
+        # by application time.
+        return [
+            (applications.status == ApplicationStatus.ACCEPTED).desc(),
+            applications.applied_at,
+            applications.id,
+        ]
+
+    @staticmethod
+    def _applications_query(
+        applications: Type[Application | ApplicationHistory], request_id: int
+    ):
+        # A request's applications with only the volunteer columns ApplicationInfo shows.
+        return (
+            select(applications)
+            .join(User, User.id == applications.user_id)
+            .options(
+                contains_eager(applications.volunteer).load_only(
+                    User.id, User.first_name, User.last_name, User.avg_rating
+                )
+            )
+            .where(applications.request_id == request_id)
         )
 
     async def get_request_for_volunteer(
         self, user: UserTokenData, request_id: int
     ) -> RequestDetailForVolunteer:
         self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+        return await self._with_archive(self._request_for_volunteer, user, request_id)
+
+    async def _request_for_volunteer(
+        self,
+        user: UserTokenData,
+        request_id: int,
+        requests: Type[Request | RequestHistory],
+        applications: Type[Application | ApplicationHistory],
+    ) -> RequestDetailForVolunteer:
         result = await self.session.execute(
             select(
-                Request,
-                func.coalesce(func.cast(Application.status, String), "NOT_APPLIED"),
-                Application.help_seeker_rating,
+                requests,
+                func.coalesce(func.cast(applications.status, String), "NOT_APPLIED"),
+                applications.help_seeker_rating,
             )
             .options(
-                joinedload(Request.creator).load_only(
+                joinedload(requests.creator).load_only(
                     User.id, User.first_name, User.last_name, User.avg_rating
                 )
             )
-            .options(joinedload(Request.request_types))
+            .options(undefer(requests.request_type_ids))
             .outerjoin(
-                Application,
-                (Application.request_id == Request.id)
-                & (Application.user_id == user["id"]),
+                applications,
+                (applications.request_id == requests.id)
+                & (applications.user_id == user["id"]),
             )
-            .filter(Request.id == request_id)
+            .filter(requests.id == request_id)
         )
         result = result.unique().first()
         if result is None:
             raise RequestNotFoundError
 
         request, user_application_status, seeker_rating = result
-        request_info = self._to_request_info(request)
         creator_info = UserInfo(
             id=request.creator.id,
             first_name=request.creator.first_name,
@@ -302,15 +782,180 @@ class RequestService(RequestServiceInterface):
             avg_rating=request.creator.avg_rating
         )
 
-        return RequestDetailForVolunteer(
-            **request_info.__dict__,
+        return self.to_request_info(
+            request,
+            cls=RequestDetailForVolunteer,
             application_status=str(user_application_status),
             creator=creator_info,
             has_rated_seeker=seeker_rating is not None,
         )
 
-    def _to_request_info(self, request: Request) -> RequestInfo:
-        return RequestInfo(
+    async def get_request_version_for_help_seeker(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion:
+        self.auth_service.authorize_with_role(user, UserRoles.HELP_SEEKER)
+        await request_type_catalog.ensure_loaded(self.session)
+        return await self._with_archive(self._request_version_for_help_seeker, user, request_id)
+
+    async def _request_version_for_help_seeker(
+        self,
+        user: UserTokenData,
+        request_id: int,
+        requests: Type[Request | RequestHistory],
+        applications: Type[Application | ApplicationHistory],
+    ) -> ResourceVersion:
+        # What the detail shows of the applications: the summary counts and
+        # the first DETAIL_APPLICATIONS rows with their volunteers, digested
+        # in the database instead of loaded, so the cost does not grow with
+        # the applicants. Ratings are set without touching any updated_at, so
+        # there is no Last-Modified: only the ETag sees has_rated_helper change.
+        summary = self._applications_summary(applications, request_id)
+        first = (
+            select(
+                applications.id,
+                (applications.status == ApplicationStatus.ACCEPTED).label("accepted"),
+                applications.applied_at,
+                func.concat_ws(
+                    ":",
+                    applications.id,
+                    func.cast(applications.status, String),
+                    User.updated_at,
+                    User.avg_rating,
+                ).label("shown"),
+            )
+            .join(User, User.id == applications.user_id)
+            .where(applications.request_id == request_id)
+            .order_by(*self._detail_applications_order(applications))
+            .limit(DETAIL_APPLICATIONS)
+            .subquery("first")
+        )
+        digest = select(
+            func.md5(
+                func.string_agg(
+                    first.c.shown,
+                    aggregate_order_by(
+                        literal_column("','"),
+                        first.c.accepted.desc(), first.c.applied_at, first.c.id,
+                    ),
+                )
+            )
+        ).scalar_subquery()
+        row = (
+            await self.session.execute(
+                select(requests.updated_at, summary, digest)
+                .join(summary, true())
+                .filter(requests.id == request_id)
+                .filter(requests.creator_id == user["id"])
+            )
+        ).first()
+        if row is None:
+            raise RequestNotFoundError
+
+        return ResourceVersion.of(request_id, *row, request_type_catalog.version)
+
+    async def get_request_version_for_volunteer(
+        self, user: UserTokenData, request_id: int
+    ) -> ResourceVersion:
+        self.auth_service.authorize_with_role(user, UserRoles.VOLUNTEER)
+        await request_type_catalog.ensure_loaded(self.session)
+        return await self._with_archive(self._request_version_for_volunteer, user, request_id)
+
+    async def _request_version_for_volunteer(
+        self,
+        user: UserTokenData,
+        request_id: int,
+        requests: Type[Request | RequestHistory],
+        applications: Type[Application | ApplicationHistory],
+    ) -> ResourceVersion:
+        # No Last-Modified, as for help-seekers: has_rated_seeker follows
+        # help_seeker_rating, which no updated_at covers.
+        row = (
+            await self.session.execute(
+                select(
+                    requests.updated_at,
+                    User.updated_at,
+                    User.avg_rating,
+                    func.cast(applications.status, String),
+                    applications.help_seeker_rating,
+                )
+                .join(User, User.id == requests.creator_id)
+                .outerjoin(
+                    applications,
+                    (applications.request_id == requests.id)
+                    & (applications.user_id == user["id"]),
+                )
+                .filter(requests.id == request_id)
+            )
+        ).first()
+        if row is None:
+            raise RequestNotFoundError
+
+        return ResourceVersion.of(request_id, user["id"], *row, request_type_catalog.version)
+
+    @staticmethod
+    async def _with_archive(read, *args):
+        # Reads the live tables first and falls back to the history views,
+        # which also cover archived requests, on a miss; live requests are
+        # the common case and skip the union.
+        try:
+            return await read(*args, Request, Application)
+        except RequestNotFoundError:
+            return await read(*args, RequestHistory, ApplicationHistory)
+
+    @staticmethod
+    def list_load_options(
+        filters: SparseFieldsParams, requests: Type[Request | RequestHistory] = Request
+    ) -> list:
+        # Sparse fieldsets load only the columns behind the wanted fields.
+        if not filters.is_sparse:
+            if requests is RequestHistory:
+                return []
+            return [defer(Request.location), undefer(Request.request_type_ids)]
+
+        columns = [
+            getattr(requests, key) for name, key in _FIELD_COLUMNS.items() if filters.wants(name)
+        ]
+        options = [load_only(requests.id, *columns)]
+        if filters.wants("description_preview"):
+            options.append(with_expression(
+                requests.description_preview,
+                func.left(requests.description, DESCRIPTION_PREVIEW_LENGTH),
+            ))
+        return options
+
+    @staticmethod
+    def to_request_info(
+        request: Request,
+        request_types: Optional[List[RequestTypeInfo]] = None,
+        cls: Type[R] = RequestInfo,
+        sparse: Optional[SparseFieldsParams] = None,
+        **extra,
+    ) -> R:
+        # Names come from the catalog unless the caller already has them.
+        # Subclasses are built directly from `extra`, not copied from a
+        # RequestInfo, since the DTOs are slotted.
+        if sparse is not None and sparse.is_sparse:
+            # Unwanted fields are not loaded, so they are not read either;
+            # they are left None and excluded when serializing.
+            if not sparse.wants("request_types"):
+                request_types = None
+            elif request_types is None:
+                request_types = request_type_catalog.infos(request.request_type_ids)
+            if sparse.wants("description_preview"):
+                extra.setdefault("description_preview", request.description_preview)
+            return cls(
+                id=request.id,
+                request_types=request_types,
+                **{
+                    name: get(request) if sparse.wants(name) else None
+                    for name, get in _FIELD_GETTERS.items()
+                },
+                **extra,
+            )
+
+        if request_types is None:
+            request_types = request_type_catalog.infos(request.request_type_ids)
+        return cls(
             id=request.id,
             name=request.name,
             description=request.description,
@@ -323,13 +968,27 @@ class RequestService(RequestServiceInterface):
             latitude=float(request.latitude),
             created_at=request.created_at,
             application_count=request.application_count,
-            request_types=[
-                RequestTypeInfo(id=rt.id, name=rt.name) 
-                for rt in request.request_types
-            ]
+            request_types=request_types,
+            **extra,
+        )
+
+    @staticmethod
+    def to_map_point(
+        request: Request, request_types: Optional[List[RequestTypeInfo]] = None
+    ) -> MapPoint:
+        if request_types is None:
+            request_types = request_type_catalog.infos(request.request_type_ids)
+        return MapPoint(
+            id=request.id,
+            name=request.name,
+            reward=request.reward,
+            latitude=float(request.latitude),
+            longitude=float(request.longitude),
+            request_types=request_types,
         )
 
-    def _to_application_info(self, application: Application) -> ApplicationInfo:
+    @staticmethod
+    def to_application_info(application: Application) -> ApplicationInfo:
         return ApplicationInfo(
             id=application.id,
             status=application.status.value,
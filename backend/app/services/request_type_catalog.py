@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..interfaces.common_service import RequestTypeInfo
+from ..models import RequestType
+from .category_cache import category_set_version
+
+# Postgres channel notified by the request_type table's trigger.
+REQUEST_TYPE_CHANNEL = "request_type_changed"
+# Safety net for missed notifications, e.g. when no listener is running.
+CATALOG_MAX_AGE = float(os.getenv("REQUEST_TYPE_CATALOG_MAX_AGE", "300"))
+
+
+class RequestTypeCatalog:
+    """
+    Process-wide copy of the request_type table. It is loaded once and
+    reloaded on the next access after `invalidate()` (called for
+    request_type_changed notifications) or after `max_age` seconds.
+    `version` identifies the current contents, e.g. for ETags and caches.
+    """
+
+    def __init__(self, max_age: float = CATALOG_MAX_AGE):
+        self.max_age = max_age
+        self.version: Optional[str] = None
+        self._by_id: Dict[int, RequestTypeInfo] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or self.max_age <= time.monotonic() - self._loaded_at
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                rows = await session.execute(select(RequestType.id, RequestType.name))
+                self.replace(RequestTypeInfo(id=id, name=name) for id, name in rows)
+
+    def replace(self, request_types: Iterable[RequestTypeInfo]) -> None:
+        self._by_id = {rt["id"]: rt for rt in sorted(request_types, key=lambda rt: rt["id"])}
+        self.version = category_set_version(list(self._by_id.values()))
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        self._loaded_at = None
+
+    def all(self) -> List[RequestTypeInfo]:
+        return [rt.copy() for rt in self._by_id.values()]
+
+    def valid_ids(self, request_type_ids: Iterable[int]) -> List[int]:
+        return [i for i in dict.fromkeys(request_type_ids) if i in self._by_id]
+
+    def infos(self, request_type_ids: Optional[Iterable[int]]) -> List[RequestTypeInfo]:
+        return [
+            self._by_id[i].copy()
+            for i in request_type_ids or []
+            if i in self._by_id
+        ]
+
+
+request_type_catalog = RequestTypeCatalog()
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .map_grid import MAX_TILE_ZOOM, tile_position
+
+# Postgres channel notified by the request table's trigger, with the
+# request's old and new coordinates.
+REQUEST_CHANNEL = "request_changed"
+
+Tile = Tuple[int, int, int]
+
+
+class TileCache:
+    """
+    Generated vector tiles by (z, x, y) and filter variant. A change to a
+    request drops every cached tile containing its old or new location, at
+    all zoom levels; `ttl` is the safety net for missed notifications.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[Tile, Hashable], Tuple[float, bytes]]" = OrderedDict()
+        self._variants: Dict[Tile, Set[Hashable]] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @classmethod
+    def from_env(cls) -> "TileCache":
+        return cls(
+            max_entries=int(os.getenv("TILE_CACHE_SIZE", "4096")),
+            ttl=float(os.getenv("TILE_CACHE_TTL", "300")),
+        )
+
+    def get(self, tile: Tile, variant: Hashable) -> Optional[bytes]:
+        entry = self._entries.get((tile, variant))
+        if entry is None or self.ttl <= self.clock() - entry[0]:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end((tile, variant))
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, tile: Tile, variant: Hashable, body: bytes) -> None:
+        self._entries[tile, variant] = (self.clock(), body)
+        self._entries.move_to_end((tile, variant))
+        self._variants.setdefault(tile, set()).add(variant)
+        while self.max_entries < len(self._entries):
+            (old_tile, old_variant), _ = self._entries.popitem(last=False)
+            self._discard_variant(old_tile, old_variant)
+
+    def invalidate_location(self, latitude: float, longitude: float) -> None:
+        for z in range(MAX_TILE_ZOOM + 1):
+            x, y = tile_position(latitude, longitude, z)
+            tile = (z, int(x), int(y))
+            for variant in self._variants.pop(tile, ()):
+                self._entries.pop((tile, variant), None)
+                self.stats["invalidations"] += 1
+
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        # Listener callback. No payload means notifications may have been
+        # missed (e.g. on reconnect), so everything goes.
+        try:
+            locations = json.loads(payload)["locations"] if payload else None
+        except (ValueError, KeyError, TypeError):
+            locations = None
+        if locations is None:
+            self.clear()
+            return
+        for latitude, longitude in locations:
+            self.invalidate_location(float(latitude), float(longitude))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._variants.clear()
+
+    def _discard_variant(self, tile: Tile, variant: Hashable) -> None:
+        variants = self._variants.get(tile)
+        if variants is not None:
+            variants.discard(variant)
+            if not variants:
+                del self._variants[tile]
+
+
+tile_cache = TileCache.from_env()
@@ -0,0 +1,92 @@
+"""
+Upstream calls and tail latency of AI category suggestions under concurrency.
+
+    python -m scripts.bench_ai_batching --callers 200 --distinct 60
+
+Runs the callers against the local fake upstream (scripts.fake_openai) in
+three modes:
+- "direct": one single-description prompt per caller, as before batching;
+- "single-flight": identical descriptions share a call, no batching;
+- "batched": single-flight plus micro-batching.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.ai_batcher import CategoryBatcher
+from app.services.ai_client import AIClient
+
+from . import fake_openai
+from .fake_openai import Behaviour, Stats
+
+CATEGORIES = ["Shopping", "Dog Walking", "Cleaning", "Gardening", "Tutoring", "Pet Sitting", "Home Repair"]
+VERBS = ["walk", "clean", "fix", "water", "tutor", "feed", "paint", "carry"]
+OBJECTS = ["my dog", "the kitchen", "a faucet", "the garden", "math homework", "my cat", "a fence", "shopping bags"]
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_mode(mode: str, base_url: str, descriptions, args):
+    fake_openai.behaviour = Behaviour(latency=args.latency, item_latency=args.item_latency)
+    fake_openai.stats = Stats()
+    client = AIClient("fake", base_url, timeout=60, max_concurrency=args.concurrency)
+    batcher = CategoryBatcher(
+        client,
+        max_batch=args.batch_size if mode == "batched" else 1,
+        max_wait=args.batch_wait_ms / 1000 if mode == "batched" else 0,
+    )
+    prompt = "Please choose the most relevant categories from the following list:\n{}\n\n{}"
+
+    async def caller(description):
+        started = time.perf_counter()
+        if mode == "direct":
+            await client.complete(prompt.format(", ".join(CATEGORIES), description))
+        else:
+            await batcher.classify("bench", CATEGORIES, description)
+        return 1000 * (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(caller(d) for d in descriptions)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+
+    print(
+        f"{mode:<14} upstream calls {fake_openai.stats.calls:4d}  "
+        f"p50 {percentile(latencies, 0.5):7.0f} ms  "
+        f"p95 {percentile(latencies, 0.95):7.0f} ms  "
+        f"p99 {percentile(latencies, 0.99):7.0f} ms  "
+        f"wall {elapsed:5.2f} s"
+    )
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    pool = [f"Please {verb} {obj} (#{i})" for i, (verb, obj) in enumerate(
+        (rng.choice(VERBS), rng.choice(OBJECTS)) for _ in range(args.distinct)
+    )]
+    descriptions = [rng.choice(pool) for _ in range(args.callers)]
+
+    print(
+        f"{args.callers} concurrent callers, {len(set(descriptions))} distinct descriptions, "
+        f"upstream {args.latency * 1000:.0f} ms + {args.item_latency * 1000:.0f} ms/item, "
+        f"{args.concurrency} connections\n"
+    )
+    async with fake_openai.running() as base_url:
+        for mode in ("direct", "single-flight", "batched"):
+            await run_mode(mode, base_url, descriptions, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake upstream latency per call (s)")
+    parser.add_argument("--item-latency", type=float, default=0.01, help="Extra fake latency per batched item (s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="AI client concurrency cap")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batch-wait-ms", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,194 @@
+"""
+Feed latency with and without archiving old completed requests.
+
+    python -m scripts.bench_archive seed --completed 10000000 --open 20000
+    python -m scripts.bench_archive measure --iterations 50
+    python -m scripts.bench_archive archive
+    python -m scripts.bench_archive measure --iterations 50
+
+"seed" writes two bench users, `--completed` requests completed a year ago
+(one accepted, rated application each) and `--open` open requests around
+Budapest, with generate_series. Triggers are disabled while seeding (the
+request trigger would notify once per row), which needs a superuser, as in
+the docker-compose database.
+
+"measure" times the volunteer's open feed near Budapest, the help-seeker's
+COMPLETED and ALL "my requests" pages, a request detail and a rating
+refresh, through the services. Run it before and after "archive", which
+moves every request completed more than ARCHIVE_AFTER_DAYS days ago with
+RequestArchiver; ANALYZE runs after seeding and archiving.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import select, text
+
+from app.db import async_session, check_schema, engine
+from app.interfaces.request_service import MyRequestsFilter, RequestsFilter
+from app.models import User
+from app.services.archive import RequestArchiver
+from app.services.auth_service import AuthService
+from app.services.outbox import refresh_rating
+from app.services.request_service import RequestService
+
+HELP_SEEKER_EMAIL = "bench-archive-seeker@example.com"
+VOLUNTEER_EMAIL = "bench-archive-volunteer@example.com"
+
+_SEED_REQUESTS = text("""
+INSERT INTO request (
+    name, description, reward, application_count, status, start, "end",
+    address, longitude, latitude, location, creator_id, created_at, updated_at
+)
+SELECT
+    'Bench request ' || i, 'Benchmark request number ' || i, 10 + i % 90, :application_count,
+    CAST(:status AS requeststatus),
+    now() - CAST(:age AS interval) + (i % 48) * interval '1 hour',
+    now() - CAST(:age AS interval) + (i % 48 + 2) * interval '1 hour',
+    'Budapest', 19.04 + (i % 1000) / 10000.0, 47.49 + (i / 1000 % 1000) / 10000.0,
+    ST_Point(47.49 + (i / 1000 % 1000) / 10000.0, 19.04 + (i % 1000) / 10000.0),
+    :creator_id, now() - CAST(:age AS interval), now() - CAST(:age AS interval)
+FROM generate_series(1, :count) AS i
+""")
+
+_SEED_APPLICATIONS = text("""
+INSERT INTO application (request_id, user_id, status, applied_at, volunteer_rating, help_seeker_rating)
+SELECT id, :volunteer_id, 'ACCEPTED', created_at, 1 + id % 5, 1 + id % 3
+FROM request
+WHERE creator_id = :creator_id AND status = 'COMPLETED'
+""")
+
+
+async def _user(session, email: str, is_volunteer: bool) -> int:
+    user = (await session.execute(select(User).filter(User.email == email))).scalar_one_or_none()
+    if user is None:
+        user = User(
+            first_name="Bench", last_name="Archive", email=email, password="-",
+            date_of_birth=date(1990, 1, 1), about_me="", is_volunteer=is_volunteer,
+        )
+        session.add(user)
+        await session.flush()
+    return user.id
+
+
+async def seed(completed: int, open_count: int) -> None:
+    async with async_session() as session, session.begin():
+        creator_id = await _user(session, HELP_SEEKER_EMAIL, is_volunteer=False)
+        volunteer_id = await _user(session, VOLUNTEER_EMAIL, is_volunteer=True)
+        await session.execute(text("SET LOCAL session_replication_role = replica"))
+        started = time.perf_counter()
+        for status, count, age, application_count in (
+            ("COMPLETED", completed, "365 days", 1),
+            ("OPEN", open_count, "-1 day", 0),
+        ):
+            await session.execute(
+                _SEED_REQUESTS,
+                {
+                    "status": status, "count": count, "age": age,
+                    "application_count": application_count, "creator_id": creator_id,
+                },
+            )
+        await session.execute(
+            _SEED_APPLICATIONS, {"creator_id": creator_id, "volunteer_id": volunteer_id}
+        )
+        print(f"seeded {completed} completed and {open_count} open requests "
+              f"in {time.perf_counter() - started:.1f} s")
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+async def archive() -> None:
+    started = time.perf_counter()
+    total = await RequestArchiver.from_env(async_session).archive()
+    print(f"archived {total} requests in {time.perf_counter() - started:.1f} s")
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+async def measure(iterations: int) -> None:
+    async with async_session() as session:
+        users = dict(
+            (await session.execute(
+                select(User.email, User.id).filter(
+                    User.email.in_([HELP_SEEKER_EMAIL, VOLUNTEER_EMAIL])
+                )
+            )).all()
+        )
+    seeker = {"id": users[HELP_SEEKER_EMAIL], "email": HELP_SEEKER_EMAIL, "is_volunteer": False}
+    volunteer = {"id": users[VOLUNTEER_EMAIL], "email": VOLUNTEER_EMAIL, "is_volunteer": True}
+    async with async_session() as session:
+        oldest_id = (
+            await session.execute(text(
+                "SELECT min(id) FROM (SELECT id FROM request UNION ALL "
+                "SELECT id FROM request_archive) AS ids"
+            ))
+        ).scalar_one()
+
+    async def open_feed(service):
+        await service.get_requests(
+            volunteer, RequestsFilter(location_lat=47.5, location_lng=19.05, radius=5)
+        )
+
+    async def my_completed(service):
+        await service.get_my_requests(seeker, MyRequestsFilter(status="COMPLETED"))
+
+    async def my_all(service):
+        await service.get_my_requests(seeker, MyRequestsFilter(status="ALL"))
+
+    async def oldest_detail(service):
+        await service.get_request_for_help_seeker(seeker, oldest_id)
+
+    async def rating(service):
+        await refresh_rating(service.session, {"role": "volunteer", "user_id": volunteer["id"]})
+        await service.session.rollback()
+
+    for name, operation in (
+        ("open feed", open_feed),
+        ("my completed", my_completed),
+        ("my all", my_all),
+        ("oldest detail", oldest_detail),
+        ("rating refresh", rating),
+    ):
+        timings = []
+        for _ in range(iterations):
+            async with async_session() as session:
+                service = RequestService(session, AuthService(session))
+                started = time.perf_counter()
+                await operation(service)
+                timings.append(1000 * (time.perf_counter() - started))
+        ordered = sorted(timings)
+        print(
+            f"{name:<16} mean {statistics.mean(ordered):8.2f} ms  "
+            f"p50 {ordered[len(ordered) // 2]:8.2f} ms  "
+            f"p95 {ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]:8.2f} ms"
+        )
+
+
+async def main(args) -> None:
+    if not await check_schema():
+        raise RuntimeError("Schema fingerprint mismatch, run `python -m scripts.migrate` first")
+    try:
+        if args.command == "seed":
+            await seed(args.completed, args.open)
+        elif args.command == "archive":
+            await archive()
+        else:
+            await measure(args.iterations)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed_parser = commands.add_parser("seed")
+    seed_parser.add_argument("--completed", type=int, default=10_000_000)
+    seed_parser.add_argument("--open", type=int, default=20_000)
+    commands.add_parser("archive")
+    measure_parser = commands.add_parser("measure")
+    measure_parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
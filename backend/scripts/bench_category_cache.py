@@ -0,0 +1,91 @@
+"""
+Category suggestion cache benchmark.
+
+    python -m scripts.bench_category_cache --entries 1000 --lookups 5000
+
+Fills the cache with generated descriptions, then times exact repeats,
+near-duplicate rewordings and unseen descriptions, and prints the cache's
+hit/miss counters. Exact repeats must stay under 1ms.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from app.services.category_cache import CategoryCache
+
+CATEGORIES = [
+    {"id": 1, "name": "Shopping"},
+    {"id": 2, "name": "Cleaning"},
+    {"id": 3, "name": "Tutoring"},
+    {"id": 4, "name": "Pet Care"},
+    {"id": 5, "name": "Transport"},
+    {"id": 6, "name": "Gardening"},
+    {"id": 7, "name": "Repairs"},
+]
+VERBS = ["walk", "feed", "clean", "fix", "water", "carry", "pick up", "teach", "paint", "move"]
+OBJECTS = ["my dog", "the garden", "groceries", "a bike", "the kitchen", "math homework",
+           "a sofa", "the fence", "some plants", "my cat"]
+WHEN = ["today", "this afternoon", "on saturday", "next week", "tomorrow morning", "tonight"]
+EXTRA = ["please", "thanks!", "urgent", "if possible", "asap"]
+UNRELATED = ["quantum", "violin", "passport", "spreadsheet", "ceramics", "marathon",
+             "translation", "wedding", "chess", "roofing", "invoice", "telescope"]
+
+
+def describe(rng: random.Random, i: int) -> str:
+    return f"Need someone to {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(WHEN)} (#{i})"
+
+
+def timed(lookup, descriptions):
+    timings, results = [], []
+    for description in descriptions:
+        started = time.perf_counter()
+        results.append(lookup(description))
+        timings.append(1e6 * (time.perf_counter() - started))
+    timings.sort()
+    return timings, results
+
+
+def report(name, timings, results):
+    hits = sum(result is not None for result in results)
+    print(
+        f"{name:<16} hit rate {hits / len(results):6.1%}  "
+        f"p50 {timings[len(timings) // 2]:8.1f} us  "
+        f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:8.1f} us  "
+        f"mean {statistics.mean(timings):8.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate threshold, 0 disables")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    cache = CategoryCache(max_entries=args.entries, near_duplicate_threshold=args.threshold or None)
+    version = "bench"
+    descriptions = [describe(rng, i) for i in range(args.entries)]
+    for description in descriptions:
+        cache.put(version, description, rng.sample(CATEGORIES, 2))
+
+    repeats = [rng.choice(descriptions) for _ in range(args.lookups)]
+    exact = timed(lambda d: cache.get(version, d), [d.upper() + "  " for d in repeats])
+    near = timed(lambda d: cache.get(version, d), [f"{d} {rng.choice(EXTRA)}" for d in repeats])
+    unseen = timed(lambda d: cache.get(version, d), [" ".join(rng.sample(UNRELATED, 5)) for _ in range(args.lookups)])
+
+    report("exact repeat", *exact)
+    report("near duplicate", *near)
+    report("unseen", *unseen)
+    print(f"\nentries {len(cache)}  stats {cache.stats}")
+
+    p99 = exact[0][min(len(exact[0]) - 1, int(len(exact[0]) * 0.99))]
+    if 1000 <= p99:
+        print("exact repeats are over the 1ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+CPU cost of building and serializing response pages.
+
+    python -m scripts.bench_serialization --requests 80 --iterations 300
+
+Runs against the in-memory backend, so only the HTTP layer, the service's
+DTO construction and JSON encoding are measured. Reports process CPU time
+per request for:
+- "feed": GET /volunteer/requests?limit=40 (the 40-item volunteer feed);
+- "map": the same page with `fields=latitude,longitude,description_preview`;
+- "mine": GET /help-seeker/requests?limit=40;
+- "detail": GET /help-seeker/requests/{id} with a few applications;
+- "encode": only the encoding of a 40-item feed page, FastAPI's
+  response_model path (validate, then dump) next to `app.serialization`.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ["SERVICE_BACKEND"] = "memory"
+os.environ.setdefault("JWT_SECRET", "bench-serialization-secret-0123456789")
+
+import httpx  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+from app.dependencies import get_auth_service, get_request_service  # noqa: E402
+from app.interfaces.request_service import RequestsFilter  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers import volunteer  # noqa: E402
+
+API = "http://bench/api/v1"
+
+
+async def register(client: httpx.AsyncClient, email: str, is_volunteer: bool) -> dict:
+    response = await client.post("/auth/register", json={
+        "first_name": "Bench",
+        "last_name": "User",
+        "email": email,
+        "password": "password123",
+        "date_of_birth": "1990-01-01",
+        "about_me": "Benchmarking the serialization path.",
+        "is_volunteer": is_volunteer,
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def seed(client: httpx.AsyncClient, count: int, volunteers: int):
+    seeker = await register(client, "seeker@example.com", False)
+    types = (await client.get("/common/request-types", headers=seeker)).json()["data"]
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    request_ids = []
+    for i in range(count):
+        response = await client.post("/help-seeker/requests/", headers=seeker, json={
+            "name": f"Bench request {i}",
+            "description": f"Please help with bench request number {i}, it is a long one.",
+            "longitude": 19.04 + i / 1000,
+            "latitude": 47.49 + i / 1000,
+            "address": f"Bench street {i}",
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=2)).isoformat(),
+            "reward": i % 50,
+            "request_type_ids": [t["id"] for t in types[i % len(types):][:2]],
+        })
+        response.raise_for_status()
+        request_ids.append(response.json()["data"]["id"])
+
+    volunteer = None
+    for v in range(volunteers):
+        volunteer = await register(client, f"volunteer{v}@example.com", True)
+        for request_id in request_ids[v::3]:
+            await client.post(f"/volunteer/requests/{request_id}/application", headers=volunteer)
+    return seeker, volunteer, request_ids[0]
+
+
+async def measure(client: httpx.AsyncClient, url: str, headers: dict, iterations: int):
+    # Warm up schema caches before timing.
+    for _ in range(5):
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+    started = time.process_time()
+    for _ in range(iterations):
+        await client.get(url, headers=headers)
+    return 1e6 * (time.process_time() - started) / iterations, len(response.content)
+
+
+def feed_route() -> APIRoute:
+    return next(r for r in volunteer.router.routes if r.path == "/volunteer/requests/")
+
+
+async def measure_encoding(page, iterations: int):
+    from app.serialization import json_response
+
+    route = feed_route()
+    results = {}
+
+    started = time.process_time()
+    for _ in range(iterations):
+        await serialize_response(field=route.response_field, response_content=page, dump_json=True)
+    results["response_model"] = 1e6 * (time.process_time() - started) / iterations
+
+    started = time.process_time()
+    for _ in range(iterations):
+        json_response(route.response_model, page)
+    results["serialization"] = 1e6 * (time.process_time() - started) / iterations
+    return results
+
+
+async def main(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=API) as client:
+        seeker, volunteer, detail_id = await seed(client, args.requests, args.volunteers)
+        runs = {
+            "feed": ("/volunteer/requests/?limit=40&status=ALL", volunteer),
+            "map": (
+                "/volunteer/requests/?limit=40&status=ALL"
+                "&fields=latitude,longitude,description_preview",
+                volunteer,
+            ),
+            "mine": ("/help-seeker/requests/?limit=40", seeker),
+            "detail": (f"/help-seeker/requests/{detail_id}", seeker),
+        }
+        print(f"{args.requests} requests, {args.iterations} iterations, CPU per request\n")
+        for name, (url, headers) in runs.items():
+            micros, size = await measure(client, url, headers, args.iterations)
+            print(f"{name:<8} {micros:8.0f} µs  {size:6d} bytes")
+
+        # The feed page as the service returns it, before any encoding.
+        auth_service = get_auth_service()
+        service = get_request_service(auth_service)
+        user = auth_service.authenticate(volunteer["Authorization"].removeprefix("Bearer "))
+        page = await service.get_requests(user, RequestsFilter(limit=40, status="ALL"))
+        for name, micros in (await measure_encoding(page, args.iterations * 10)).items():
+            print(f"encode   {micros:8.0f} µs  ({name})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=80)
+    parser.add_argument("--volunteers", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=300)
+    asyncio.run(main(parser.parse_args()))
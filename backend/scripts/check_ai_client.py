@@ -0,0 +1,109 @@
+"""
+Checks the shared AI client against the local fake upstream.
+
+    python -m scripts.check_ai_client
+
+Starts scripts.fake_openai on a free port in-process and verifies connection
+reuse, the concurrency cap, the per-call deadline and the circuit breaker,
+then that the category batcher copes with malformed answers.
+"""
+import asyncio
+import time
+
+from app.interfaces.exceptions import AIServiceUnavailableError
+from app.services.ai_batcher import CategoryBatcher
+from app.services.ai_client import AIClient, CircuitBreaker
+
+from . import fake_openai
+from .fake_openai import Behaviour, Stats
+
+PROMPT = "Please choose the most relevant categories from the following list:\nDog Walking, Shopping\n"
+
+
+def reset(**behaviour):
+    fake_openai.behaviour = Behaviour(**behaviour)
+    fake_openai.stats = Stats()
+
+
+async def expect_unavailable(call, within: float):
+    started = time.perf_counter()
+    try:
+        await call
+    except AIServiceUnavailableError:
+        elapsed = time.perf_counter() - started
+        assert elapsed < within, f"took {elapsed:.2f}s, expected under {within}s"
+        return
+    raise AssertionError("expected AIServiceUnavailableError")
+
+
+async def check(base_url: str):
+    client = AIClient("fake", base_url, timeout=0.5, max_concurrency=2,
+                      breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.5))
+
+    reset()
+    for _ in range(10):
+        assert await client.complete(PROMPT) == "Dog Walking"
+    assert len(fake_openai.stats.client_ports) == 1, "connections were not reused"
+    print("keep-alive: 10 sequential calls over 1 connection")
+
+    reset(latency=0.1)
+    await asyncio.gather(*(client.complete(PROMPT) for _ in range(6)))
+    assert fake_openai.stats.max_in_flight == 2, fake_openai.stats.max_in_flight
+    print("concurrency: 6 parallel calls, at most 2 in flight")
+
+    reset(latency=2.0)
+    await expect_unavailable(client.complete(PROMPT), within=0.8)
+    assert client.breaker.failures == 1
+    print("deadline: slow upstream cut off at the 0.5s timeout")
+
+    # The timeout above already counts as the first of three failures.
+    reset(fail_rate=1.0)
+    await expect_unavailable(client.complete(PROMPT), within=0.5)
+    assert client.breaker.state == "closed"
+    await expect_unavailable(client.complete(PROMPT), within=0.5)
+    assert client.breaker.state == "open"
+    calls = fake_openai.stats.calls
+    await expect_unavailable(client.complete(PROMPT), within=0.01)
+    assert fake_openai.stats.calls == calls, "open breaker still called the upstream"
+    print("breaker: opens after 3 failures and fails fast without calling upstream")
+
+    reset()
+    await asyncio.sleep(0.5)
+    assert client.breaker.state == "half_open"
+    assert await client.complete(PROMPT) == "Dog Walking"
+    assert client.breaker.state == "closed"
+    print("breaker: closes again after a successful trial call")
+
+    await client.close()
+
+
+async def check_batcher(base_url: str):
+    client = AIClient("fake", base_url, timeout=0.5, max_concurrency=2)
+    batcher = CategoryBatcher(client, max_batch=3, max_wait=0.05)
+    categories = ["Dog Walking", "Shopping"]
+
+    # Entries that are null or a number mean no categories, not a crash.
+    reset(answer='{"1": null, "2": 3, "3": ["Shopping"]}')
+    results = await asyncio.gather(*(
+        batcher.classify("check", categories, description)
+        for description in ("first", "second", "third")
+    ))
+    assert results == [[], [], ["shopping"]], results
+    print("batcher: null and non-list entries count as no categories")
+
+    reset(answer="no JSON here")
+    await expect_unavailable(batcher.classify("check", categories, "fourth"), within=0.5)
+    print("batcher: an answer without a JSON object is AIServiceUnavailableError")
+
+    await client.close()
+
+
+async def main():
+    async with fake_openai.running() as base_url:
+        await check(base_url)
+        await check_batcher(base_url)
+    print("AI client checks passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
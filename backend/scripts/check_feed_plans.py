@@ -0,0 +1,103 @@
+"""
+Checks that the volunteer feed's per-user filters are planned as index
+scans, not scans of the whole request table.
+
+    python -m scripts.check_feed_plans   # needs DB_URL and a migrated schema
+
+EXPLAINs the query behind GET /volunteer/requests/ for ALL, APPLIED and
+OPEN with `available` (matched against the volunteer's windows), both the
+page and the count pagination runs, as the first volunteer in the
+database, with sequential scans disabled for the transaction. The planner
+still picks a sequential scan when no index can serve a table, or walks a
+whole index instead (e.g. the primary key, for its order); any Seq Scan, or
+index or bitmap index scan without an Index Cond, left on `request`,
+`application` or `availability` means the query reads the whole table,
+whatever the table sizes here.
+"""
+import asyncio
+import json
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db import async_session, check_schema, engine
+from app.interfaces.request_service import RequestsFilter
+from app.models import User
+from app.services import AuthService, RequestService
+
+# Tables whose full scans grow with the whole history.
+LARGE_TABLES = {"request", "application", "availability"}
+
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def plan_nodes(node: dict, relation: Optional[str] = None) -> Iterator[Tuple[dict, Optional[str]]]:
+    # With the table each node reads; a Bitmap Index Scan names only its
+    # index, and belongs to the Bitmap Heap Scan above it.
+    relation = node.get("Relation Name", relation)
+    yield node, relation
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child, relation)
+
+
+def full_scans(plan: dict) -> List[str]:
+    scans = set()
+    for node, relation in plan_nodes(plan):
+        if relation not in LARGE_TABLES:
+            continue
+        if node["Node Type"] == "Seq Scan":
+            scans.add(f"{relation} (Seq Scan)")
+        elif node["Node Type"] in INDEX_SCANS and "Index Cond" not in node:
+            scans.add(f"{relation} ({node['Node Type']} on {node['Index Name']} without Index Cond)")
+    return sorted(scans)
+
+
+async def explain(session, query) -> dict:
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def check() -> bool:
+    if not await check_schema():
+        raise RuntimeError("Schema fingerprint mismatch, run `python -m scripts.migrate` first")
+
+    ok = True
+    async with async_session() as session, session.begin():
+        volunteer_id = (
+            await session.execute(select(User.id).filter(User.is_volunteer).limit(1))
+        ).scalar_one_or_none()
+        if volunteer_id is None:
+            raise RuntimeError("No volunteer to plan for, run `python -m scripts.insert_data` first")
+        user = {"id": volunteer_id, "email": "", "is_volunteer": True}
+        service = RequestService(session, AuthService(session))
+
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        for label, filters in (
+            ("ALL", RequestsFilter(status="ALL")),
+            ("APPLIED", RequestsFilter(status="APPLIED")),
+            ("AVAILABLE", RequestsFilter(status="OPEN", available=True)),
+        ):
+            query = service.requests_query(user, filters)
+            # The same two statements as Pagination.paginate.
+            for part, statement in (
+                ("page", query.offset((filters.page - 1) * filters.limit).limit(filters.limit)),
+                ("count", select(func.count()).select_from(query.subquery())),
+            ):
+                plan = await explain(session, statement)
+                scanned = full_scans(plan)
+                if scanned:
+                    ok = False
+                    print(f"{label:<9} {part:<5} scans {', '.join(scanned)}", file=sys.stderr)
+                else:
+                    print(f"{label:<9} {part:<5} index-driven (cost {plan['Total Cost']:.1f})")
+    await engine.dispose()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
@@ -0,0 +1,396 @@
+"""
+Service contract checks shared by the SQL and in-memory backends.
+
+    python -m scripts.check_service_contract --backend memory
+    python -m scripts.check_service_contract --backend sql   # needs DB_URL
+
+Both backends must pass the same checks so the in-memory one stays a
+faithful stand-in for HTTP-layer benchmarking.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, NamedTuple
+
+from app.interfaces import (
+    AIServiceInterface,
+    ApplicationServiceInterface,
+    AuthServiceInterface,
+    CommonServiceInterface,
+    RequestServiceInterface,
+)
+from app.interfaces.application_service import RateSeekerData, RateVolunteerData
+from app.interfaces.auth_service import LoginData, RegistrationData
+from app.interfaces.common_service import (
+    AvailabilityData,
+    LeaderboardFilter,
+    UpdateProfileData,
+    UserStatsInfo,
+)
+from app.interfaces.exceptions import (
+    ApplicationAlreadyExists,
+    ApplicationCannotBeRated,
+    AvailabilityNotFoundError,
+    AvailabilityOverlapError,
+    InvalidEmailOrPasswordError,
+    NoApplicationFoundError,
+    NotAuthorizedError,
+    RequestCannotBeUpdatedError,
+    RequestNotFoundError,
+    RequestNotOpen,
+    ServiceException,
+    TileNotFoundError,
+    UserAlreadyExistsError,
+)
+from app.interfaces.request_service import (
+    ApplicationsFilter,
+    CreateOrUpdateRequestData,
+    MapViewport,
+    MyApplicationsFilter,
+    MyRequestsFilter,
+    RecommendationsFilter,
+    RequestsFilter,
+    TileFilter,
+)
+from app.services.map_grid import tile_position
+
+
+class Services(NamedTuple):
+    auth: AuthServiceInterface
+    common: CommonServiceInterface
+    requests: RequestServiceInterface
+    applications: ApplicationServiceInterface
+    ai: AIServiceInterface
+
+
+def memory_backend():
+    from app.services.in_memory import (
+        InMemoryAIService,
+        InMemoryApplicationService,
+        InMemoryAuthService,
+        InMemoryCommonService,
+        InMemoryRequestService,
+        InMemoryStore,
+    )
+
+    store = InMemoryStore.with_default_request_types()
+
+    @asynccontextmanager
+    async def services() -> AsyncIterator[Services]:
+        auth = InMemoryAuthService(store)
+        yield Services(
+            auth,
+            InMemoryCommonService(store),
+            InMemoryRequestService(store, auth),
+            InMemoryApplicationService(store, auth),
+            InMemoryAIService(store, auth),
+        )
+
+    return services
+
+
+def sql_backend():
+    from app.db import async_session
+    from app.services import (
+        AIService,
+        ApplicationService,
+        AuthService,
+        CommonService,
+        RequestService,
+    )
+
+    # A fresh session per call, like one HTTP request in the app.
+    @asynccontextmanager
+    async def services() -> AsyncIterator[Services]:
+        async with async_session() as session:
+            auth = AuthService(session)
+            yield Services(
+                auth,
+                CommonService(session),
+                RequestService(session, auth),
+                ApplicationService(session, auth),
+                AIService(session, auth),
+            )
+
+    return services
+
+
+@asynccontextmanager
+async def expect(exception: type[ServiceException]):
+    try:
+        yield
+    except exception:
+        return
+    raise AssertionError(f"expected {exception.__name__}")
+
+
+def registration(name: str, suffix: str, is_volunteer: bool) -> RegistrationData:
+    return RegistrationData(
+        first_name="Contract",
+        last_name=name.title(),
+        email=f"contract-{suffix}-{name}@example.com",
+        password="contract-password",
+        date_of_birth=date(1990, 1, 1),
+        about_me="Created by the service contract checks.",
+        is_volunteer=is_volunteer,
+    )
+
+
+def request_data(type_ids, latitude, longitude, reward=500) -> CreateOrUpdateRequestData:
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    return CreateOrUpdateRequestData(
+        name="Contract request",
+        description="Request created by the service contract checks.",
+        longitude=longitude,
+        latitude=latitude,
+        address="1 Contract Street",
+        start=start,
+        end=start + timedelta(hours=2),
+        reward=reward,
+        request_type_ids=type_ids,
+    )
+
+
+async def check_contract(services):
+    suffix = uuid.uuid4().hex[:10]
+    # A random spot keeps location checks independent of rows left by earlier runs.
+    home = (random.uniform(-60, 60), random.uniform(-170, 170))
+    away = (home[0] + 1, home[1] + 1)
+
+    async with services() as s:
+        seeker = await s.auth.register(registration("seeker", suffix, False))
+    async with services() as s:
+        volunteer = await s.auth.register(registration("volunteer", suffix, True))
+    async with services() as s:
+        other = await s.auth.register(registration("other", suffix, True))
+    async with services() as s:
+        async with expect(UserAlreadyExistsError):
+            await s.auth.register(registration("seeker", suffix, False))
+    async with services() as s:
+        async with expect(InvalidEmailOrPasswordError):
+            await s.auth.login(LoginData(email=seeker.user.email, password="wrong-password"))
+    async with services() as s:
+        login = await s.auth.login(LoginData(email=seeker.user.email, password="contract-password"))
+        assert login.user.id == seeker.user.id
+    async with services() as s:
+        tokens = await s.auth.refresh(seeker.tokens.refresh_token)
+        assert s.auth.authenticate(tokens.access_token)["id"] == seeker.user.id
+
+    async with services() as s:
+        seeker_data = s.auth.authenticate(seeker.tokens.access_token)
+        volunteer_data = s.auth.authenticate(volunteer.tokens.access_token)
+        other_data = s.auth.authenticate(other.tokens.access_token)
+        type_ids = [rt["id"] for rt in await s.common.list_request_types()][:1]
+
+    async with services() as s:
+        async with expect(NotAuthorizedError):
+            await s.requests.create_request(volunteer_data, request_data(type_ids, *home))
+    async with services() as s:
+        created = await s.requests.create_request(seeker_data, request_data(type_ids, *home))
+        assert created.status == "OPEN" and created.application_count == 0
+        assert [rt["id"] for rt in created.request_types] == type_ids
+    async with services() as s:
+        disposable = await s.requests.create_request(seeker_data, request_data(type_ids, *away))
+
+    nearby = RequestsFilter(location_lat=home[0], location_lng=home[1], radius=5, limit=40)
+    far_away = RequestsFilter(location_lat=away[0], location_lng=away[1], radius=5, limit=40)
+    async with services() as s:
+        page = await s.requests.get_requests(volunteer_data, nearby)
+        found = {r.id: r for r in page.data}
+        assert created.id in found and disposable.id not in found
+        assert found[created.id].application_status == "NOT_APPLIED"
+    async with services() as s:
+        page = await s.requests.get_requests(volunteer_data, far_away)
+        assert created.id not in {r.id for r in page.data}
+
+    free = AvailabilityData(start=created.start - timedelta(hours=1), end=created.start + timedelta(hours=1))
+    async with services() as s:
+        window = await s.common.add_availability(volunteer_data, free)
+    async with services() as s:
+        async with expect(AvailabilityOverlapError):
+            await s.common.add_availability(volunteer_data, free.model_copy(update={"end": created.end}))
+        async with expect(NotAuthorizedError):
+            await s.common.add_availability(seeker_data, free)
+    async with services() as s:
+        assert [w["id"] for w in await s.common.list_availability(volunteer_data)] == [window["id"]]
+    async with services() as s:
+        available = nearby.model_copy(update={"available": True})
+        page = await s.requests.get_requests(volunteer_data, available)
+        assert created.id in {r.id for r in page.data}
+        page = await s.requests.get_requests(other_data, available)
+        assert created.id not in {r.id for r in page.data}
+    async with services() as s:
+        await s.common.delete_availability(volunteer_data, window["id"])
+    async with services() as s:
+        async with expect(AvailabilityNotFoundError):
+            await s.common.delete_availability(volunteer_data, window["id"])
+    async with services() as s:
+        sparse = nearby.model_copy(update={"fields": ["name", "description_preview"]})
+        page = await s.requests.get_requests(volunteer_data, sparse)
+        item = next(r for r in page.data if r.id == created.id)
+        assert item.name == created.name and item.description_preview == created.description
+        assert item.reward is None and item.request_types is None
+    async with services() as s:
+        around_home = dict(
+            min_lat=home[0] - 0.01, min_lng=home[1] - 0.01, max_lat=home[0] + 0.01, max_lng=home[1] + 0.01,
+        )
+        view = await s.requests.get_map(volunteer_data, MapViewport(**around_home, zoom=18))
+        assert created.id in {p.id for p in view.points} and not view.clusters
+        view = await s.requests.get_map(volunteer_data, MapViewport(**around_home, zoom=3))
+        assert not view.points and sum(c.count for c in view.clusters) >= 1
+        assert type_ids[0] in {rt.id for c in view.clusters for rt in c.request_types}
+    async with services() as s:
+        tile_x, tile_y = tile_position(*home, 14)
+        tile = await s.requests.get_tile(volunteer_data, 14, int(tile_x), int(tile_y), TileFilter())
+        assert b"requests" in tile
+        async with expect(TileNotFoundError):
+            await s.requests.get_tile(volunteer_data, 2, 4, 0, TileFilter())
+
+    async with services() as s:
+        await s.applications.create_application(volunteer_data, created.id)
+    async with services() as s:
+        async with expect(ApplicationAlreadyExists):
+            await s.applications.create_application(volunteer_data, created.id)
+    async with services() as s:
+        page = await s.requests.get_requests(volunteer_data, RequestsFilter(status="APPLIED", limit=40))
+        assert created.id in {r.id for r in page.data}
+    async with services() as s:
+        page = await s.requests.get_my_applications(volunteer_data, MyApplicationsFilter(status="PENDING"))
+        assert [(r.id, r.application_status) for r in page.data] == [(created.id, "PENDING")]
+        assert page.data[0].applied_at is not None and page.total == 1
+    async with services() as s:
+        # The SQL backend serves what the worker precomputed, so only what
+        # holds either way: applied-to requests are left out, best first.
+        page = await s.requests.get_recommendations(volunteer_data, RecommendationsFilter(limit=40))
+        assert created.id not in {r.id for r in page.data}
+        assert [r.score for r in page.data] == sorted((r.score for r in page.data), reverse=True)
+        async with expect(NotAuthorizedError):
+            await s.requests.get_recommendations(seeker_data, RecommendationsFilter())
+    async with services() as s:
+        async with expect(RequestCannotBeUpdatedError):
+            await s.requests.update_request(seeker_data, created.id, request_data(type_ids, *home))
+    async with services() as s:
+        await s.applications.delete_application(volunteer_data, created.id)
+    async with services() as s:
+        async with expect(NoApplicationFoundError):
+            await s.applications.delete_application(volunteer_data, created.id)
+    async with services() as s:
+        updated = await s.requests.update_request(seeker_data, created.id, request_data(type_ids, *home, reward=750))
+        assert updated.reward == 750
+
+    async with services() as s:
+        await s.applications.create_application(volunteer_data, created.id)
+    async with services() as s:
+        detail = await s.requests.get_request_for_help_seeker(seeker_data, created.id)
+        assert [a.volunteer.id for a in detail.applications] == [volunteer.user.id]
+        assert detail.applications[0].status == "PENDING" and not detail.has_rated_helper
+        assert (detail.application_counts.pending, detail.application_counts.accepted) == (1, 0)
+    async with services() as s:
+        await s.applications.create_application(other_data, created.id)
+    async with services() as s:
+        page = await s.requests.get_request_applications(
+            seeker_data, created.id, ApplicationsFilter(sort="applied_at", order="desc", limit=1)
+        )
+        assert [a.volunteer.id for a in page.data] == [other.user.id] and page.total == 2
+        async with expect(RequestNotFoundError):
+            await s.requests.get_request_applications(seeker_data, disposable.id + 10**6, ApplicationsFilter())
+    async with services() as s:
+        await s.applications.delete_application(other_data, created.id)
+    async with services() as s:
+        async with expect(ApplicationCannotBeRated):
+            await s.applications.rate_volunteer(seeker_data, created.id, RateVolunteerData(rating=5))
+    async with services() as s:
+        await s.applications.accept_application(seeker_data, created.id, volunteer.user.id)
+    async with services() as s:
+        async with expect(RequestNotOpen):
+            await s.applications.create_application(other_data, created.id)
+    async with services() as s:
+        await s.requests.complete_request(seeker_data, created.id)
+    async with services() as s:
+        await s.applications.rate_volunteer(seeker_data, created.id, RateVolunteerData(rating=5))
+    async with services() as s:
+        await s.applications.rate_seeker(volunteer_data, created.id, RateSeekerData(rating=4))
+
+    async with services() as s:
+        detail = await s.requests.get_request_for_volunteer(volunteer_data, created.id)
+        assert detail.status == "COMPLETED" and detail.application_status == "ACCEPTED"
+        assert detail.has_rated_seeker and detail.creator.avg_rating == 4
+    async with services() as s:
+        detail = await s.requests.get_request_for_help_seeker(seeker_data, created.id)
+        assert detail.has_rated_helper and detail.applications[0].volunteer.avg_rating == 5
+    async with services() as s:
+        volunteer_info = await s.common.get_user(volunteer.user.id)
+        # 75 XP for completing a 750 reward request plus 50 XP for a 5 star rating.
+        assert (volunteer_info.level, volunteer_info.experience) == (2, 25)
+        # The withdrawn application isn't counted.
+        assert volunteer_info.stats == UserStatsInfo(
+            requests_posted=0, requests_completed=1, applications_made=1,
+            applications_accepted=1, ratings_received=1, acceptance_rate=1.0,
+        )
+        seeker_stats = (await s.common.get_user(seeker.user.id)).stats
+        assert (seeker_stats.requests_posted, seeker_stats.requests_completed) == (2, 1)
+        assert seeker_stats.ratings_received == 1 and seeker_stats.acceptance_rate is None
+    async with services() as s:
+        board = await s.common.get_leaderboard(volunteer_data, LeaderboardFilter(limit=5))
+        standings = [(e.level, e.experience) for e in board.entries]
+        assert standings == sorted(standings, reverse=True) and board.entries[0].rank == 1
+        assert board.me.id == volunteer.user.id and 1 <= board.me.rank
+    async with services() as s:
+        # The volunteer's area is the one of the request they were accepted
+        # for; `other` has neither created nor been accepted for anything.
+        board = await s.common.get_leaderboard(volunteer_data, LeaderboardFilter(scope="area"))
+        assert {e.id for e in board.entries} == {seeker.user.id, volunteer.user.id}
+        assert board.entries[0].id == volunteer.user.id and board.me.rank == 1
+        board = await s.common.get_leaderboard(other_data, LeaderboardFilter(scope="area"))
+        assert board.entries == [] and board.me is None
+    async with services() as s:
+        page = await s.requests.get_my_requests(seeker_data, MyRequestsFilter(status="COMPLETED"))
+        assert [r.id for r in page.data] == [created.id] and page.total == 1
+    async with services() as s:
+        # ALL is open requests plus the ones applied to, not every request.
+        everything = nearby.model_copy(update={"status": "ALL"})
+        page = await s.requests.get_requests(volunteer_data, everything)
+        assert created.id in {r.id for r in page.data}
+        page = await s.requests.get_requests(other_data, everything)
+        assert created.id not in {r.id for r in page.data}
+
+    async with services() as s:
+        await s.requests.delete_request(seeker_data, disposable.id)
+    async with services() as s:
+        async with expect(RequestNotFoundError):
+            await s.requests.get_request_for_volunteer(volunteer_data, disposable.id)
+    async with services() as s:
+        assert (await s.common.get_user(seeker.user.id)).stats.requests_posted == 1
+    async with services() as s:
+        # Past its `end` but not swept yet: no longer open to applications.
+        past = datetime.now(timezone.utc) - timedelta(hours=3)
+        ended = await s.requests.create_request(seeker_data, request_data(type_ids, *away).model_copy(
+            update={"start": past, "end": past + timedelta(hours=2)}
+        ))
+    async with services() as s:
+        async with expect(RequestNotOpen):
+            await s.applications.create_application(other_data, ended.id)
+    async with services() as s:
+        await s.requests.delete_request(seeker_data, ended.id)
+    async with services() as s:
+        profile = await s.common.update_profile(seeker_data, UpdateProfileData(
+            first_name="Renamed", last_name="Seeker", date_of_birth=date(1991, 2, 3), about_me="Updated",
+        ))
+        assert profile.first_name == "Renamed"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["memory", "sql"], default="memory")
+    args = parser.parse_args()
+
+    services = memory_backend() if args.backend == "memory" else sql_backend()
+    asyncio.run(check_contract(services))
+    print(f"{args.backend} backend satisfies the service contract")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Offline accuracy-vs-latency evaluation of the local category classifier.
+
+    python -m scripts.evaluate_classifier                 # labelled requests in DB_URL
+    python -m scripts.evaluate_classifier --source seed   # the insert_data requests
+
+Runs k-fold cross validation over labelled requests and, for a sweep of
+confidence thresholds, reports how many descriptions the classifier would
+answer locally (the rest fall back to the LLM) and how accurate those local
+answers are. "top-1" counts the best category being one of the labels,
+"exact" the predicted set equalling the labels.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.category_classifier import CategoryClassifier
+
+THRESHOLDS = [0.0, 0.1, 0.2, 0.25, 0.3, 0.35, 0.4, 0.5, 0.6]
+
+
+async def load_from_db(limit: int):
+    from sqlalchemy import select
+
+    from app.db import async_session, engine
+    from app.models import RequestType
+    from app.services.ai_service import load_training_examples
+
+    async with async_session() as session:
+        categories = {
+            rt.id: rt.name
+            for rt in (await session.execute(select(RequestType))).scalars()
+        }
+        examples = await load_training_examples(session, limit)
+    await engine.dispose()
+    return categories, examples
+
+
+def load_seed():
+    from scripts.insert_data import request_types, requests
+
+    # insert_data adds the request types first, so they get ids 1..n in order.
+    categories = {i: rt.name for i, rt in enumerate(request_types, start=1)}
+    examples = [(f"{r['name']}. {r['description']}", r["request_type_ids"]) for r in requests]
+    return categories, examples
+
+
+def cross_validate(categories, examples, folds: int, seed: int):
+    shuffled = list(examples)
+    random.Random(seed).shuffle(shuffled)
+    folds = max(2, min(folds, len(shuffled)))
+
+    predictions, fit_ms, predict_us = [], [], []
+    for fold in range(folds):
+        test = shuffled[fold::folds]
+        train = [example for i, example in enumerate(shuffled) if i % folds != fold]
+
+        started = time.perf_counter()
+        classifier = CategoryClassifier.fit(categories, train)
+        fit_ms.append(1000 * (time.perf_counter() - started))
+
+        for text, labels in test:
+            started = time.perf_counter()
+            chosen, confidence = classifier.predict(text)
+            predict_us.append(1e6 * (time.perf_counter() - started))
+            predictions.append((chosen, confidence, set(labels)))
+    return predictions, fit_ms, sorted(predict_us)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=["db", "seed"], default="db")
+    parser.add_argument("--limit", type=int, default=5000, help="Latest labelled requests to load")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    categories, examples = (
+        asyncio.run(load_from_db(args.limit)) if args.source == "db" else load_seed()
+    )
+    if len(examples) < 2:
+        raise SystemExit("Need at least two labelled requests to evaluate")
+
+    predictions, fit_ms, predict_us = cross_validate(categories, examples, args.folds, args.seed)
+    print(f"{len(examples)} labelled requests, {len(categories)} categories, {args.folds}-fold")
+    print(
+        f"fit     mean {statistics.mean(fit_ms):8.2f} ms\n"
+        f"predict p50  {predict_us[len(predict_us) // 2]:8.1f} us  "
+        f"p99 {predict_us[min(len(predict_us) - 1, int(len(predict_us) * 0.99))]:8.1f} us\n"
+    )
+
+    print(f"{'threshold':>9}  {'local':>7}  {'top-1':>7}  {'exact':>7}  {'to LLM':>7}")
+    for threshold in THRESHOLDS:
+        answered = [p for p in predictions if threshold <= p[1] and p[0]]
+        top1 = sum(chosen[0] in labels for chosen, _, labels in answered)
+        exact = sum(set(chosen) == labels for chosen, _, labels in answered)
+        coverage = len(answered) / len(predictions)
+        print(
+            f"{threshold:>9.2f}  {coverage:>7.1%}  "
+            f"{top1 / len(answered) if answered else 0:>7.1%}  "
+            f"{exact / len(answered) if answered else 0:>7.1%}  "
+            f"{1 - coverage:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
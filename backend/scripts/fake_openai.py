@@ -0,0 +1,137 @@
+"""
+Local OpenAI-compatible chat completion server for exercising the AI client
+without the real upstream.
+
+    python -m scripts.fake_openai --port 8100 --latency 0.3 --fail-rate 0.1
+    GENAI_URL=http://localhost:8100/v1 GENAI_API_KEY=fake fastapi dev app/main.py
+
+Single-description prompts are answered with the first category listed in
+the prompt (or --answer). Batched prompts get a JSON object with, for each
+numbered description, the categories sharing a word with it (or the first
+category). Answers take --latency seconds plus --item-latency per batched
+description, and --fail-rate of the calls fail with a 500. `behaviour` and
+`stats` can be changed and read in-process, see `running`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Set
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+_CATEGORY_LIST = re.compile(r"following list:\s*\n\s*([^\n]+)")
+_NUMBERED_DESCRIPTION = re.compile(r"^\s*(\d+)\. (\".*\")\s*$", re.M)
+_WORD = re.compile(r"[a-z]+")
+
+
+@dataclass
+class Behaviour:
+    latency: float = 0.0
+    item_latency: float = 0.0
+    fail_rate: float = 0.0
+    answer: Optional[str] = None
+
+
+@dataclass
+class Stats:
+    calls: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    client_ports: Set[int] = field(default_factory=set)
+
+
+behaviour = Behaviour()
+stats = Stats()
+app = FastAPI()
+
+
+def _batch_answer(categories: List[str], descriptions) -> str:
+    chosen = {}
+    for number, description in descriptions:
+        words = set(_WORD.findall(json.loads(description).lower()))
+        chosen[number] = [
+            category for category in categories
+            if words & set(_WORD.findall(category.lower()))
+        ] or categories[:1]
+    return json.dumps(chosen)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    match = _CATEGORY_LIST.search(prompt)
+    categories = [name.strip() for name in match[1].split(",")] if match else []
+    descriptions = _NUMBERED_DESCRIPTION.findall(prompt)
+
+    stats.calls += 1
+    stats.client_ports.add(request.client.port)
+    stats.in_flight += 1
+    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+    try:
+        await asyncio.sleep(behaviour.latency + behaviour.item_latency * len(descriptions))
+    finally:
+        stats.in_flight -= 1
+
+    if random.random() < behaviour.fail_rate:
+        return JSONResponse(
+            {"error": {"message": "fake upstream failure", "type": "server_error"}},
+            status_code=500,
+        )
+
+    answer = behaviour.answer
+    if answer is None:
+        answer = _batch_answer(categories, descriptions) if descriptions else ", ".join(categories[:1])
+
+    return {
+        "id": f"chatcmpl-fake-{stats.calls}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body["model"],
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": answer},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@asynccontextmanager
+async def running(host: str = "127.0.0.1") -> AsyncIterator[str]:
+    """Serves the fake on a free port in the current event loop, yielding its base URL."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}/v1"
+    finally:
+        server.should_exit = True
+        await task
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before answering")
+    parser.add_argument("--item-latency", type=float, default=0.0, help="Extra seconds per batched description")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of calls answered with a 500")
+    parser.add_argument("--answer", help="Fixed completion text instead of the first listed category")
+    args = parser.parse_args()
+
+    behaviour.latency, behaviour.item_latency = args.latency, args.item_latency
+    behaviour.fail_rate, behaviour.answer = args.fail_rate, args.answer
+    uvicorn.run(app, host=args.host, port=args.port)
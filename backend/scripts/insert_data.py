@@ -3,7 +3,7 @@ import logging
 import random
 from datetime import datetime, timedelta
 
-from app.db import async_session, create_db_and_tables
+from app.db import async_session, migrate
 from app.models import RequestType
 from app.services import AuthService
 from app.interfaces.auth_service import RegistrationData
@@ -114,7 +114,7 @@ requests = [
 
 
 async def insert_dummy_data():
-    if await create_db_and_tables():
+    if await migrate():
         logger.info("Skipping dummy data insertion since data is already there")
         return
 
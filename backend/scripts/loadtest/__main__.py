@@ -0,0 +1,113 @@
+"""
+Load-test harness for the Kindly API.
+
+Start the API against a PostGIS database (with DB_STATEMENT_STATS=1 to get
+per-route statement counts), then:
+
+    python -m scripts.loadtest run scripts/loadtest/scenarios/mixed.json \\
+        --base-url http://localhost:8000 --out results/baseline.json
+    python -m scripts.loadtest compare results/baseline.json results/candidate.json
+
+With --asgi the app runs in-process on the in-memory service backend, which
+measures the HTTP layer (routing, validation, serialization) without Postgres.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from .report import compare, format_result, load, save, summarize
+from .runner import build_client, run_scenario
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace):
+    with open(args.scenario) as f:
+        scenario = json.load(f)
+    if args.duration is not None:
+        scenario["duration"] = args.duration
+    if args.users_scale != 1.0:
+        for config in scenario["users"].values():
+            config["count"] = max(1, round(config["count"] * args.users_scale))
+
+    connections = sum(config["count"] for config in scenario["users"].values())
+    client_options = {}
+    if args.asgi:
+        os.environ.setdefault("SERVICE_BACKEND", "memory")
+        import httpx
+        from app.main import app
+
+        client_options["transport"] = httpx.ASGITransport(app=app)
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    async with build_client(args.base_url, connections, args.timeout, **client_options) as client:
+        samples, elapsed = await run_scenario(scenario, client)
+
+    result = summarize(samples, elapsed, {
+        "scenario": scenario["name"],
+        "scenario_file": os.path.basename(args.scenario),
+        "base_url": "asgi" if args.asgi else args.base_url,
+        "service_backend": os.environ.get("SERVICE_BACKEND", "sql"),
+        "started_at": started_at,
+        "duration": scenario["duration"],
+        "users": {role: config["count"] for role, config in scenario["users"].items()},
+        "seed": scenario.get("seed"),
+        "git_revision": _git_revision(),
+    })
+    print(format_result(result))
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        save(result, args.out)
+        print(f"\nSaved results to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scripts.loadtest")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a scenario against a live API")
+    run_parser.add_argument("scenario", help="Path to a scenario JSON file")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--out", help="Write the JSON results to this path")
+    run_parser.add_argument("--duration", type=float, help="Override the scenario duration (seconds)")
+    run_parser.add_argument("--users-scale", type=float, default=1.0, help="Multiply every user count")
+    run_parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (seconds)")
+    run_parser.add_argument(
+        "--asgi", action="store_true",
+        help="Serve the app in-process (defaults to SERVICE_BACKEND=memory)",
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Relative p95/statement growth that counts as a regression",
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(run(args))
+    else:
+        baseline, candidate = load(args.baseline), load(args.candidate)
+        if baseline["meta"].get("scenario") != candidate["meta"].get("scenario"):
+            print("warning: runs used different scenarios", file=sys.stderr)
+        table, regressed = compare(baseline, candidate, args.threshold)
+        print(table)
+        sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
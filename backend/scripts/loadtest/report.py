@@ -0,0 +1,168 @@
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    latency: float
+    db_statements: Optional[int] = None
+
+
+@dataclass
+class RouteStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    errors: int = 0
+    db_statements: List[int] = field(default_factory=list)
+
+    def add(self, sample: Sample):
+        self.latencies.append(sample.latency)
+        self.statuses[sample.status] += 1
+        # Status 0 marks a transport failure (timeout, connection reset, ...).
+        if sample.status == 0 or sample.status >= 500:
+            self.errors += 1
+        if sample.db_statements is not None:
+            self.db_statements.append(sample.db_statements)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: List[Sample], elapsed: float, meta: dict) -> dict:
+    per_route: Dict[str, RouteStats] = defaultdict(RouteStats)
+    for sample in samples:
+        per_route[sample.route].add(sample)
+
+    routes = {}
+    for route, stats in sorted(per_route.items()):
+        count = len(stats.latencies)
+        client_errors = sum(n for s, n in stats.statuses.items() if 400 <= s < 500)
+        routes[route] = {
+            "count": count,
+            "throughput": count / elapsed if elapsed else 0.0,
+            "errors": stats.errors,
+            "error_rate": stats.errors / count if count else 0.0,
+            "client_errors": client_errors,
+            "statuses": {str(s): n for s, n in sorted(stats.statuses.items())},
+            "latency_ms": {
+                "mean": 1000 * sum(stats.latencies) / count if count else 0.0,
+                "p50": 1000 * percentile(stats.latencies, 50),
+                "p95": 1000 * percentile(stats.latencies, 95),
+                "p99": 1000 * percentile(stats.latencies, 99),
+                "max": 1000 * max(stats.latencies, default=0.0),
+            },
+            "db_statements": {
+                "mean": sum(stats.db_statements) / len(stats.db_statements),
+                "max": max(stats.db_statements),
+            } if stats.db_statements else None,
+        }
+
+    total = len(samples)
+    errors = sum(r["errors"] for r in routes.values())
+    all_latencies = [s.latency for s in samples]
+    return {
+        "meta": meta,
+        "elapsed": elapsed,
+        "total": {
+            "count": total,
+            "throughput": total / elapsed if elapsed else 0.0,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "latency_ms": {
+                "p50": 1000 * percentile(all_latencies, 50),
+                "p95": 1000 * percentile(all_latencies, 95),
+                "p99": 1000 * percentile(all_latencies, 99),
+            },
+        },
+        "routes": routes,
+    }
+
+
+def save(result: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_result(result: dict) -> str:
+    lines = [
+        f"{'route':<48} {'count':>7} {'rps':>8} {'err%':>6} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'stmts':>6}"
+    ]
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for route, stats in rows:
+        db = stats.get("db_statements")
+        stmts = f"{db['mean']:.1f}" if db else "-"
+        lines.append(
+            f"{route:<48} {stats['count']:>7} {stats['throughput']:>8.1f} "
+            f"{100 * stats['error_rate']:>6.2f} "
+            f"{stats['latency_ms']['p50']:>8.1f} {stats['latency_ms']['p95']:>8.1f} "
+            f"{stats['latency_ms']['p99']:>8.1f} "
+            f"{stmts:>6}"
+        )
+    return "\n".join(lines)
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[str, bool]:
+    """
+    Compares two saved runs route by route. A route regresses when its p95
+    latency or DB statement count grows by more than `threshold` (a fraction),
+    or when its error rate increases.
+    """
+    lines = [
+        f"{'route':<48} {'p95 base':>9} {'p95 new':>9} {'delta':>8} "
+        f"{'rps delta':>10} {'stmts':>11} {'err%':>13}"
+    ]
+    regressed = False
+    routes = sorted(set(baseline["routes"]) | set(candidate["routes"]))
+    for route in routes:
+        base = baseline["routes"].get(route)
+        new = candidate["routes"].get(route)
+        if base is None or new is None:
+            lines.append(f"{route:<48} {'only in ' + ('candidate' if base is None else 'baseline'):>9}")
+            continue
+
+        base_p95, new_p95 = base["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        delta = (new_p95 - base_p95) / base_p95 if base_p95 else 0.0
+        rps_delta = (
+            (new["throughput"] - base["throughput"]) / base["throughput"]
+            if base["throughput"] else 0.0
+        )
+        base_db, new_db = base.get("db_statements"), new.get("db_statements")
+        stmts = (
+            f"{base_db['mean']:.1f}->{new_db['mean']:.1f}" if base_db and new_db else "-"
+        )
+        errors = f"{100 * base['error_rate']:.2f}->{100 * new['error_rate']:.2f}"
+
+        flags = []
+        if delta > threshold:
+            flags.append("latency")
+        if base_db and new_db and new_db["mean"] > base_db["mean"] * (1 + threshold):
+            flags.append("statements")
+        if new["error_rate"] > base["error_rate"]:
+            flags.append("errors")
+        regressed = regressed or bool(flags)
+
+        lines.append(
+            f"{route:<48} {base_p95:>9.1f} {new_p95:>9.1f} {100 * delta:>+7.1f}% "
+            f"{100 * rps_delta:>+9.1f}% {stmts:>11} {errors:>13}"
+            + (f"  REGRESSION({', '.join(flags)})" if flags else "")
+        )
+    return "\n".join(lines), regressed
@@ -0,0 +1,384 @@
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, List, Optional
+
+import httpx
+
+from .report import Sample
+
+API_PREFIX = "/api/v1"
+
+
+class _RejectAllCookies(DefaultCookiePolicy):
+    # Virtual users share one client, so the refresh token cookie is tracked
+    # per user and sent explicitly instead of living in the shared jar.
+    def set_ok(self, cookie, request):
+        return False
+
+
+class Recorder:
+    def __init__(self, warmup_until: float):
+        self.warmup_until = warmup_until
+        self.samples: List[Sample] = []
+
+    def record(self, route: str, status: int, latency: float, db_statements: Optional[int]):
+        if time.perf_counter() >= self.warmup_until:
+            self.samples.append(Sample(route, status, latency, db_statements))
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Optional[Recorder],
+        scenario: dict,
+        role: str,
+        rng: random.Random,
+        request_type_ids: List[int],
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.scenario = scenario
+        self.role = role
+        self.rng = rng
+        self.request_type_ids = request_type_ids
+        self.id: Optional[int] = None
+        self.access_token = ""
+        self.refresh_token = ""
+        # Request id -> last seen summary (status, application_status, ...).
+        self.known_requests: Dict[int, dict] = {}
+        # Own request id -> ids of volunteers with pending applications.
+        self.pending_applicants: Dict[int, List[int]] = {}
+
+    async def call(
+        self, route: str, method: str, path: str, retried: bool = False, **kwargs
+    ) -> Optional[httpx.Response]:
+        headers = kwargs.pop("headers", {})
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        if self.refresh_token:
+            headers["Cookie"] = f"refresh_token={self.refresh_token}"
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, API_PREFIX + path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            if self.recorder is not None:
+                self.recorder.record(route, 0, time.perf_counter() - started, None)
+            return None
+        latency = time.perf_counter() - started
+
+        if self.recorder is not None:
+            statements = response.headers.get("X-DB-Statements")
+            self.recorder.record(
+                route, response.status_code, latency,
+                int(statements) if statements is not None else None,
+            )
+
+        new_refresh = response.cookies.get("refresh_token")
+        if new_refresh:
+            self.refresh_token = new_refresh
+
+        # Access tokens are short lived outside DEBUG; renew once and retry.
+        if response.status_code == 401 and not retried and not path.startswith("/auth/"):
+            await self.action_refresh_token()
+            return await self.call(route, method, path, retried=True, **kwargs)
+        return response
+
+    async def register(self, email_prefix: str, index: int):
+        response = await self.call(
+            "POST /auth/register", "POST", "/auth/register",
+            json={
+                "first_name": "Load",
+                "last_name": f"{self.role.title()} {index}",
+                "email": f"{email_prefix}-{self.role}-{index}@loadtest.example.com",
+                "password": "loadtest-password",
+                "date_of_birth": "1990-01-01",
+                "about_me": "Synthetic user created by the load-test harness.",
+                "is_volunteer": self.role == "volunteer",
+            },
+        )
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"Could not register load-test user: {response and response.text}")
+        body = response.json()
+        self.id = body["user"]["id"]
+        self.access_token = body["access_token"]
+
+    async def run(self, deadline: float):
+        config = self.scenario["users"][self.role]
+        actions = list(config["actions"].items())
+        names = [name for name, _ in actions]
+        weights = [weight for _, weight in actions]
+        think_low, think_high = config.get("think_time", [0, 0])
+
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(names, weights)[0]
+            await getattr(self, f"action_{action}")()
+            await asyncio.sleep(self.rng.uniform(think_low, think_high))
+
+    # Shared actions
+
+    async def action_refresh_token(self):
+        response = await self.call("POST /auth/refresh", "POST", "/auth/refresh")
+        if response is not None and response.status_code == 200:
+            self.access_token = response.json()["token"]
+
+    async def action_view_profile(self):
+        await self.call("GET /common/profile", "GET", "/common/profile")
+
+    # Volunteer actions
+
+    def _feed_params(self) -> dict:
+        feed = self.scenario["feed"]
+        area = self.scenario["area"]
+        params = {
+            "status": self.rng.choice(feed["status"]),
+            "sort": self.rng.choice(feed["sort"]),
+            "order": self.rng.choice(feed["order"]),
+            "page": self.rng.choice(feed["pages"]),
+            "limit": self.rng.choice(feed["limit"]),
+        }
+        if self.rng.random() < feed.get("location_probability", 1.0):
+            params["location_lat"] = area["latitude"] + self.rng.uniform(-area["spread"], area["spread"])
+            params["location_lng"] = area["longitude"] + self.rng.uniform(-area["spread"], area["spread"])
+            params["radius"] = self.rng.choice(feed["radius"])
+        if self.request_type_ids and self.rng.random() < feed.get("category_probability", 0):
+            params["request_type_ids"] = self.rng.sample(
+                self.request_type_ids, self.rng.randint(1, min(2, len(self.request_type_ids)))
+            )
+        return params
+
+    async def action_browse_feed(self, params: Optional[dict] = None):
+        response = await self.call(
+            "GET /volunteer/requests/", "GET", "/volunteer/requests/",
+            params=params or self._feed_params(),
+        )
+        if response is not None and response.status_code == 200:
+            for item in response.json()["data"]:
+                self.known_requests[item["id"]] = item
+
+    async def action_view_request(self):
+        if not self.known_requests:
+            return await self.action_browse_feed()
+        request_id = self.rng.choice(list(self.known_requests))
+        response = await self.call(
+            "GET /volunteer/requests/{id}", "GET", f"/volunteer/requests/{request_id}"
+        )
+        if response is not None and response.status_code == 200:
+            self.known_requests[request_id] = response.json()["data"]
+        elif response is not None and response.status_code == 404:
+            self.known_requests.pop(request_id, None)
+
+    def _pick(self, **conditions) -> Optional[int]:
+        candidates = [
+            request_id for request_id, item in self.known_requests.items()
+            if all(item.get(key) == value for key, value in conditions.items())
+        ]
+        return self.rng.choice(candidates) if candidates else None
+
+    async def action_apply(self):
+        request_id = self._pick(status="OPEN", application_status="NOT_APPLIED")
+        if request_id is None:
+            return await self.action_browse_feed()
+        response = await self.call(
+            "POST /volunteer/requests/{id}/application", "POST",
+            f"/volunteer/requests/{request_id}/application",
+        )
+        if response is not None and response.status_code in (200, 409):
+            self.known_requests[request_id]["application_status"] = "PENDING"
+
+    async def action_withdraw(self):
+        request_id = self._pick(status="OPEN", application_status="PENDING")
+        if request_id is None:
+            return await self.action_browse_feed()
+        response = await self.call(
+            "DELETE /volunteer/requests/{id}/application", "DELETE",
+            f"/volunteer/requests/{request_id}/application",
+        )
+        if response is not None and response.status_code in (200, 404):
+            self.known_requests[request_id]["application_status"] = "NOT_APPLIED"
+
+    async def action_rate_seeker(self):
+        request_id = self._pick(status="COMPLETED", application_status="ACCEPTED")
+        if request_id is None:
+            return await self.action_browse_feed({"status": "COMPLETED", "limit": 40})
+        await self.call(
+            "POST /volunteer/requests/{id}/rate-seeker", "POST",
+            f"/volunteer/requests/{request_id}/rate-seeker",
+            json={"rating": self.rng.randint(1, 5)},
+        )
+        self.known_requests.pop(request_id, None)
+
+    # Help seeker actions
+
+    def _request_body(self) -> dict:
+        area = self.scenario["area"]
+        start = datetime.now(timezone.utc) + timedelta(
+            days=self.rng.randint(1, 14), hours=self.rng.randint(0, 23)
+        )
+        types = (
+            self.rng.sample(self.request_type_ids, self.rng.randint(1, min(2, len(self.request_type_ids))))
+            if self.request_type_ids else []
+        )
+        return {
+            "name": f"Load test request {uuid.uuid4().hex[:8]}",
+            "description": "Synthetic request generated by the load-test harness for benchmarking.",
+            "longitude": area["longitude"] + self.rng.uniform(-area["spread"], area["spread"]),
+            "latitude": area["latitude"] + self.rng.uniform(-area["spread"], area["spread"]),
+            "address": "1 Benchmark Street",
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=self.rng.randint(1, 4))).isoformat(),
+            "reward": round(self.rng.normalvariate(1000, 200), 2),
+            "request_type_ids": types,
+        }
+
+    async def action_create_request(self):
+        response = await self.call(
+            "POST /help-seeker/requests/", "POST", "/help-seeker/requests/",
+            json=self._request_body(),
+        )
+        if response is not None and response.status_code == 200:
+            data = response.json()["data"]
+            self.known_requests[data["id"]] = data
+
+    async def action_my_requests(self):
+        response = await self.call(
+            "GET /help-seeker/requests/", "GET", "/help-seeker/requests/",
+            params={
+                "status": self.rng.choice(["ALL", "OPEN", "COMPLETED"]),
+                "sort": self.rng.choice(["created_at", "start", "reward"]),
+                "order": self.rng.choice(["asc", "desc"]),
+                "page": self.rng.choice([1, 1, 2]),
+            },
+        )
+        if response is not None and response.status_code == 200:
+            for item in response.json()["data"]:
+                self.known_requests[item["id"]] = item
+
+    async def action_view_own_request(self, request_id: Optional[int] = None):
+        if request_id is None:
+            if not self.known_requests:
+                return await self.action_my_requests()
+            request_id = self.rng.choice(list(self.known_requests))
+        response = await self.call(
+            "GET /help-seeker/requests/{id}", "GET", f"/help-seeker/requests/{request_id}"
+        )
+        if response is not None and response.status_code == 200:
+            data = response.json()["data"]
+            self.known_requests[request_id] = data
+            self.pending_applicants[request_id] = [
+                application["volunteer"]["id"]
+                for application in data["applications"]
+                if application["status"] == "PENDING"
+            ]
+        elif response is not None and response.status_code == 404:
+            self.known_requests.pop(request_id, None)
+
+    async def action_accept_application(self):
+        candidates = [
+            request_id for request_id, volunteers in self.pending_applicants.items()
+            if volunteers and self.known_requests.get(request_id, {}).get("status") == "OPEN"
+        ]
+        if not candidates:
+            request_id = self._pick(status="OPEN")
+            return await self.action_view_own_request(request_id)
+        request_id = self.rng.choice(candidates)
+        volunteer_id = self.rng.choice(self.pending_applicants.pop(request_id))
+        response = await self.call(
+            "PATCH /help-seeker/requests/{id}/applications/{volunteer_id}/accept", "PATCH",
+            f"/help-seeker/requests/{request_id}/applications/{volunteer_id}/accept",
+        )
+        if response is not None and response.status_code == 200:
+            self.known_requests[request_id]["status"] = "CLOSED"
+
+    async def action_complete_request(self):
+        request_id = self._pick(status="CLOSED")
+        if request_id is None:
+            return await self.action_my_requests()
+        response = await self.call(
+            "PATCH /help-seeker/requests/{id}/complete", "PATCH",
+            f"/help-seeker/requests/{request_id}/complete",
+        )
+        if response is not None and response.status_code == 200:
+            self.known_requests[request_id]["status"] = "COMPLETED"
+            self.known_requests[request_id]["rated"] = False
+
+    async def action_rate_volunteer(self):
+        request_id = self._pick(status="COMPLETED", rated=False)
+        if request_id is None:
+            return await self.action_my_requests()
+        await self.call(
+            "POST /help-seeker/requests/{id}/rate-volunteer", "POST",
+            f"/help-seeker/requests/{request_id}/rate-volunteer",
+            json={"rating": self.rng.randint(1, 5)},
+        )
+        self.known_requests[request_id]["rated"] = True
+
+
+async def _gather_bounded(coroutines, limit: int):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(bounded(c) for c in coroutines))
+
+
+def build_client(base_url: str, connections: int, timeout: float, **kwargs) -> httpx.AsyncClient:
+    client = httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        **kwargs,
+    )
+    client.cookies.jar.set_policy(_RejectAllCookies())
+    return client
+
+
+async def run_scenario(
+    scenario: dict, client: httpx.AsyncClient, setup_concurrency: int = 10
+) -> tuple[List[Sample], float]:
+    rng = random.Random(scenario.get("seed"))
+    email_prefix = f"lt-{uuid.uuid4().hex[:10]}"
+
+    users: List[VirtualUser] = []
+    for role, config in scenario["users"].items():
+        for _ in range(config["count"]):
+            users.append(
+                VirtualUser(client, None, scenario, role, random.Random(rng.random()), [])
+            )
+
+    # Setup traffic is not recorded: register everyone, then seed requests so
+    # volunteers have something to browse from the first second.
+    await _gather_bounded(
+        [user.register(email_prefix, i) for i, user in enumerate(users)], setup_concurrency
+    )
+    types_response = await users[0].call("GET /common/request-types", "GET", "/common/request-types")
+    request_type_ids = (
+        [rt["id"] for rt in types_response.json()["data"]]
+        if types_response is not None and types_response.status_code == 200 else []
+    )
+    seekers = [user for user in users if user.role == "help_seeker"]
+    per_seeker = scenario.get("setup", {}).get("requests_per_seeker", 0)
+    for user in users:
+        user.request_type_ids = request_type_ids
+    await _gather_bounded(
+        [seeker.action_create_request() for seeker in seekers for _ in range(per_seeker)],
+        setup_concurrency,
+    )
+
+    started = time.perf_counter()
+    warmup_until = started + scenario.get("warmup", 0)
+    deadline = warmup_until + scenario["duration"]
+    recorder = Recorder(warmup_until)
+    for user in users:
+        user.recorder = recorder
+
+    await asyncio.gather(*(user.run(deadline) for user in users))
+    elapsed = time.perf_counter() - warmup_until
+    return recorder.samples, elapsed
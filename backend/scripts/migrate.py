@@ -0,0 +1,17 @@
+import asyncio
+import logging
+
+from app.db import migrate, schema_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    await migrate()
+    logger.info("Database schema is at %s", schema_fingerprint())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Recomputes every user_stats row from the live and archived requests and
+applications, repairing counters that drifted from them (e.g. after a
+failed outbox message or a manual data fix). Also the initial backfill
+after migrating to a schema with the user_stats table.
+
+    python -m scripts.rebuild_user_stats
+
+Counter changes still waiting in the outbox are applied on top of the
+rebuilt rows, so stop the worker or let it drain the outbox first. Prints
+the number of rows that were written because they were missing or off.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import func, literal_column, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db import async_session, check_schema, engine
+from app.models import (
+    USER_STATS_COLUMNS,
+    ApplicationHistory,
+    ApplicationStatus,
+    RequestHistory,
+    RequestStatus,
+    User,
+    UserStats,
+)
+
+
+def _counts(user_id, **counts):
+    # A union_all branch: user_id and every counter, zero unless given.
+    return [user_id.label("user_id")] + [
+        counts.get(column, literal_column("0")).label(column) for column in USER_STATS_COLUMNS
+    ]
+
+
+def rebuilt_stats():
+    """(user_id, *USER_STATS_COLUMNS) of every user with activity or a row."""
+    completed = RequestHistory.status == RequestStatus.COMPLETED
+    accepted = ApplicationHistory.status == ApplicationStatus.ACCEPTED
+    parts = union_all(
+        select(*_counts(
+            RequestHistory.creator_id,
+            requests_posted=func.count(),
+            requests_completed=func.count().filter(completed),
+        )).group_by(RequestHistory.creator_id),
+        select(*_counts(
+            ApplicationHistory.user_id,
+            applications_made=func.count(),
+            applications_accepted=func.count().filter(accepted),
+            ratings_received=func.count(ApplicationHistory.volunteer_rating),
+        )).group_by(ApplicationHistory.user_id),
+        select(*_counts(ApplicationHistory.user_id, requests_completed=func.count()))
+        .join(RequestHistory, RequestHistory.id == ApplicationHistory.request_id)
+        .where(accepted, completed)
+        .group_by(ApplicationHistory.user_id),
+        select(*_counts(RequestHistory.creator_id, ratings_received=func.count()))
+        .select_from(ApplicationHistory)
+        .join(RequestHistory, RequestHistory.id == ApplicationHistory.request_id)
+        .where(ApplicationHistory.help_seeker_rating.is_not(None))
+        .group_by(RequestHistory.creator_id),
+        # Rows of users whose activity is all gone are zeroed.
+        select(*_counts(UserStats.user_id)),
+    ).subquery()
+    return (
+        select(parts.c.user_id, *(func.sum(parts.c[column]) for column in USER_STATS_COLUMNS))
+        .where(parts.c.user_id.in_(select(User.id)))
+        .group_by(parts.c.user_id)
+    )
+
+
+async def rebuild() -> int:
+    stmt = insert(UserStats).from_select(["user_id", *USER_STATS_COLUMNS], rebuilt_stats())
+    stored = tuple_(*(UserStats.__table__.c[column] for column in USER_STATS_COLUMNS))
+    rebuilt = tuple_(*(stmt.excluded[column] for column in USER_STATS_COLUMNS))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={
+            **{column: stmt.excluded[column] for column in USER_STATS_COLUMNS},
+            "updated_at": func.now(),
+        },
+        where=stored.is_distinct_from(rebuilt),
+    ).returning(UserStats.user_id)
+    async with async_session() as session, session.begin():
+        return len((await session.execute(stmt)).all())
+
+
+async def main():
+    if not await check_schema():
+        raise RuntimeError(
+            "Database schema is missing or out of date, run `python -m scripts.migrate`"
+        )
+    try:
+        repaired = await rebuild()
+    finally:
+        await engine.dispose()
+    print(f"Rebuilt user stats, {repaired} rows written")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
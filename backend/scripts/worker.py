@@ -0,0 +1,143 @@
+"""
+Background worker: carries out the side effects the API writes to the
+outbox table (XP awards, rating averages, recommendations), expires
+past-`end` requests and archives old completed ones.
+
+    python -m scripts.worker
+    python -m scripts.worker --lag
+
+Drains the outbox in batches until it is empty, then waits for the outbox
+trigger's notification or OUTBOX_POLL_INTERVAL seconds, whichever comes
+first (retried messages become due without a notification). Several
+workers may run side by side. Every OUTBOX_LAG_INTERVAL seconds it logs the
+outbox lag: pending messages, the age of the oldest one and messages out
+of retries. `--lag` prints the lag once and exits. The API serves the same
+figures as gauges on GET /metrics, for scraping and alerting.
+
+Every EXPIRY_INTERVAL seconds, open requests whose `end` has passed are
+marked EXPIRED (see ExpirySweeper for the batching and rate limit).
+
+Every ARCHIVE_INTERVAL seconds, requests completed more than
+ARCHIVE_AFTER_DAYS days ago are moved to the archive tables with their
+applications (see RequestArchiver).
+
+Every RECOMMENDATION_INTERVAL seconds, recommendation refreshes are
+enqueued for up to RECOMMENDATION_BATCH_SIZE volunteers without a profile
+or with one older than RECOMMENDATION_MAX_AGE hours, so new volunteers get
+a feed and scores follow time to start (see services.recommendations).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from app.db import async_session, check_schema, pg_listener
+from app.services import recommendations
+from app.services.archive import RequestArchiver
+from app.services.expiry_sweeper import ExpirySweeper
+from app.services.outbox import OUTBOX_CHANNEL, OutboxWorker
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+LAG_INTERVAL = float(os.getenv("OUTBOX_LAG_INTERVAL", "60"))
+EXPIRY_INTERVAL = float(os.getenv("EXPIRY_INTERVAL", "60"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+RECOMMENDATION_INTERVAL = float(os.getenv("RECOMMENDATION_INTERVAL", "300"))
+RECOMMENDATION_BATCH_SIZE = int(os.getenv("RECOMMENDATION_BATCH_SIZE", "500"))
+
+
+async def log_lag(worker: OutboxWorker) -> None:
+    lag = await worker.lag()
+    logger.info(
+        "Outbox lag: %d pending, oldest %.1f s, %d failed",
+        lag.pending, lag.oldest_age, lag.failed,
+    )
+
+
+async def sweep_expired(sweeper: ExpirySweeper) -> None:
+    while True:
+        try:
+            await sweeper.sweep()
+        except Exception:
+            logger.exception("Expiry sweep failed")
+        await asyncio.sleep(EXPIRY_INTERVAL)
+
+
+async def archive_completed(archiver: RequestArchiver) -> None:
+    while True:
+        try:
+            await archiver.archive()
+        except Exception:
+            logger.exception("Archiving failed")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+async def refresh_stale_recommendations() -> None:
+    while True:
+        try:
+            async with async_session() as session, session.begin():
+                count = await recommendations.enqueue_stale(session, RECOMMENDATION_BATCH_SIZE)
+            if count:
+                logger.info("Enqueued %d recommendation refreshes", count)
+        except Exception:
+            logger.exception("Enqueueing recommendation refreshes failed")
+        await asyncio.sleep(RECOMMENDATION_INTERVAL)
+
+
+async def run(worker: OutboxWorker, sweeper: ExpirySweeper, archiver: RequestArchiver) -> None:
+    wake = asyncio.Event()
+    pg_listener.add_listener(OUTBOX_CHANNEL, lambda _: wake.set())
+    pg_listener.start()
+    sweeping = asyncio.create_task(sweep_expired(sweeper))
+    archiving = asyncio.create_task(archive_completed(archiver))
+    recommending = asyncio.create_task(refresh_stale_recommendations())
+    lag_logged_at = 0.0
+    try:
+        while True:
+            wake.clear()
+            try:
+                while worker.batch_size <= await worker.run_once():
+                    pass
+            except Exception:
+                logger.exception("Outbox batch failed")
+
+            if LAG_INTERVAL <= time.monotonic() - lag_logged_at:
+                lag_logged_at = time.monotonic()
+                try:
+                    await log_lag(worker)
+                except Exception:
+                    logger.exception("Reading the outbox lag failed")
+
+            try:
+                await asyncio.wait_for(wake.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        sweeping.cancel()
+        archiving.cancel()
+        recommending.cancel()
+        await pg_listener.stop()
+
+
+async def main(args):
+    if not await check_schema():
+        raise RuntimeError(
+            "Database schema is missing or out of date, run `python -m scripts.migrate`"
+        )
+    worker = OutboxWorker.from_env(async_session)
+    if args.lag:
+        lag = await worker.lag()
+        print(f"pending {lag.pending}  oldest {lag.oldest_age:.1f} s  failed {lag.failed}")
+        return
+    await run(
+        worker, ExpirySweeper.from_env(async_session), RequestArchiver.from_env(async_session)
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lag", action="store_true", help="Print the outbox lag and exit")
+    asyncio.run(main(parser.parse_args()))
@@ -33,6 +33,10 @@ export const RequestCard = ({
       return { label: "Completed", colorScheme: "gray", icon: FaCheckCircle };
     }
 
+    if (request.status === RequestStatus.EXPIRED) {
+      return { label: "Expired", colorScheme: "gray", icon: FaTimesCircle };
+    }
+
     if (isVolunteer) {
       const { application_status, status } = request as VolunteerRequest;
 
@@ -40,6 +40,9 @@ import { formatDateFull } from "../../utils/date";
 import { requestService } from "../../services/request.service";
 import { toaster } from "../ui/toaster";
 
+// Applicants fetched per "Load more", past the first few in the detail.
+const APPLICANTS_PAGE_SIZE = 20;
+
 interface RequestDetailsProps {
   request: RequestDetailsType;
   applications?: RequestApplication[];
@@ -54,14 +57,57 @@ export const RequestDetails = ({
   const navigate = useNavigate();
   const isCreator = !isVolunteer;
 
-  const apps = applications ?? [];
+  const [apps, setApps] = useState<RequestApplication[]>(applications ?? []);
+  const [applicantsPage, setApplicantsPage] = useState(1);
+  const [hasMoreApplicants, setHasMoreApplicants] = useState(
+    !isVolunteer && (applications ?? []).length < request.application_count
+  );
+  const [isLoadingApplicants, setIsLoadingApplicants] = useState(false);
+
+  const loadMoreApplicants = async () => {
+    setIsLoadingApplicants(true);
+    try {
+      const res = await requestService.getApplications(request.id, {
+        page: applicantsPage,
+        limit: APPLICANTS_PAGE_SIZE,
+        sort: "applied_at",
+        order: "asc",
+      });
+      // The pages start over from the first applicant, so skip the ones
+      // the detail already showed.
+      setApps((prev) => {
+        const shown = new Set(prev.map((app) => app.volunteer.id));
+        return [
+          ...prev,
+          ...res.data.filter((app) => !shown.has(app.volunteer.id)),
+        ];
+      });
+      setApplicantsPage(applicantsPage + 1);
+      setHasMoreApplicants(applicantsPage < res.totalPages);
+    } catch (err) {
+      const errorMessage =
+        err instanceof Error ? err.message : "Please try again";
+      toaster.create({
+        title: "Couldn't load applicants",
+        description: errorMessage,
+        type: "error",
+        duration: 5000,
+      });
+    } finally {
+      setIsLoadingApplicants(false);
+    }
+  };
 
   const acceptedVolunteer =
     apps.find((app) => app.status === ApplicationStatus.ACCEPTED)?.volunteer ||
     null;
 
   const canSelectApplicant =
-    !isVolunteer && isCreator && !acceptedVolunteer && apps.length > 0;
+    !isVolunteer &&
+    isCreator &&
+    !acceptedVolunteer &&
+    apps.length > 0 &&
+    request.status === RequestStatus.OPEN;
 
   const canMarkComplete =
     !isVolunteer &&
@@ -384,7 +430,7 @@ export const RequestDetails = ({
         ) : (
           <Box>
             <Text fontSize="lg" fontWeight="semibold" color="gray.700" mb={3}>
-              Applicants ({apps.length})
+              Applicants ({request.application_count})
             </Text>
             {apps.length === 0 && !acceptedVolunteer ? (
               <Text color="gray.800">No applicants yet</Text>
@@ -474,6 +520,19 @@ export const RequestDetails = ({
                 })()}
               </SimpleGrid>
             )}
+            {hasMoreApplicants && (
+              <HStack justify="center" mt={4}>
+                <Button
+                  variant="outline"
+                  borderRadius="full"
+                  px={5}
+                  onClick={loadMoreApplicants}
+                  loading={isLoadingApplicants}
+                >
+                  Load more applicants
+                </Button>
+              </HStack>
+            )}
           </Box>
         )}
 
@@ -509,6 +568,9 @@ export const RequestDetails = ({
           onClose={onCloseSelect}
           applications={apps}
           onAccepted={handleAccepted}
+          hasMore={hasMoreApplicants}
+          onLoadMore={loadMoreApplicants}
+          isLoadingMore={isLoadingApplicants}
         />
       )}
     </Box>
@@ -21,6 +21,9 @@ interface SelectApplicantModalProps {
   onClose: () => void;
   applications: RequestApplication[];
   onAccepted: (userId: number) => Promise<void> | void;
+  hasMore?: boolean;
+  onLoadMore?: () => Promise<void> | void;
+  isLoadingMore?: boolean;
 }
 
 export const SelectApplicantModal = ({
@@ -28,6 +31,9 @@ export const SelectApplicantModal = ({
   onClose,
   applications,
   onAccepted,
+  hasMore = false,
+  onLoadMore,
+  isLoadingMore = false,
 }: SelectApplicantModalProps) => {
   const [selectedUserId, setSelectedUserId] = useState<number | null>(null);
   const [isSaving, setIsSaving] = useState(false);
@@ -146,6 +152,16 @@ export const SelectApplicantModal = ({
                           No applicants yet.
                         </Box>
                       )}
+                      {hasMore && onLoadMore && (
+                        <Button
+                          variant="ghost"
+                          size="sm"
+                          onClick={onLoadMore}
+                          loading={isLoadingMore}
+                        >
+                          Load more applicants
+                        </Button>
+                      )}
                     </Stack>
                   </ScrollArea.Viewport>
                   <ScrollArea.Scrollbar orientation="vertical" />
@@ -10,6 +10,7 @@ import type {
   CreateRequestData,
   UpdateRequestData,
   RequestApplication,
+  ApplicationsQuery,
   SuggestedRequestType,
   ApiResponse,
   PaginatedResponse,
@@ -112,11 +113,13 @@ export const requestService = {
   },
 
   getApplications: async (
-    requestId: number
-  ): Promise<ApiResponse<RequestApplication[]>> => {
+    requestId: number,
+    params: ApplicationsQuery = {}
+  ): Promise<PaginatedResponse<RequestApplication>> => {
     try {
-      const response = await api.get<ApiResponse<RequestApplication[]>>(
-        `/help-seeker/requests/${requestId}/applications`
+      const response = await api.get<PaginatedResponse<RequestApplication>>(
+        `/help-seeker/requests/${requestId}/applications`,
+        { params }
       );
       return response.data;
     } catch (err: unknown) {
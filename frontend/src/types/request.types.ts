@@ -23,10 +23,26 @@ interface BaseRequest {
 }
 
 export interface HelpSeekerRequest extends BaseRequest {
+  // The first few applications; page the rest with getApplications.
   applications?: RequestApplication[];
+  application_counts?: ApplicationCounts;
   has_rated_helper: boolean;
 }
 
+export interface ApplicationCounts {
+  pending: number;
+  accepted: number;
+  declined: number;
+}
+
+export interface ApplicationsQuery {
+  status?: "PENDING" | "ACCEPTED" | "DECLINED" | "ALL";
+  sort?: "applied_at" | "avg_rating" | "level";
+  order?: "asc" | "desc";
+  page?: number;
+  limit?: number;
+}
+
 export interface VolunteerRequest extends BaseRequest {
   application_status?: ApplicationStatus;
   has_rated_seeker: boolean;
@@ -66,6 +82,7 @@ export enum RequestStatus {
   ALL = "ALL",
   APPLIED = "APPLIED",
   CLOSED = "CLOSED",
+  EXPIRED = "EXPIRED",
 }
 
 export interface RequestFilters {
@@ -76,6 +93,8 @@ export interface RequestFilters {
   radius?: number;
   min_reward?: number;
   max_reward?: number;
+  // Only requests overlapping one of the volunteer's availability windows.
+  available?: boolean;
   page?: number;
   limit?: number;
   sort?: "created_at" | "start" | "reward";
@@ -12,6 +12,17 @@ export interface User {
   level: number;
   experience: number;
   experience_to_next_level: number;
+  // Only on the profile endpoints.
+  stats?: UserStats;
+}
+
+export interface UserStats {
+  requests_posted: number;
+  requests_completed: number;
+  applications_made: number;
+  applications_accepted: number;
+  ratings_received: number;
+  acceptance_rate: number | null;
 }
 
 export interface RegisterRequest {